@@ -1,16 +1,44 @@
-import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-from io import BytesIO
+import functools
+import os
+import sys
 from datetime import datetime
+from pathlib import Path
+
+import streamlit as st
+
+# El motor de cálculo vive en el paquete `legendarios` (raíz del repo)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from legendarios import arranque, cache, historial, planificador, temporada_2025
+
+# matplotlib se importa al dibujar el primer gráfico (la pantalla de acceso no lo necesita)
+plt = arranque.perezoso("matplotlib.pyplot")
 
 st.set_page_config(page_title="Estadísticas de Fútbol", layout="wide")
-from PIL import Image
+
+# Excel del repositorio, o el archivo histórico con LEGENDARIOS_DATOS_2025 (ver legendarios/historico.py)
+datos_path = temporada_2025.DATA_FILE
+BUILD_WORKERS = int(os.environ.get("LEGENDARIOS_WORKERS", "1"))
+
+def construir_modelo(path: str):
+    # El historial por jugador solo lee la hoja Jugadores de 2026 para resolver ids
+    nodos = planificador.grafo_2025(path) + planificador.grafo_historial_2025()
+    return planificador.ejecutar(nodos, workers=BUILD_WORKERS)
+
+def clave_modelo(path: str) -> tuple:
+    st_archivo = os.stat(path)
+    return ("2025", path, st_archivo.st_mtime_ns, st_archivo.st_size)
+
+def modelo_temporada(path: str):
+    # Espacio "modelos" de legendarios/cache.py, por versión del archivo (mtime + tamaño);
+    # si ya se estaba precalentando, se recoge ese resultado. Si la caché lo desaloja,
+    # la próxima visita lo vuelve a calentar en segundo plano desde la pantalla de acceso
+    clave = clave_modelo(path)
+    return cache.CACHE.obtener("modelos", clave, arranque.esperar, clave, construir_modelo, path,
+                               al_salir=functools.partial(arranque.olvidar, clave))
 
 col1, col2, col3 = st.columns([1, 2, 1])
 with col2:
-    logo = Image.open("2025/logo.png")
-    st.image(logo, width=120)
+    st.image("2025/logo.png", width=120)
 st.title("⚽ Estadísticas Legendarios FC - Temporada 2025")
 
 ultima_actualizacion = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -18,135 +46,67 @@ st.markdown(f"<div style='text-align: right; font-size: 12px; color: gray;'>Últ
 
 # Ingreso de clave
 clave_usuario = st.text_input("🔐 Ingresa tu código de acceso", type="password")
+
+# Con la pantalla de acceso ya enviada, las tablas se construyen en segundo plano mientras se escribe la clave
+arranque.calentar(clave_modelo(datos_path), construir_modelo, datos_path)
+
 if clave_usuario != "LEGENDARIOS2025":
     st.warning("⚠️ Ingresa el código correcto para ver las estadísticas.")
     st.stop()
 
-# Cargar archivo fijo desde el repositorio
-datos_path = "2025/datos.xlsx"
-jugadores_df = pd.read_excel(datos_path, sheet_name="Jugadores")
-df = pd.read_excel(datos_path, sheet_name="Partidos")
-df = df[df["equipo"].notna()]
-df["fecha"] = pd.to_datetime(df["fecha"])
-df = df.merge(jugadores_df.rename(columns={"posición": "posicion_regular"}), on="jugador", how="left")
+modelo = modelo_temporada(datos_path)
+df = modelo["2025/datos"]
 
 # Rankings y estadísticas
 
-for col in ["Penales_Atajados", "asistencias"]:
-    if col not in df.columns:
-        df[col] = 0
+def grafica_barras(tabla, col, color, titulo, ylabel=None):
+    fig, ax = plt.subplots()
+    ax.bar(tabla["jugador"], tabla[col], color=color)
+    ax.set_title(titulo)
+    if ylabel:
+        ax.set_ylabel(ylabel)
+    ax.tick_params(axis='x', rotation=90)
+    st.pyplot(fig)
 
 st.markdown("<h3 style='text-align: center;'>Ranking de Goleadores</h3>", unsafe_allow_html=True)
-goleadores = df.groupby("jugador")["goles"].sum().reset_index()
-goleadores = goleadores[goleadores["goles"] > 0].sort_values(by="goles", ascending=False).reset_index(drop=True)
-goleadores.insert(0, "Posición", range(1, len(goleadores) + 1))
+goleadores = modelo["2025/stat/goles"]
 st.dataframe(goleadores)
-fig, ax = plt.subplots()
-ax.bar(goleadores["jugador"], goleadores["goles"], color="skyblue")
-ax.set_title("Goles por Jugador")
-ax.set_ylabel("Goles")
-ax.tick_params(axis='x', rotation=90)
-st.pyplot(fig)
+grafica_barras(goleadores, "goles", "skyblue", "Goles por Jugador", "Goles")
 
 st.markdown("<h3 style='text-align: center;'>Ranking de Asistencias</h3>", unsafe_allow_html=True)
-asistencias = df.groupby("jugador")["asistencias"].sum().reset_index()
-asistencias = asistencias[asistencias["asistencias"] > 0].sort_values(by="asistencias", ascending=False).reset_index(drop=True)
-asistencias.insert(0, "Posición", range(1, len(asistencias) + 1))
+asistencias = modelo["2025/stat/asistencias"]
 st.dataframe(asistencias)
-fig, ax = plt.subplots()
-ax.bar(asistencias["jugador"], asistencias["asistencias"], color="orange")
-ax.set_title("Asistencias por Jugador")
-ax.set_ylabel("Asistencias")
-ax.tick_params(axis='x', rotation=90)
-st.pyplot(fig)
+grafica_barras(asistencias, "asistencias", "orange", "Asistencias por Jugador", "Asistencias")
 
 st.markdown("<h3 style='text-align: center;'>Ranking de Tarjetas Amarillas</h3>", unsafe_allow_html=True)
-amarillas = df.groupby("jugador")["tarjetas_amarillas"].sum().reset_index()
-amarillas = amarillas[amarillas["tarjetas_amarillas"] > 0].sort_values(by="tarjetas_amarillas", ascending=False).reset_index(drop=True)
-amarillas.insert(0, "Posición", range(1, len(amarillas) + 1))
+amarillas = modelo["2025/stat/tarjetas_amarillas"]
 st.dataframe(amarillas)
-fig, ax = plt.subplots()
-ax.bar(amarillas["jugador"], amarillas["tarjetas_amarillas"], color="gold")
-ax.set_title("Tarjetas Amarillas")
-ax.set_ylabel("Cantidad")
-ax.tick_params(axis='x', rotation=90)
-st.pyplot(fig)
+grafica_barras(amarillas, "tarjetas_amarillas", "gold", "Tarjetas Amarillas", "Cantidad")
 
 st.markdown("<h3 style='text-align: center;'>Ranking de Tarjetas Rojas</h3>", unsafe_allow_html=True)
-rojas = df.groupby("jugador")["tarjetas_rojas"].sum().reset_index()
-rojas = rojas[rojas["tarjetas_rojas"] > 0].sort_values(by="tarjetas_rojas", ascending=False).reset_index(drop=True)
-rojas.insert(0, "Posición", range(1, len(rojas) + 1))
+rojas = modelo["2025/stat/tarjetas_rojas"]
 st.dataframe(rojas)
-fig, ax = plt.subplots()
-ax.bar(rojas["jugador"], rojas["tarjetas_rojas"], color="red")
-ax.set_title("Tarjetas Rojas")
-ax.set_ylabel("Cantidad")
-ax.tick_params(axis='x', rotation=90)
-st.pyplot(fig)
+grafica_barras(rojas, "tarjetas_rojas", "red", "Tarjetas Rojas", "Cantidad")
 
 st.markdown("<h3 style='text-align: center;'>Ranking de Autogoles</h3>", unsafe_allow_html=True)
-autogoles = df.groupby("jugador")["autogoles"].sum().reset_index()
-autogoles = autogoles[autogoles["autogoles"] > 0].sort_values(by="autogoles", ascending=False).reset_index(drop=True)
-autogoles.insert(0, "Posición", range(1, len(autogoles) + 1))
+autogoles = modelo["2025/stat/autogoles"]
 st.dataframe(autogoles)
-fig, ax = plt.subplots()
-ax.bar(autogoles["jugador"], autogoles["autogoles"], color="gray")
-ax.set_title("Autogoles")
-ax.set_ylabel("Cantidad")
-ax.tick_params(axis='x', rotation=90)
-st.pyplot(fig)
+grafica_barras(autogoles, "autogoles", "gray", "Autogoles", "Cantidad")
 
 st.markdown("<h3 style='text-align: center;'>Ranking de Penales Atajados</h3>", unsafe_allow_html=True)
-penales = df[df["Penales_Atajados"] > 0].groupby("jugador")["Penales_Atajados"].sum().reset_index()
-penales = penales.sort_values(by="Penales_Atajados", ascending=False).reset_index(drop=True)
-penales.insert(0, "Posición", range(1, len(penales) + 1))
+penales = modelo["2025/penales"]
 st.dataframe(penales)
-fig, ax = plt.subplots()
-ax.bar(penales["jugador"], penales["Penales_Atajados"], color="green")
-ax.set_title("Penales Atajados")
-ax.set_ylabel("Cantidad")
-ax.tick_params(axis='x', rotation=90)
-st.pyplot(fig)
+grafica_barras(penales, "Penales_Atajados", "green", "Penales Atajados", "Cantidad")
 
 st.markdown("<h3 style='text-align: center;'>Ranking de Valla Menos Vencida</h3>", unsafe_allow_html=True)
-arqueros = df[df["arquero"] == True]
-rendimiento = arqueros.groupby("jugador").agg(partidos=("fecha", "count"), goles_recibidos=("goles_recibidos", "sum")).reset_index()
-rendimiento["promedio"] = rendimiento["goles_recibidos"] / rendimiento["partidos"]
-rendimiento = rendimiento.sort_values(by="promedio")
-rendimiento.insert(0, "Posición", range(1, len(rendimiento) + 1))
+rendimiento = modelo["2025/valla"]
 st.dataframe(rendimiento)
-fig, ax = plt.subplots()
-ax.bar(rendimiento["jugador"], rendimiento["promedio"], color="teal")
-ax.set_title("Promedio de Goles Recibidos")
-ax.tick_params(axis='x', rotation=90)
-st.pyplot(fig)
+grafica_barras(rendimiento, "promedio", "teal", "Promedio de Goles Recibidos")
 
 # Puntajes y jugador de la fecha
-df["valla_invicta"] = (df["arquero"] == True) & (df["goles_recibidos"] == 0)
-df["puntos"] = (
-    df["goles"] * 3 +
-    df["asistencias"] * 1 +
-    df["valla_invicta"] * 2 -
-    df["tarjetas_amarillas"] -
-    df["tarjetas_rojas"] * 2 +
-    df["Penales_Atajados"] * 3
-)
-
-fechas_ordenadas = sorted(df["fecha"].unique(), reverse=True)
-resumen_fecha = []
-puntos_por_jugador_fecha = []
-
-for fecha in fechas_ordenadas:
-    df_fecha = df[df["fecha"] == fecha].copy()
-    puntajes = df_fecha.groupby("jugador")["puntos"].sum().reset_index().sort_values(by="puntos", ascending=False)
-    resumen_fecha.append({"Fecha": fecha.date(), "Jugador de la Fecha": puntajes.iloc[0]["jugador"], "Puntos": puntajes.iloc[0]["puntos"]})
-    for _, row in puntajes.iterrows():
-        puntos_por_jugador_fecha.append({"Fecha": fecha.date(), "Jugador": row["jugador"], "Puntos": row["puntos"]})
-
-df_resumen = pd.DataFrame(resumen_fecha)
-df_evolutivo = pd.DataFrame(puntos_por_jugador_fecha)
-df_acumulado = df_evolutivo.groupby("Jugador")["Puntos"].sum().reset_index().sort_values(by="Puntos", ascending=False).reset_index(drop=True)
-df_acumulado.insert(0, "Posición", range(1, len(df_acumulado) + 1))
+df_resumen = modelo["2025/puntos"]["resumen"]
+df_evolutivo = modelo["2025/puntos"]["evolutivo"]
+df_acumulado = modelo["2025/acumulado"]
 
 st.markdown("<h3 style='text-align: center;'>Jugador de la Fecha</h3>", unsafe_allow_html=True)
 st.dataframe(df_resumen)
@@ -155,33 +115,23 @@ st.markdown("<h3 style='text-align: center;'>Ranking acumulado de puntos año</h
 st.dataframe(df_acumulado)
 
 # Top 3 del último partido
-if fechas_ordenadas:
-    ultima_fecha = fechas_ordenadas[0]
-    df_ultima_fecha = df[df["fecha"] == ultima_fecha]
-    puntajes_ultima = df_ultima_fecha.groupby("jugador")["puntos"].sum().reset_index().sort_values(by="puntos", ascending=False)
-    df_top3 = puntajes_ultima.head(3).copy()
-    df_top3.insert(0, "Posición", range(1, len(df_top3) + 1))
-    df_top3.insert(0, "Fecha", ultima_fecha.date())
+df_top3 = modelo["2025/top3"]
+if df_top3 is not None:
     st.markdown("<h3 style='text-align: center;'>Top 3 Jugador de la Fecha del Último Partido</h3>", unsafe_allow_html=True)
     st.dataframe(df_top3)
 
 # Jugador con mayor regularidad
 st.markdown("<h3 style='text-align: center;'>Jugador con mayor regularidad</h3>", unsafe_allow_html=True)
-menciones = pd.concat([
-    goleadores[["jugador"]], asistencias[["jugador"]], amarillas[["jugador"]],
-    rojas[["jugador"]], autogoles[["jugador"]], rendimiento[["jugador"]], penales[["jugador"]]
-])
-conteo_menciones = menciones["jugador"].value_counts().reset_index()
-conteo_menciones.columns = ["Jugador", "Menciones"]
-conteo_menciones.insert(0, "Posición", range(1, len(conteo_menciones) + 1))
+conteo_menciones = modelo["2025/menciones"]
 st.dataframe(conteo_menciones)
 
 # Evolución de puntos por jugador
 st.markdown("<h3 style='text-align: center;'>Evolución de puntos por jugador</h3>", unsafe_allow_html=True)
 jugador_seleccionado = st.selectbox("Selecciona un jugador", df_evolutivo["Jugador"].unique())
-df_jugador = df_evolutivo[df_evolutivo["Jugador"] == jugador_seleccionado].sort_values("Fecha")
+jid = historial.id_por_nombre(modelo["historial"], 2025, jugador_seleccionado)
+df_jugador = historial.serie(modelo["historial"], jid, temporada=2025)
 fig, ax = plt.subplots()
-ax.plot(df_jugador["Fecha"], df_jugador["Puntos"], marker="o")
+ax.plot(df_jugador["fecha"], df_jugador["puntos"], marker="o")
 ax.set_title(f"Evolución de {jugador_seleccionado}")
 ax.set_xlabel("Fecha")
 ax.set_ylabel("Puntos")
@@ -189,42 +139,14 @@ ax.grid(True)
 st.pyplot(fig)
 
 # Resumen de goles por fecha y análisis
-resumen_base = df.groupby(["fecha", "equipo"])["goles"].sum().reset_index()
-resumen_goles = resumen_base.pivot(index="fecha", columns="equipo", values="goles")
-
-for equipo in ["Azul", "Amarillo"]:
-    if equipo not in resumen_goles.columns:
-        resumen_goles[equipo] = 0
-
-resumen_goles = resumen_goles[["Amarillo", "Azul"]].fillna(0)
-
-for _, row in df[df["autogoles"] > 0].iterrows():
-    fecha = row["fecha"]
-    equipo_contrario = "Amarillo" if row["equipo"] == "Azul" else "Azul"
-    if fecha in resumen_goles.index:
-        resumen_goles.at[fecha, equipo_contrario] += row["autogoles"]
-    else:
-        resumen_goles.loc[fecha] = {"Azul": 0, "Amarillo": 0}
-        resumen_goles.at[fecha, equipo_contrario] = row["autogoles"]
-
-resumen_goles = resumen_goles.astype(int).reset_index()
-resumen_goles["Resultado"] = resumen_goles.apply(
-    lambda row: "Empate" if row["Azul"] == row["Amarillo"] else ("Azul" if row["Azul"] > row["Amarillo"] else "Amarillo"), axis=1
-)
-resumen_goles = resumen_goles.sort_values(by="fecha", ascending=False)
+resumen_goles = modelo["2025/resumen_goles"]
 st.markdown("<h3 style='text-align: center;'>Resumen goles por fecha</h3>", unsafe_allow_html=True)
 st.dataframe(resumen_goles)
 
 # Resumen anual
 st.subheader("Resumen Anual de Goles por Equipo")
 total_partidos = df["fecha"].nunique()
-goles_equipo = df.groupby("equipo")["goles"].sum()
-autogoles_equipo = df[df["autogoles"] > 0].copy()
-autogoles_equipo["equipo_beneficiado"] = autogoles_equipo["equipo"].apply(lambda x: "Amarillo" if x == "Azul" else "Azul")
-autogoles_por_equipo = autogoles_equipo.groupby("equipo_beneficiado")["autogoles"].sum()
-total_goles = goles_equipo.add(autogoles_por_equipo, fill_value=0).reset_index()
-total_goles.columns = ["equipo", "goles"]
-total_goles["Promedio Goles por Fecha"] = total_goles["goles"] / total_partidos
+total_goles = modelo["2025/total_goles"]
 st.dataframe(total_goles)
 
 st.subheader("Promedio Total de Goles por Partido")
@@ -251,7 +173,7 @@ st.pyplot(fig)
 
 # Comparativo de Tarjetas Amarillas por Equipo
 st.subheader("Comparativo de Tarjetas Amarillas por Equipo")
-amarillas_equipo = df.groupby("equipo")["tarjetas_amarillas"].sum().reset_index()
+amarillas_equipo = modelo["2025/equipo/tarjetas_amarillas"]
 fig, ax = plt.subplots()
 ax.bar(amarillas_equipo["equipo"], amarillas_equipo["tarjetas_amarillas"], color=["blue" if e == "Azul" else "yellow" for e in amarillas_equipo["equipo"]])
 ax.set_title("Total de Tarjetas Amarillas por Equipo")
@@ -260,7 +182,7 @@ st.pyplot(fig)
 
 # Comparativo de Tarjetas Rojas por Equipo
 st.subheader("Comparativo de Tarjetas Rojas por Equipo")
-rojas_equipo = df.groupby("equipo")["tarjetas_rojas"].sum().reset_index()
+rojas_equipo = modelo["2025/equipo/tarjetas_rojas"]
 fig, ax = plt.subplots()
 ax.bar(rojas_equipo["equipo"], rojas_equipo["tarjetas_rojas"], color=["blue" if e == "Azul" else "yellow" for e in rojas_equipo["equipo"]])
 ax.set_title("Total de Tarjetas Rojas por Equipo")
@@ -269,7 +191,7 @@ st.pyplot(fig)
 
 # Comparativo de Puntos Totales por Equipo
 st.subheader("Comparativo de Puntos Totales por Equipo")
-puntos_equipo = df.groupby("equipo")["puntos"].sum().reset_index()
+puntos_equipo = modelo["2025/equipo/puntos"]
 fig, ax = plt.subplots()
 ax.bar(puntos_equipo["equipo"], puntos_equipo["puntos"], color=["blue" if e == "Azul" else "yellow" for e in puntos_equipo["equipo"]])
 ax.set_title("Puntos Totales por Equipo")
@@ -278,11 +200,5 @@ st.pyplot(fig)
 
 # Ranking MVP del Año
 st.markdown("<h3 style='text-align: center;'>Ranking MVP del año</h3>", unsafe_allow_html=True)
-mvp = df_acumulado.merge(conteo_menciones, on="Jugador", how="left")
-mvp["Menciones"] = mvp["Menciones"].fillna(0)
-mvp["MVP_Score"] = mvp["Puntos"] + mvp["Menciones"] * 2
-mvp = mvp.sort_values(by="MVP_Score", ascending=False).reset_index(drop=True)
-if "Posición" in mvp.columns:
-    mvp.drop(columns=["Posición"], inplace=True)
-mvp.insert(0, "Posición", range(1, len(mvp) + 1))
+mvp = modelo["2025/mvp"]
 st.dataframe(mvp)
@@ -1,14 +1,55 @@
-import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
+import functools
+import sqlite3
+import sys
+import uuid
 from datetime import datetime
-from PIL import Image
+from io import BytesIO
+from pathlib import Path
 from zoneinfo import ZoneInfo
 
+import pandas as pd
+import streamlit as st
+
+# El motor de cálculo vive en el paquete `legendarios` (raíz del repo)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from legendarios import almacen, arranque, asistencia, cache, consultas, equipos, historial, ingesta, ligas, motor, rachas, rating, reglas, snapshots, visitas
+
+# matplotlib (y exportar, que lo usa) se importan al dibujar el primer gráfico:
+# la pantalla de acceso no los necesita (ver `python -m legendarios.arranque --perfil`)
+plt = arranque.perezoso("matplotlib.pyplot")
+exportar = arranque.perezoso("legendarios.exportar")
+
+# =========================
+# Liga (?liga=<id>, ver legendarios/ligas.py)
+# =========================
+LIGA = ligas.elegir(st.query_params.get("liga"))
+
 # =========================
 # Configuración Streamlit
 # =========================
-st.set_page_config(page_title="Estadísticas Legendarios FC 2026", layout="wide")
+st.set_page_config(page_title=f"Estadísticas {LIGA['nombre'] if LIGA else 'Legendarios FC'} 2026", layout="wide")
+
+if LIGA is None:
+    st.error(f"No existe la liga '{st.query_params.get('liga')}'.")
+    st.stop()
+
+# =========================
+# Parámetros / constantes
+# =========================
+DATA_FILE = LIGA["datos"]
+EVENTOS_DIR = LIGA["eventos"]
+pos_list = motor.POS_LIST
+
+# Espacios de la caché de esta liga ("<liga>/modelos", ...), con su presupuesto
+ESPACIOS = ligas.espacios(LIGA)
+
+# Construcción de la temporada: hilos (o procesos con LEGENDARIOS_WORKERS > 1) que
+# van avisando cada nodo terminado, para pintar la página a medida que llegan
+CLAVE_TEMPORADA = ("2026", DATA_FILE)
+AVANCE = arranque.avance(CLAVE_TEMPORADA)
+OPCIONES_CARGA = {"directorio": EVENTOS_DIR, "grafo": ligas.grafo(LIGA), "avisar": AVANCE.avisar, **ingesta.paralelismo()}
+
+DB_PATH = Path(LIGA["analytics_db"])
 
 # =========================
 # Estilos (panel gris + resaltado)
@@ -72,12 +113,11 @@ def df_highlight(df: pd.DataFrame, highlight_col: str, formats: dict | None = No
 col1, col2, col3 = st.columns([1, 2, 1])
 with col2:
     try:
-        logo = Image.open("2026/logo.png")
-        st.image(logo, width=120)
+        st.image(LIGA["logo"], width=120)
     except Exception:
         pass
 
-st.title("⚽ Estadísticas Legendarios FC - Temporada 2026")
+st.title(f"⚽ Estadísticas {LIGA['nombre']} - Temporada 2026")
 
 ultima_actualizacion = datetime.now(ZoneInfo("America/Bogota")).strftime("%Y-%m-%d %H:%M:%S")
 st.markdown(
@@ -89,539 +129,285 @@ st.markdown(
 # Acceso
 # =========================
 
-CLAVE_USER = "enpausa"
-CLAVE_ADMIN = "legendariosgms"
+CLAVE_USER = LIGA["clave_usuario"]
+CLAVE_ADMIN = LIGA["clave_admin"]
 
 clave_usuario = st.text_input("🔐 Ingresa tu código de acceso", type="password")
 
+# Con la pantalla de acceso ya enviada, la temporada se construye en segundo plano
+# mientras se escribe la clave (con `python -m legendarios.arranque` ya viene en curso)
+arranque.calentar(CLAVE_TEMPORADA, ingesta.Temporada, DATA_FILE, **OPCIONES_CARGA)
+
 if clave_usuario not in [CLAVE_USER, CLAVE_ADMIN]:
     st.warning("⚠️ Ingresa el código correcto para ver las estadísticas.")
     st.stop()
 
 es_admin = (clave_usuario == CLAVE_ADMIN)
 
-# ======= AQUÍ VA EL BLOQUE DE TRACKING =======
-
-import sqlite3
-import uuid
-from pathlib import Path
-
-DB_PATH = Path("2026/analytics.db")
-
+# =========================
+# Tracking de visitas
+# =========================
 def track_visit():
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS visits (
-            ts TEXT,
-            session_id TEXT
-        )
-    """)
-
+    # Ver legendarios/visitas.py (cuenta también la espera por el bloqueo de SQLite)
     if "session_id" not in st.session_state:
         st.session_state["session_id"] = str(uuid.uuid4())
-
-    ts = datetime.now(ZoneInfo("America/Bogota")).strftime("%Y-%m-%d %H:%M:%S")
-    cur.execute("INSERT INTO visits (ts, session_id) VALUES (?, ?)", (ts, st.session_state["session_id"]))
-    conn.commit()
-    conn.close()
+    visitas.registrar(DB_PATH, st.session_state["session_id"])
 
 track_visit()
 
 # =========================
-# Parámetros / constantes
-# =========================
-DATA_FILE = "2026/estadisticas_2026.xlsx"
-HOJA_J = "Jugadores"
-HOJA_P = "Partidos"
-HOJA_E = "Eventos"
-
-EQUIPOS_VALIDOS = {"amarillo", "azul"}
-POS_VALIDAS = {"arquero", "defensa", "mediocampista", "delantero"}
-
-# Flags de posición jugada (nuevas)
-FLAG_COLS = ["fue_arquero", "fue_defensa", "fue_mediocampista", "fue_delantero"]
-
-# =========================
-# Carga de datos
-# =========================
-@st.cache_data(show_spinner=False)
-def load_data(path: str):
-    jugadores = pd.read_excel(path, sheet_name=HOJA_J)
-    partidos = pd.read_excel(path, sheet_name=HOJA_P)
-    eventos = pd.read_excel(path, sheet_name=HOJA_E)
-    return jugadores, partidos, eventos
-
-try:
-    jugadores_df, partidos_df, eventos_df = load_data(DATA_FILE)
-except Exception as e:
-    st.error(f"No pude leer el archivo '{DATA_FILE}'. Revisa que exista en el repo y tenga las 3 hojas. Detalle: {e}")
-    st.stop()
-
-# =========================
-# Normalización básica
-# =========================
-partidos_df["fecha"] = pd.to_datetime(partidos_df["fecha"], errors="coerce")
-jugadores_df["posicion"] = jugadores_df["posicion"].astype(str).str.strip().str.lower()
-eventos_df.columns = [c.strip() for c in eventos_df.columns]
-
-# Asegurar columnas nuevas (compatibilidad si aún no existen)
-for c in FLAG_COLS:
-    if c not in eventos_df.columns:
-        eventos_df[c] = 0
-
-# =========================
-# Validaciones robustas
+# Carga + construcción del modelo de la temporada
 # =========================
-def validate(jugadores, partidos, eventos):
-    errors = []
-
-    req_j = {"id_jugador", "nombre", "posicion", "activo", "sancion_grave"}
-    req_p = {"id_partido", "fecha", "resultado_amarillo", "resultado_azul", "marcador_amarillo", "marcador_azul"}
-
-    # Requeridos Eventos (incluye flags nuevos)
-    req_e = {
-        "id_partido","id_jugador","equipo","gol_recibido",
-        "fue_delantero","fue_arquero","fue_defensa","fue_mediocampista",
-        "gol_primer","gol_segundo","gol_total",
-        "autogoles","asistencia_gol","amarillas","rojas","penal_atajado"
+# Objetos de solo lectura que la página lee directo de la temporada viva
+COMPARTIDOS = ["2026/snapshots", "2026/rating", "2026/rachas", "historial"]
+
+def temporada_viva(path: str):
+    # Excel + archivos de eventos por partido de EVENTOS_DIR (ver legendarios/ingesta.py);
+    # cada liga tiene su propia ruta de datos (legendarios/ligas.py). La temporada, con
+    # todos sus resultados, ocupa el espacio "modelos" de la liga según su tamaño y queda
+    # fijada: si se pasa del presupuesto se desaloja lo demás, nunca ella (reconstruirla
+    # en cada visita sería peor que excederse); el panel de caché avisa del exceso
+    # Si aun así sale de la caché, arranque.olvidar hace que la próxima visita la vuelva a
+    # construir en segundo plano, con carga progresiva
+    return cache.CACHE.obtener(ESPACIOS["modelos"], ("temporada", path), arranque.esperar,
+                               ("2026", path), ingesta.Temporada, path, fijar=True,
+                               al_salir=functools.partial(arranque.olvidar, ("2026", path)), **OPCIONES_CARGA)
+
+def sincronizar(viva, path: str):
+    # Lo incorporado cambia el tamaño de la temporada: se vuelve a medir en la caché
+    if viva.sincronizar():
+        cache.CACHE.poner(ESPACIOS["modelos"], ("temporada", path), viva, fijar=True,
+                          al_salir=functools.partial(arranque.olvidar, ("2026", path)))
+
+def construir_modelo(viva) -> dict:
+    # Tablas de la página: referencias a los resultados de la temporada (no se copian
+    # ni se cachean aparte); los snapshots por partido ya quedan compactados en "2026/snapshots"
+    return {
+        k: v for k, v in viva.resultados.items()
+        if k.startswith("2026/") and not k.startswith("2026/partido/") and k not in COMPARTIDOS
     }
 
-    if not req_j.issubset(set(jugadores.columns)):
-        errors.append(f"Hoja Jugadores: faltan columnas: {sorted(list(req_j - set(jugadores.columns)))}")
-    if not req_p.issubset(set(partidos.columns)):
-        errors.append(f"Hoja Partidos: faltan columnas: {sorted(list(req_p - set(partidos.columns)))}")
-    if not req_e.issubset(set(eventos.columns)):
-        errors.append(f"Hoja Eventos: faltan columnas: {sorted(list(req_e - set(eventos.columns)))}")
-
-    if len(eventos) == 0:
-        return errors
-
-    ev = eventos.copy()
-    ev["id_partido"] = pd.to_numeric(ev["id_partido"], errors="coerce")
-    ev["id_jugador"] = pd.to_numeric(ev["id_jugador"], errors="coerce")
-    ev = ev.dropna(subset=["id_partido", "id_jugador"])
-    ev["id_partido"] = ev["id_partido"].astype(int)
-    ev["id_jugador"] = ev["id_jugador"].astype(int)
-
-    ids_j = set(pd.to_numeric(jugadores["id_jugador"], errors="coerce").dropna().astype(int).tolist())
-    ids_p = set(pd.to_numeric(partidos["id_partido"], errors="coerce").dropna().astype(int).tolist())
-
-    if (ev["id_jugador"].isin(ids_j) == False).any():
-        errors.append("Eventos: hay id_jugador que no existen en Jugadores (revisa filas).")
+def ultimo_partido(path: str):
+    # Solo la hoja Partidos: el cuadro de la última fecha no espera a la temporada
+    return cache.CACHE.obtener(ESPACIOS["modelos"], ("resumen", path, ingesta.firma_datos(path, EVENTOS_DIR)),
+                               ingesta.resumen_rapido, path, EVENTOS_DIR)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def base_sql(path: str, version: int):
+    # SQLite en memoria con la temporada (solo lectura); se rehace cuando cambia la versión
+    res = temporada_viva(path).resultados
+    return consultas.construir_db(res["2026/datos"], res["2026/base"])
+
+def paquete_post_partido(path: str, version: int) -> bytes:
+    # PNG por tabla + PDF, en un zip (ver legendarios/exportar.py); uno por versión de datos
+    return cache.CACHE.obtener(ESPACIOS["graficos"], ("paquete", path, version),
+                               lambda: exportar.comprimir(exportar.paquete(temporada_viva(path).resultados)))
+
+def excel_almacen(path: str, version: int) -> bytes:
+    # Exportación del almacén SQLite al formato del Excel; una por versión del almacén
+    def escribir():
+        buf = BytesIO()
+        almacen.exportar_excel(path, buf)
+        return buf.getvalue()
+    return cache.CACHE.obtener(ESPACIOS["graficos"], ("xlsx", path, version), escribir)
+
+def figura_png(fig) -> bytes:
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=150, bbox_inches="tight")
+    plt.close(fig)  # pyplot no la retiene: lo que queda en memoria es el PNG cacheado
+    return buf.getvalue()
+
+def grafico(clave: tuple, dibujar, *args):
+    """
+    Dibuja con `dibujar(*args)` (devuelve la figura) una sola vez por versión de datos y `clave`.
+    Mientras la temporada se construye todavía no hay versión: se dibuja sin cachear.
+    """
+    if version_datos is None:
+        png = figura_png(dibujar(*args))
+    else:
+        png = cache.CACHE.obtener(ESPACIOS["graficos"], (DATA_FILE, version_datos) + clave, lambda: figura_png(dibujar(*args)))
+    st.image(png, width="stretch")
+
+def barras(tabla: pd.DataFrame, col: str, titulo: str):
+    fig, ax = plt.subplots()
+    ax.bar(tabla["nombre"], tabla[col])
+    ax.set_title(titulo)
+    ax.tick_params(axis='x', rotation=90)
+    return fig
+
+def de_snapshots(clave: tuple, funcion, *args):
+    # Espacio "snapshots", por versión de datos (sin versión todavía se calcula directo)
+    if version_datos is None:
+        return funcion(*args)
+    return cache.CACHE.obtener(ESPACIOS["snapshots"], (DATA_FILE, version_datos) + clave, funcion, *args)
+
+def tabla_snapshot(store: dict, pid: int, tipo: str, pos: str) -> pd.DataFrame:
+    # Tabla expandida desde el almacén compacto
+    return de_snapshots((pid, tipo, pos), snapshots.tabla, store, pid, tipo, pos)
+
+def movimientos(store: dict, desde: int, hasta: int) -> pd.DataFrame:
+    # Cambios de puesto y de puntos entre dos partidos (uno por par desde/hasta)
+    return de_snapshots(("movimientos", desde, hasta), snapshots.movimientos, store, desde, hasta)
+
+def pesos_regularidad() -> dict:
+    # Los pesos que ajusta el admin quedan en session_state (peso_<componente>):
+    # el acumulado a otra fecha los usa aunque su sección se pinte antes
+    return {comp: st.session_state.get(f"peso_{comp}", peso) for comp, peso in motor.PESOS_REGULARIDAD.items()}
+
+def cuadro_partido(etiquetas: tuple, pid: int, fecha, cancha, ma: int, mz: int):
+    # Cuadro gris (partido, fecha, cancha, marcador); `etiquetas` = (partido, fecha)
+    st.markdown("<div class='kpi-box'>", unsafe_allow_html=True)
+
+    a, b, c, d = st.columns(4)
+    a.metric(etiquetas[0], pid)
+    b.metric(etiquetas[1], str(fecha))
+    c.metric("📍 Cancha", cancha)
+
+    marcador_html = f"""
+    <div style="font-size:18px; font-weight:600;">
+        <span style="color:#f1c40f;">🟡 AMARILLO {ma}</span>
+        &nbsp; - &nbsp;
+        <span style="color:#3498db;">🔵 AZUL {mz}</span>
+    </div>
+    """
+    d.markdown("⚽ **Marcador**", unsafe_allow_html=True)
+    d.markdown(marcador_html, unsafe_allow_html=True)
 
-    if (ev["id_partido"].isin(ids_p) == False).any():
-        errors.append("Eventos: hay id_partido que no existen en Partidos (revisa filas).")
+    st.markdown("</div>", unsafe_allow_html=True)
 
-    bad_team = eventos[~eventos["equipo"].astype(str).str.strip().str.lower().isin(EQUIPOS_VALIDOS)]
-    if len(bad_team) > 0:
-        errors.append("Eventos: hay valores en 'equipo' distintos a 'amarillo'/'azul' (en minúscula).")
+# Carga progresiva: si la temporada todavía se está construyendo (primera visita
+# con la caché fría), el encabezado sale del resumen rápido y cada sección se
+# pinta en su lugar apenas llegan sus nodos (ver arranque.Avance)
+progresivo = arranque.en_curso(CLAVE_TEMPORADA)
+resumen = None
+if progresivo:
+    try:
+        resumen = ultimo_partido(DATA_FILE)
+    except Exception:
+        pass
+    progresivo = resumen is not None
 
-    bad_pos = jugadores[~jugadores["posicion"].astype(str).str.strip().str.lower().isin(POS_VALIDAS)]
-    if len(bad_pos) > 0:
-        errors.append("Jugadores: hay valores en 'posicion' fuera de: arquero/defensa/mediocampista/delantero (minúscula).")
+def sigue_construyendo() -> bool:
+    return arranque.construyendo(CLAVE_TEMPORADA)
 
-    dup = eventos.duplicated(subset=["id_partido", "id_jugador"]).sum()
-    if dup > 0:
-        errors.append(f"Eventos: hay {dup} duplicados (id_partido + id_jugador). Debe ser 1 fila por jugador por partido.")
+avisos = st.container()
+hueco_kpi = st.empty()
 
-    return errors
+if progresivo:
+    with hueco_kpi.container():
+        cuadro_partido(("🆔 Partidos Jugados", "📅 Última fecha"), resumen["id_partido"], resumen["fecha"].date(),
+                       resumen["cancha"], resumen["marcador_amarillo"], resumen["marcador_azul"])
+    # Errores, avisos y el corte por hoja vacía necesitan datos y base (los primeros nodos)
+    list(AVANCE.listos([["2026/datos", "2026/base"]], sigue_construyendo))
+    progresivo = "2026/base" in AVANCE.resultados
 
-errs = validate(jugadores_df, partidos_df, eventos_df)
-if errs:
-    st.error("Encontré problemas en el Excel. Corrige esto y vuelve a subir el archivo:")
-    for e in errs:
-        st.write(f"- {e}")
+if progresivo:
+    version_datos = None
+    m = AVANCE.resultados
+else:
+    try:
+        viva = temporada_viva(DATA_FILE)
+        sincronizar(viva, DATA_FILE)
+        modelo = construir_modelo(viva)
+    except Exception as e:
+        st.error(f"No pude leer el archivo '{DATA_FILE}'. Revisa que exista en el repo y tenga las 3 hojas. Detalle: {e}")
+        st.stop()
+    version_datos = viva.version
+    m = {**modelo, **{k: viva.resultados[k] for k in COMPARTIDOS}}
+
+datos = m["2026/datos"]
+jugadores_df, partidos_df, eventos_df = datos["jugadores"], datos["partidos"], datos["eventos"]
+
+def errores_archivos(viva):
+    if viva.errores:
+        st.error(f"Hay archivos en '{EVENTOS_DIR}' que no pude incorporar (se ignoran hasta corregirlos):")
+        for errores_archivo in viva.errores.values():
+            for e in errores_archivo:
+                st.write(f"- {e}")
+
+with avisos:
+    errs = datos["errores"]
+    if errs:
+        st.error("Encontré problemas en el Excel. Corrige esto y vuelve a subir el archivo:")
+        for e in errs:
+            st.write(f"- {e}")
+
+    # Tipado de Eventos (Excel o almacén + archivos): celdas numéricas que llegaron como texto
+    tipado = datos["tipado"]
+    celdas_texto, celdas_invalidas = int(tipado["celdas_texto"].sum()), int(tipado["celdas_invalidas"].sum())
+    if es_admin and celdas_invalidas:
+        partidos_invalidos = ", ".join(str(p) for p in tipado.index[tipado["celdas_invalidas"] > 0])
+        st.warning(f"Eventos: {celdas_invalidas} de {celdas_texto} celdas numéricas escritas como texto no son un número "
+                   f"y se tomaron como 0 (1 en partido_completado). Partidos: {partidos_invalidos}. (solo admin)")
+    elif es_admin and celdas_texto:
+        st.caption(f"Eventos: {celdas_texto} celdas numéricas venían como texto y se convirtieron sin problemas. (solo admin)")
+
+    avisos_archivos = st.container()
+    if not progresivo:
+        with avisos_archivos:
+            errores_archivos(viva)
 
 # =========================
 # Si no hay eventos aún
 # =========================
 if len(eventos_df) == 0:
+    hueco_kpi.empty()
     st.info("La hoja 'Eventos' está vacía. Cuando cargues el primer partido, aquí verás todos los rankings y gráficas.")
     st.stop()
 
-# =========================
-# Preparación de Eventos (tipos)
-# =========================
-eventos_df["equipo"] = eventos_df["equipo"].astype(str).str.strip().str.lower()
-
-# Recalcular gol_total
-eventos_df["gol_primer"] = pd.to_numeric(eventos_df["gol_primer"], errors="coerce").fillna(0).astype(int)
-eventos_df["gol_segundo"] = pd.to_numeric(eventos_df["gol_segundo"], errors="coerce").fillna(0).astype(int)
-eventos_df["gol_total"] = (eventos_df["gol_primer"] + eventos_df["gol_segundo"]).astype(int)
-
-# Enteros (incluye flags)
-int_cols = ["gol_recibido","autogoles","asistencia_gol","amarillas","rojas","penal_atajado"] + FLAG_COLS
-for c in int_cols:
-    eventos_df[c] = (
-        eventos_df[c].astype(str)
-        .str.replace(",", ".", regex=False)
-        .str.strip()
-    )
-    eventos_df[c] = pd.to_numeric(eventos_df[c], errors="coerce").fillna(0).astype(int)
-
-# partido_completado (float) - compatibilidad con fraccion_partido
-if "partido_completado" in eventos_df.columns:
-    col_pc = "partido_completado"
-elif "fraccion_partido" in eventos_df.columns:
-    col_pc = "fraccion_partido"
-else:
-    col_pc = None
-
-if col_pc is None:
-    eventos_df["partido_completado"] = 1.0
-else:
-    eventos_df["partido_completado"] = (
-        eventos_df[col_pc].astype(str)
-        .str.replace(",", ".", regex=False)
-        .str.strip()
-    )
-    eventos_df["partido_completado"] = pd.to_numeric(eventos_df["partido_completado"], errors="coerce").fillna(1.0).astype(float)
-
-# ids
-eventos_df["id_partido"] = pd.to_numeric(eventos_df["id_partido"], errors="coerce")
-eventos_df["id_jugador"] = pd.to_numeric(eventos_df["id_jugador"], errors="coerce")
-eventos_df = eventos_df.dropna(subset=["id_partido","id_jugador"])
-eventos_df["id_partido"] = eventos_df["id_partido"].astype(int)
-eventos_df["id_jugador"] = eventos_df["id_jugador"].astype(int)
-
-# =========================
-# Merge base
-# =========================
-jugadores_df["id_jugador"] = pd.to_numeric(jugadores_df["id_jugador"], errors="coerce").astype(int)
-partidos_df["id_partido"] = pd.to_numeric(partidos_df["id_partido"], errors="coerce").astype(int)
-
-base = (
-    eventos_df
-    .merge(jugadores_df, on="id_jugador", how="left")
-    .merge(partidos_df, on="id_partido", how="left", suffixes=("", "_partido"))
-)
-
-# Guardar posición base y calcular posición jugada
-base["posicion_base"] = base["posicion"].astype(str).str.strip().str.lower()
+base = m["2026/base"]
 
 # Advertencia si marcan más de una posición jugada
-base["_flags_sum"] = (
-    base["fue_arquero"].fillna(0).astype(int) +
-    base["fue_defensa"].fillna(0).astype(int) +
-    base["fue_mediocampista"].fillna(0).astype(int) +
-    base["fue_delantero"].fillna(0).astype(int)
-)
 multi = int((base["_flags_sum"] > 1).sum())
 if multi > 0:
-    st.warning(f"⚠️ Ojo: hay {multi} filas en Eventos con MÁS de un 'fue_*' marcado. Se aplicará prioridad: arquero > defensa > mediocampista > delantero.")
-
-def definir_posicion_jugada(row) -> str:
-    if int(row.get("fue_arquero", 0)) == 1:
-        return "arquero"
-    if int(row.get("fue_defensa", 0)) == 1:
-        return "defensa"
-    if int(row.get("fue_mediocampista", 0)) == 1:
-        return "mediocampista"
-    if int(row.get("fue_delantero", 0)) == 1:
-        return "delantero"
-    return str(row.get("posicion_base", "")).strip().lower()
-
-base["posicion_jugada"] = base.apply(definir_posicion_jugada, axis=1)
-
-def acumulados_hasta_fecha(base_df, fecha_limite):
-    df = base_df[base_df["fecha"].dt.date <= fecha_limite].copy()
-
-    agg_f = df.groupby(["id_jugador","nombre","posicion_base","activo","sancion_grave"], as_index=False).agg(
-        puntos_partido_total=("puntos_partido","sum"),
-        partidos_jugados=("id_partido","nunique"),
-        partidos_equivalentes=("partido_completado","sum"),
-        goles=("gol_total","sum"),
-        asistencia_gol=("asistencia_gol","sum"),
-        autogoles=("autogoles","sum"),
-        amarillas=("amarillas","sum"),
-        rojas=("rojas","sum"),
-        penales_atajados=("penal_atajado","sum"),
-        goles_recibidos_arquero=("gol_recibido","sum"),
-    )
-
-    # renombrar para no romper lo demás
-    agg_f = agg_f.rename(columns={"posicion_base": "posicion"})
-
-    agg_f["penal_umbral_amarillas"] = (-3) * (agg_f["amarillas"] // 5)
-    agg_f["penal_umbral_rojas"] = (-5) * (agg_f["rojas"] // 3)
-
-    agg_f["puntos_total"] = agg_f["puntos_partido_total"] + agg_f["penal_umbral_amarillas"] + agg_f["penal_umbral_rojas"]
-    agg_f.loc[agg_f["sancion_grave"] == 1, "puntos_total"] = 0
-
-    mask_arq = (agg_f["posicion"] == "arquero") & (agg_f["partidos_equivalentes"] > 0)
-    agg_f["valla_promedio"] = pd.Series([float("nan")] * len(agg_f), dtype="float64")
-    agg_f.loc[mask_arq, "valla_promedio"] = (
-        agg_f.loc[mask_arq, "goles_recibidos_arquero"] / agg_f.loc[mask_arq, "partidos_equivalentes"]
-    )
-
-    agg_f["puntos_arquero_ajustados"] = agg_f["puntos_total"].astype(float)
-    agg_f.loc[mask_arq, "puntos_arquero_ajustados"] = (
-        agg_f.loc[mask_arq, "puntos_total"].astype(float) - agg_f.loc[mask_arq, "valla_promedio"]
-    )
-
-    return agg_f
-
-base["activo"] = pd.to_numeric(base["activo"], errors="coerce").fillna(0).astype(int)
-base["sancion_grave"] = pd.to_numeric(base["sancion_grave"], errors="coerce").fillna(0).astype(int)
+    with avisos:
+        st.warning(f"⚠️ Ojo: hay {multi} filas en Eventos con MÁS de un 'fue_*' marcado. Se aplicará prioridad: arquero > defensa > mediocampista > delantero.")
 
 # =========================
 # Cuadro resumen: última fecha jugada (EN GRIS)
 # =========================
-ultima_fecha = partidos_df["fecha"].dropna().max()
-if pd.notna(ultima_fecha):
-    last_match = partidos_df.loc[partidos_df["fecha"] == ultima_fecha].sort_values("id_partido", ascending=False).head(1)
-    if not last_match.empty:
-        last_id = int(last_match.iloc[0]["id_partido"])
-        ma = int(last_match.iloc[0]["marcador_amarillo"]) if pd.notna(last_match.iloc[0]["marcador_amarillo"]) else 0
-        mz = int(last_match.iloc[0]["marcador_azul"]) if pd.notna(last_match.iloc[0]["marcador_azul"]) else 0
-        cancha_val = str(last_match.iloc[0].get("cancha", "—"))
-
-        st.markdown("<div class='kpi-box'>", unsafe_allow_html=True)
-
-        a, b, c, d = st.columns(4)
-        a.metric("🆔 Partidos Jugados", last_id)
-        b.metric("📅 Última fecha", str(ultima_fecha.date()))
-        c.metric("📍 Cancha", cancha_val)
-
-        marcador_html = f"""
-        <div style="font-size:18px; font-weight:600;">
-            <span style="color:#f1c40f;">🟡 AMARILLO {ma}</span>
-            &nbsp; - &nbsp;
-            <span style="color:#3498db;">🔵 AZUL {mz}</span>
-        </div>
-        """
-        d.markdown("⚽ **Marcador**", unsafe_allow_html=True)
-        d.markdown(marcador_html, unsafe_allow_html=True)
-
-        st.markdown("</div>", unsafe_allow_html=True)
-else:
+ultimo = resumen if progresivo else motor.ultimo_partido(partidos_df)
+if ultimo is None:
     st.warning("No hay fechas válidas en la hoja Partidos.")
     st.stop()
 
-# =========================
-# Utilidades de cálculo
-# =========================
-def resultado_puntos(row):
-    eq = row["equipo"]
-    r = str(row["resultado_amarillo"]).strip().lower() if eq == "amarillo" else str(row["resultado_azul"]).strip().lower()
-    if r == "g":
-        return 3
-    if r == "e":
-        return 1
-    return 0
-
-def goles_recibidos_equipo(row):
-    if row["equipo"] == "amarillo":
-        return int(row["marcador_azul"]) if pd.notna(row["marcador_azul"]) else 0
-    else:
-        return int(row["marcador_amarillo"]) if pd.notna(row["marcador_amarillo"]) else 0
-
-base["puntos_resultado"] = base.apply(resultado_puntos, axis=1)
-base["goles_recibidos_equipo"] = base.apply(goles_recibidos_equipo, axis=1)
-base["valla_invicta_equipo"] = (base["goles_recibidos_equipo"] == 0).astype(int)
-
-# Penalizaciones por partido (NO prorrateadas) + autogol -1
-base["penal_partido"] = (
-    (-1 * base["amarillas"]) +
-    (-3 * base["rojas"]) +
-    (-1 * base["autogoles"])
-)
-
-def puntos_posicion(row):
-    # OJO: ahora usamos la POSICIÓN JUGADA
-    pos_jugada = str(row.get("posicion_jugada", "")).strip().lower()
-    pos_base = str(row.get("posicion_base", "")).strip().lower()
-
-    goles = int(row["gol_total"])
-    asis = int(row["asistencia_gol"])
-    pen_at = int(row["penal_atajado"])
-    valla = int(row["valla_invicta_equipo"])
-
-    cambio_pos = (pos_jugada != pos_base)
-
-    puntos = 0
-
-    if pos_jugada == "arquero":
-        puntos += 3 * valla
-        puntos += 3 * pen_at
-
-        # Goles NO cuentan si jugó en otra posición (o sea, le tocó ser arquero)
-        if not cambio_pos:
-            puntos += 3 * goles
-
-        puntos += 1 * asis
-
-        # Bonus 3+ goles cuando hubo cambio de posición (por pedido explícito)
-        if cambio_pos and goles >= 3:
-            puntos += 1
-
-    elif pos_jugada == "defensa":
-        puntos += 3 * valla
-
-        if not cambio_pos:
-            puntos += 3 * goles
-
-        puntos += 1 * asis
-
-        if goles >= 3:
-            puntos += 1
-
-    elif pos_jugada == "mediocampista":
-        puntos += 1 * asis
-        if goles >= 3:
-            puntos += 1
-
-    elif pos_jugada == "delantero":
-        puntos += 1 * asis
-        if goles >= 3:
-            puntos += 1
-
-    return puntos
-
-base["puntos_posicion"] = base.apply(puntos_posicion, axis=1)
-
-# =========================
-# Puntos por partido (con partido_completado para TODOS)
-# - prorratea: (resultado + posicion)
-# - NO prorratea: tarjetas/autogol (penal_partido)
-# =========================
-base["puntos_participacion"] = (base["puntos_resultado"] + base["puntos_posicion"]) * base["partido_completado"]
-base["puntos_partido"] = base["puntos_participacion"] + base["penal_partido"]
-
-# =========================
-# Acumulados por jugador (temporada) - por POSICIÓN BASE
-# =========================
-agg = base.groupby(["id_jugador","nombre","posicion_base","activo","sancion_grave"], as_index=False).agg(
-    puntos_partido_total=("puntos_partido","sum"),
-    partidos_jugados=("id_partido","nunique"),
-    partidos_equivalentes=("partido_completado","sum"),
-    goles=("gol_total","sum"),
-    asistencia_gol=("asistencia_gol","sum"),
-    autogoles=("autogoles","sum"),
-    amarillas=("amarillas","sum"),
-    rojas=("rojas","sum"),
-    penales_atajados=("penal_atajado","sum"),
-    goles_recibidos_arquero=("gol_recibido","sum"),
-)
-
-# Renombrar a "posicion" para no romper el resto del código
-agg = agg.rename(columns={"posicion_base": "posicion"})
-
-# Penalización umbrales reiniciables
-agg["penal_umbral_amarillas"] = (-3) * (agg["amarillas"] // 5)
-agg["penal_umbral_rojas"] = (-5) * (agg["rojas"] // 3)
-
-agg["puntos_total"] = agg["puntos_partido_total"] + agg["penal_umbral_amarillas"] + agg["penal_umbral_rojas"]
-agg.loc[agg["sancion_grave"] == 1, "puntos_total"] = 0
-
-# =========================
-# Valla menos vencida (usa gol_recibido / partidos_equivalentes) - por POSICIÓN BASE arquero
-# =========================
-mask_arq = (agg["posicion"] == "arquero") & (agg["partidos_equivalentes"] > 0)
-
-agg["valla_promedio"] = pd.Series([float("nan")] * len(agg), dtype="float64")
-agg.loc[mask_arq, "valla_promedio"] = (
-    agg.loc[mask_arq, "goles_recibidos_arquero"] / agg.loc[mask_arq, "partidos_equivalentes"]
-)
-
-agg["puntos_arquero_ajustados"] = agg["puntos_total"].astype(float)
-agg.loc[mask_arq, "puntos_arquero_ajustados"] = (
-    agg.loc[mask_arq, "puntos_total"].astype(float) - agg.loc[mask_arq, "valla_promedio"]
-)
-
-# =========================
-# Ranking con desempate
-# =========================
-def rank_puntos(df_in, use_arquero_ajustado=False):
-    df = df_in.copy()
-    df["_p"] = df["puntos_arquero_ajustados"] if use_arquero_ajustado else df["puntos_total"]
-    df["_p"] = pd.to_numeric(df["_p"], errors="coerce").fillna(0.0).astype(float)
-
-    df = df.sort_values(
-        by=["_p","partidos_jugados","goles","asistencia_gol"],
-        ascending=[False, False, False, False]
-    ).reset_index(drop=True)
-
-    df.insert(0, "posicion_ranking", range(1, len(df) + 1))
-    return df.drop(columns=["_p"])
-
-agg_activos = agg[agg["activo"] == 1].copy()
-
-# =========================
-# Helper: ranking del día por POSICIÓN JUGADA
-# =========================
-def build_ranking_dia(base_dia: pd.DataFrame, pos: str) -> pd.DataFrame:
-    """
-    Ranking del día:
-    - Se filtra por posicion_jugada (lo que jugó ese día).
-    - Se rankea por puntos_partido (ya calculados con reglas de la posición jugada).
-    """
-    if base_dia.empty:
-        return base_dia
-
-    dfp = base_dia[base_dia["posicion_jugada"] == pos].copy()
-    if dfp.empty:
-        return dfp
-
-    dfp["puntos_rank"] = pd.to_numeric(dfp["puntos_partido"], errors="coerce").fillna(0.0).astype(float)
-
-    r = dfp.groupby(["id_jugador","nombre"], as_index=False).agg(
-        puntos=("puntos_rank","sum"),
-        partido_completado=("partido_completado","sum"),
-        goles=("gol_total","sum"),
-        asistencia_gol=("asistencia_gol","sum"),
-        amarillas=("amarillas","sum"),
-        rojas=("rojas","sum"),
-    )
-
-    r["puntos"] = pd.to_numeric(r["puntos"], errors="coerce").fillna(0.0).astype(float)
-
-    r = r.sort_values(
-        by=["puntos","partido_completado","goles","asistencia_gol"],
-        ascending=[False, False, False, False]
-    ).reset_index(drop=True)
-
-    r.insert(0, "posicion_ranking", range(1, len(r) + 1))
-    return r
+ultima_fecha = ultimo["fecha"]
+if not progresivo:
+    with hueco_kpi.container():
+        cuadro_partido(("🆔 Partidos Jugados", "📅 Última fecha"), ultimo["id_partido"], ultima_fecha.date(),
+                       ultimo["cancha"], ultimo["marcador_amarillo"], ultimo["marcador_azul"])
 
 # =========================
 # 1) Ranking por posición - ÚLTIMA FECHA (posición jugada)
 # =========================
-base_ultima_fecha = base[(base["fecha"].dt.date == ultima_fecha.date()) & (base["activo"] == 1)].copy()
-st.markdown(f"## 🧾 Ranking por posición de la última fecha – {ultima_fecha.date()}")
-
-pos_list = ["arquero","defensa","mediocampista","delantero"]
-cols = st.columns(2)
-for i, pos in enumerate(pos_list):
-    with cols[i % 2]:
-        st.subheader(pos.capitalize())
-        r = build_ranking_dia(base_ultima_fecha, pos)
-        if r.empty:
-            st.info("Sin datos para esta posición en la última fecha.")
-        else:
-            show = r[["posicion_ranking","nombre","puntos","partido_completado","goles","asistencia_gol","amarillas","rojas"]].copy()
-            st.dataframe(
-                df_highlight(show, "puntos"),
-                use_container_width=True
-            )
+def seccion_dia(m):
+    st.markdown(f"## 🧾 Ranking por posición de la última fecha – {ultima_fecha.date()}")
+
+    cols = st.columns(2)
+    for i, pos in enumerate(pos_list):
+        with cols[i % 2]:
+            st.subheader(pos.capitalize())
+            r = m[f"2026/dia/{pos}"]
+            if r.empty:
+                st.info("Sin datos para esta posición en la última fecha.")
+            else:
+                show = r[["posicion_ranking","nombre","puntos","partido_completado","goles","asistencia_gol","amarillas","rojas"]].copy()
+                st.dataframe(
+                    df_highlight(show, "puntos"),
+                    use_container_width=True
+                )
 
 # =========================
 # 2) Ranking acumulado año - por posición (posición base)
 # =========================
-st.markdown("## 🏆 Ranking acumulado por puntos (año) - por posición")
-
-def show_rank_acum(pos):
-    dfp = agg_activos[agg_activos["posicion"] == pos].copy()
-    if dfp.empty:
+def show_rank_acum(m, pos, flechas=None):
+    ranked = m[f"2026/anual/{pos}"]
+    if ranked.empty:
         st.info("Sin datos.")
         return
 
     if pos == "arquero":
-        ranked = rank_puntos(dfp, use_arquero_ajustado=True)
         st.caption("Nota: Arqueros usan Puntos Ajustados = Puntos Totales - Valla (goles_recibidos_arquero/partidos_equivalentes).")
-        ranked["valla_2d"] = pd.to_numeric(ranked["valla_promedio"], errors="coerce").round(2)
 
         show_cols = [
             "posicion_ranking","nombre",
@@ -630,280 +416,623 @@ def show_rank_acum(pos):
         ]
         highlight = "puntos_arquero_ajustados"
     else:
-        ranked = rank_puntos(dfp, use_arquero_ajustado=False)
         show_cols = ["posicion_ranking","nombre","puntos_total","partidos_jugados","partidos_equivalentes","goles","asistencia_gol","amarillas","rojas"]
         highlight = "puntos_total"
 
+    show = ranked[show_cols]
+    if flechas is not None:
+        # Flecha al lado del puesto: cuánto subió o bajó desde el partido anterior
+        show = show.copy()
+        show.insert(1, "mov", ranked["id_jugador"].map(flechas.get(pos, {})).fillna("nuevo"))
+
     st.dataframe(
-        df_highlight(ranked[show_cols], highlight),
+        df_highlight(show, highlight),
         use_container_width=True
     )
 
-cols = st.columns(2)
-for i, pos in enumerate(pos_list):
-    with cols[i % 2]:
-        st.subheader(pos.capitalize())
-        show_rank_acum(pos)
+def seccion_anual(m):
+    st.markdown("## 🏆 Ranking acumulado por puntos (año) - por posición")
 
-# =========================
-# Separador visual: Última fecha vs Acumulados
-# =========================
-st.markdown("---")
-st.markdown(
-    "<div style='text-align:center; color:#6b7280; font-size:13px; margin:-6px 0 10px 0;'>"
-    "⬇️ A partir de aquí: estadísticas acumuladas del año ⬇️"
-    "</div>",
-    unsafe_allow_html=True
-)
+    store = m["2026/snapshots"]
+    pids = list(store["partidos"])
+    flechas = None
+    if len(pids) > 1:
+        mov = movimientos(store, pids[1], pids[0])
+        mov = mov.assign(flecha=snapshots.flechas(mov))
+        flechas = {pos: dict(zip(g["id_jugador"], g["flecha"])) for pos, g in mov.groupby("posicion")}
+        st.caption(f"mov: puestos ganados (▲) o perdidos (▼) respecto del partido {pids[1]}.")
 
-# =========================
-# 3) Rankings generales año (solo 2 gráficas)
-# =========================
-st.markdown("## 📊 Rankings generales (año)")
-
-c1, c2 = st.columns(2)
-with c1:
-    st.subheader("⚽ Goleador (goles acumulados)")
-    goleador = agg_activos.sort_values(by=["goles","partidos_jugados"], ascending=[False, False]).reset_index(drop=True)
-    goleador = goleador[goleador["goles"] > 0].copy()
-    goleador.insert(0, "posicion_ranking", range(1, len(goleador) + 1))
-
-    show = goleador[["posicion_ranking","nombre","goles","partidos_jugados","partidos_equivalentes"]].copy()
-    st.dataframe(df_highlight(show, "goles"), use_container_width=True)
-
-    if not goleador.empty:
-        fig, ax = plt.subplots()
-        ax.bar(goleador["nombre"], goleador["goles"])
-        ax.set_title("Goles por jugador")
-        ax.tick_params(axis='x', rotation=90)
-        st.pyplot(fig)
-
-with c2:
-    st.subheader("🎯 Mayor asistencia_gol (asistencias acumuladas)")
-    asis = agg_activos.sort_values(by=["asistencia_gol","partidos_jugados"], ascending=[False, False]).reset_index(drop=True)
-    asis = asis[asis["asistencia_gol"] > 0].copy()
-    asis.insert(0, "posicion_ranking", range(1, len(asis) + 1))
-
-    show = asis[["posicion_ranking","nombre","asistencia_gol","partidos_jugados","partidos_equivalentes"]].copy()
-    st.dataframe(df_highlight(show, "asistencia_gol"), use_container_width=True)
-
-    if not asis.empty:
-        fig, ax = plt.subplots()
-        ax.bar(asis["nombre"], asis["asistencia_gol"])
-        ax.set_title("Asistencia_gol por jugador")
-        ax.tick_params(axis='x', rotation=90)
-        st.pyplot(fig)
-
-c3, c4 = st.columns(2)
-with c3:
-    st.subheader("🟨 Ranking amarillas")
-    am = agg_activos.sort_values(by=["amarillas","partidos_jugados"], ascending=[False, False]).reset_index(drop=True)
-    am = am[am["amarillas"] > 0].copy()
-    am.insert(0, "posicion_ranking", range(1, len(am) + 1))
-    show = am[["posicion_ranking","nombre","amarillas","partidos_jugados","partidos_equivalentes"]].copy()
-    st.dataframe(df_highlight(show, "amarillas"), use_container_width=True)
-
-with c4:
-    st.subheader("🟥 Ranking rojas")
-    rj = agg_activos.sort_values(by=["rojas","partidos_jugados"], ascending=[False, False]).reset_index(drop=True)
-    rj = rj[rj["rojas"] > 0].copy()
-    rj.insert(0, "posicion_ranking", range(1, len(rj) + 1))
-    show = rj[["posicion_ranking","nombre","rojas","partidos_jugados","partidos_equivalentes"]].copy()
-    st.dataframe(df_highlight(show, "rojas"), use_container_width=True)
-
-st.subheader("🤦 Ranking autogoles")
-ag = agg_activos.sort_values(by=["autogoles","partidos_jugados"], ascending=[False, False]).reset_index(drop=True)
-ag = ag[ag["autogoles"] > 0].copy()
-ag.insert(0, "posicion_ranking", range(1, len(ag) + 1))
-show = ag[["posicion_ranking","nombre","autogoles","partidos_jugados","partidos_equivalentes"]].copy()
-st.dataframe(df_highlight(show, "autogoles"), use_container_width=True)
+    cols = st.columns(2)
+    for i, pos in enumerate(pos_list):
+        with cols[i % 2]:
+            st.subheader(pos.capitalize())
+            show_rank_acum(m, pos, flechas)
 
 # =========================
-# 4) Valla menos vencida (2 decimales) - SIN gráfica
+# 3) Rankings generales año (solo 2 gráficas)
 # =========================
-st.markdown("## 🧤 Ranking valla menos vencida (goles_recibidos_arquero / partidos_equivalentes)")
+def seccion_generales(m):
+    st.markdown("## 📊 Rankings generales (año)")
 
-valla = agg_activos[agg_activos["posicion"] == "arquero"].copy()
-valla = valla[valla["partidos_equivalentes"] > 0].copy()
-valla["valla_promedio_num"] = pd.to_numeric(valla["valla_promedio"], errors="coerce").fillna(0.0).astype(float)
-valla["valla_promedio_2d"] = valla["valla_promedio_num"].round(2)
+    c1, c2 = st.columns(2)
+    with c1:
+        st.subheader("⚽ Goleador (goles acumulados)")
+        goleador = m["2026/general/goles"]
 
-valla = valla.sort_values(by=["valla_promedio_num","partidos_equivalentes"], ascending=[True, False]).reset_index(drop=True)
-valla.insert(0, "posicion_ranking", range(1, len(valla) + 1))
+        show = goleador[["posicion_ranking","nombre","goles","partidos_jugados","partidos_equivalentes"]].copy()
+        st.dataframe(df_highlight(show, "goles"), use_container_width=True)
 
-show = valla[[
-    "posicion_ranking","nombre",
-    "valla_promedio_2d",
-    "goles_recibidos_arquero","partidos_equivalentes","partidos_jugados",
-    "puntos_total","puntos_arquero_ajustados"
-]].copy()
+        if not goleador.empty:
+            grafico(("goles",), barras, goleador, "goles", "Goles por jugador")
 
-st.dataframe(df_highlight(show, "valla_promedio_2d"), use_container_width=True)
+    with c2:
+        st.subheader("🎯 Mayor asistencia_gol (asistencias acumuladas)")
+        asis = m["2026/general/asistencia_gol"]
 
-# =========================
-# 5) Resumen por fecha / promedio goles - SIN gráficas
-# =========================
-st.markdown("## 📅 Resumen de goles por fecha (amarillo vs azul)")
+        show = asis[["posicion_ranking","nombre","asistencia_gol","partidos_jugados","partidos_equivalentes"]].copy()
+        st.dataframe(df_highlight(show, "asistencia_gol"), use_container_width=True)
 
-resumen = partidos_df.copy().dropna(subset=["fecha"]).sort_values("fecha", ascending=False)
-resumen["goles_total_partido"] = resumen["marcador_amarillo"].fillna(0).astype(int) + resumen["marcador_azul"].fillna(0).astype(int)
-st.dataframe(resumen[["fecha","id_partido","marcador_amarillo","marcador_azul","goles_total_partido"]], use_container_width=True)
+        if not asis.empty:
+            grafico(("asistencia_gol",), barras, asis, "asistencia_gol", "Asistencia_gol por jugador")
 
-st.markdown("## 📈 Resumen acumulado de goles por equipo")
-total_goles_amarillo = int(partidos_df["marcador_amarillo"].fillna(0).sum())
-total_goles_azul = int(partidos_df["marcador_azul"].fillna(0).sum())
+    c3, c4 = st.columns(2)
+    with c3:
+        st.subheader("🟨 Ranking amarillas")
+        am = m["2026/general/amarillas"]
+        show = am[["posicion_ranking","nombre","amarillas","partidos_jugados","partidos_equivalentes"]].copy()
+        st.dataframe(df_highlight(show, "amarillas"), use_container_width=True)
 
-c1, c2, c3 = st.columns(3)
-c1.metric("Goles amarillo (acum)", total_goles_amarillo)
-c2.metric("Goles azul (acum)", total_goles_azul)
+    with c4:
+        st.subheader("🟥 Ranking rojas")
+        rj = m["2026/general/rojas"]
+        show = rj[["posicion_ranking","nombre","rojas","partidos_jugados","partidos_equivalentes"]].copy()
+        st.dataframe(df_highlight(show, "rojas"), use_container_width=True)
 
-total_partidos = int(partidos_df["id_partido"].nunique())
-prom_total = round((total_goles_amarillo + total_goles_azul) / total_partidos, 2) if total_partidos > 0 else 0
-c3.metric("⚽ Promedio total goles/partido", prom_total)
+    st.subheader("🤦 Ranking autogoles")
+    ag = m["2026/general/autogoles"]
+    show = ag[["posicion_ranking","nombre","autogoles","partidos_jugados","partidos_equivalentes"]].copy()
+    st.dataframe(df_highlight(show, "autogoles"), use_container_width=True)
 
 # =========================
-# 6) Jugador más regular - SIN gráfica
+# 4) Valla menos vencida (2 decimales) - SIN gráfica
 # =========================
-st.markdown("## 🧠 Ranking jugador más regular (Índice de Regularidad)")
+def seccion_valla(m):
+    st.markdown("## 🧤 Ranking valla menos vencida (goles_recibidos_arquero / partidos_equivalentes)")
 
-reg = agg_activos.copy()
+    valla = m["2026/valla"]
 
-max_part_eq = reg["partidos_equivalentes"].max() if len(reg) else 1
-reg["score_asistencia"] = (reg["partidos_equivalentes"] / max_part_eq) if max_part_eq else 0
+    show = valla[[
+        "posicion_ranking","nombre",
+        "valla_promedio_2d",
+        "goles_recibidos_arquero","partidos_equivalentes","partidos_jugados",
+        "puntos_total","puntos_arquero_ajustados"
+    ]].copy()
 
-reg["score_rol"] = 0.0
-for pos in POS_VALIDAS:
-    sub = reg[reg["posicion"] == pos].copy()
-    if sub.empty:
-        continue
-    if pos == "arquero":
-        s = pd.to_numeric(sub["puntos_arquero_ajustados"], errors="coerce").fillna(0.0).astype(float).rank(pct=True)
-    else:
-        s = pd.to_numeric(sub["puntos_total"], errors="coerce").fillna(0.0).astype(float).rank(pct=True)
-    reg.loc[reg["posicion"] == pos, "score_rol"] = s.values
+    st.dataframe(df_highlight(show, "valla_promedio_2d"), use_container_width=True)
 
-reg["ofensivo"] = reg["goles"] + reg["asistencia_gol"]
-reg["score_ofensivo"] = reg["ofensivo"].rank(pct=True) if len(reg) else 0
+# =========================
+# 5) Resumen por fecha / promedio goles - SIN gráficas
+# =========================
+def seccion_goles(m):
+    partidos_df = m["2026/datos"]["partidos"]
+    st.markdown("## 📅 Resumen de goles por fecha (amarillo vs azul)")
 
-reg["castigo_disciplina"] = (reg["amarillas"] * 1) + (reg["rojas"] * 3) + ((reg["amarillas"] // 5) * 3) + ((reg["rojas"] // 3) * 5)
-disc_pct = reg["castigo_disciplina"].rank(pct=True) if len(reg) else 0
-reg["score_disciplina"] = 1 - disc_pct
+    resumen = motor.resumen_partidos(partidos_df)
+    st.dataframe(resumen[["fecha","id_partido","marcador_amarillo","marcador_azul","goles_total_partido"]], use_container_width=True)
 
-reg["indice_regularidad"] = (
-    0.40 * reg["score_asistencia"] +
-    0.35 * reg["score_rol"] +
-    0.15 * reg["score_ofensivo"] +
-    0.10 * reg["score_disciplina"]
-)
+    st.markdown("## 📈 Resumen acumulado de goles por equipo")
+    total_goles_amarillo = int(partidos_df["marcador_amarillo"].fillna(0).sum())
+    total_goles_azul = int(partidos_df["marcador_azul"].fillna(0).sum())
 
-reg = reg.sort_values(
-    by=["indice_regularidad","partidos_jugados","goles","asistencia_gol"],
-    ascending=[False, False, False, False]
-).reset_index(drop=True)
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Goles amarillo (acum)", total_goles_amarillo)
+    c2.metric("Goles azul (acum)", total_goles_azul)
 
-reg.insert(0, "posicion_ranking", range(1, len(reg) + 1))
+    total_partidos = int(partidos_df["id_partido"].nunique())
+    prom_total = round((total_goles_amarillo + total_goles_azul) / total_partidos, 2) if total_partidos > 0 else 0
+    c3.metric("⚽ Promedio total goles/partido", prom_total)
 
-show = reg[["posicion_ranking","nombre","indice_regularidad","posicion","partidos_jugados","partidos_equivalentes","puntos_total","goles","asistencia_gol","amarillas","rojas"]].copy()
-st.dataframe(df_highlight(show, "indice_regularidad"), use_container_width=True)
+# =========================
+# 6) Jugador más regular - SIN gráfica
+# =========================
+def seccion_regularidad(m):
+    st.markdown("## 🧠 Ranking jugador más regular (Índice de Regularidad)")
 
-st.markdown("---")
+    reg = m["2026/regularidad"]
 
-with st.expander("📆 ¿Quieres ver los datos de una fecha diferente?", expanded=False):
+    # Los componentes vienen precalculados: cambiar pesos solo re-pondera y re-ordena
+    if es_admin:
+        with st.expander("⚖️ Ajustar pesos del índice (solo admin)", expanded=False):
+            cols_w = st.columns(len(motor.PESOS_REGULARIDAD))
+            for i, (comp, peso) in enumerate(motor.PESOS_REGULARIDAD.items()):
+                cols_w[i].number_input(comp, min_value=0.0, max_value=1.0, value=peso, step=0.05, key=f"peso_{comp}")
 
-    part_sel = partidos_df.dropna(subset=["id_partido", "fecha"]).copy()
-    part_sel = part_sel.sort_values(["fecha", "id_partido"], ascending=[False, False])
+    pesos_reg = pesos_regularidad()
+    if pesos_reg != motor.PESOS_REGULARIDAD:
+        reg = motor.combinar_regularidad(reg, pesos_reg)
 
-    part_sel["label"] = part_sel.apply(
-        lambda r: f"Partido {int(r['id_partido'])} | {r['fecha'].date()} | {str(r.get('cancha',''))}",
-        axis=1
-    )
+    show = reg[["posicion_ranking","nombre","indice_regularidad","posicion","partidos_jugados","partidos_equivalentes","puntos_total","goles","asistencia_gol","amarillas","rojas"]].copy()
+    st.dataframe(df_highlight(show, "indice_regularidad"), use_container_width=True)
 
-    opcion = st.selectbox(
-        "Selecciona un partido",
-        ["(Selecciona uno)"] + part_sel["label"].tolist(),
-        index=0
-    )
+# =========================
+# 7) Rating Elo (tiene en cuenta la fuerza del rival)
+# =========================
+def seccion_rating(m):
+    st.markdown("## ⭐ Rating de jugadores (Elo por equipos)")
+    st.caption(f"Todos arrancan en {rating.RATING_INICIAL:.0f}. Ganarle a un equipo más fuerte suma más; el cambio se pondera por partido_completado.")
+
+    estado_rating = m["2026/rating"]
+    tabla_rating = rating.tabla(estado_rating, m["2026/datos"]["jugadores"])
+    tabla_rating = tabla_rating[tabla_rating["id_jugador"].isin(m["2026/activos"]["id_jugador"])].copy()
+    tabla_rating["posicion_ranking"] = range(1, len(tabla_rating) + 1)
+    show = tabla_rating[["posicion_ranking","nombre","rating","partidos","ultimo_cambio"]]
+    st.dataframe(df_highlight(show, "rating"), use_container_width=True)
+
+    elegidos = st.multiselect("Ver evolución del rating", list(tabla_rating["id_jugador"]),
+                              format_func=dict(zip(tabla_rating["id_jugador"], tabla_rating["nombre"])).get)
+    def grafico_rating(elegidos):
+        fig, ax = plt.subplots(figsize=(8, 3))
+        for jid_r in elegidos:
+            hr = rating.historia(estado_rating, jid_r)
+            ax.plot(hr["fecha"], hr["rating"], marker="o", label=tabla_rating.set_index("id_jugador").loc[jid_r, "nombre"])
+        ax.axhline(rating.RATING_INICIAL, color="gray", linewidth=0.8)
+        ax.set_ylabel("Rating")
+        ax.grid(True)
+        ax.legend()
+        return fig
+
+    if elegidos:
+        grafico(("rating", tuple(elegidos)), grafico_rating, elegidos)
 
-    if opcion == "(Selecciona uno)":
-        st.info("Selecciona un partido y aquí verás el resumen y los rankings de esa fecha.")
+# =========================
+# 8) Récords y rachas (se actualizan solo con los partidos nuevos)
+# =========================
+def seccion_rachas(m):
+    st.markdown("## 🏅 Récords y rachas")
+    st.caption("Rachas de partidos seguidos. La valla cuenta solo los partidos en que atajó; "
+               "el invicto con cada equipo, solo los que jugó para ese equipo. \"actual\" es la racha vigente.")
+
+    estado_rachas = m["2026/rachas"]
+    jugadores_r = m["2026/datos"]["jugadores"]
+    ids_activos = m["2026/activos"]["id_jugador"]
+
+    def top(t, n=10):
+        t = t[t["id_jugador"].isin(ids_activos)].head(n).copy()
+        t["posicion_ranking"] = range(1, len(t) + 1)
+        return t.drop(columns=["id_jugador"])
+
+    st.subheader("💥 Mejor partido (puntos_partido)")
+    st.dataframe(df_highlight(top(rachas.mejores_partidos(estado_rachas, jugadores_r)), "puntos_partido"), use_container_width=True)
+
+    nombres = list(rachas.RACHAS.items())
+    for par in [nombres[0:2], nombres[2:4]]:
+        for col, (racha, titulo) in zip(st.columns(2), par):
+            with col:
+                st.subheader(titulo)
+                t = top(rachas.tabla(estado_rachas, jugadores_r, racha))
+                if t.empty:
+                    st.info("Todavía nadie tiene esta racha.")
+                else:
+                    st.dataframe(df_highlight(t, "mejor"), use_container_width=True)
+
+# =========================
+# 9) Asistencia (matriz jugador x partido, ver legendarios/asistencia.py)
+# =========================
+def seccion_asistencia(m):
+    st.markdown("## 🗓️ Asistencia")
+    st.caption("Partidos jugados sobre los de la temporada; \"equivalentes\" suma partido_completado.")
+
+    matriz = m["2026/asistencia"]
+    t = asistencia.asistencia(matriz)
+    t = t[t["activo"] == 1].copy()
+    t["posicion_ranking"] = range(1, len(t) + 1)
+    show = t[["posicion_ranking","nombre","partidos","partidos_equivalentes","tasa","amarillo","azul"]]
+    st.dataframe(df_highlight(show, "partidos", {"tasa": "{:.0%}"}), use_container_width=True)
+
+    st.subheader("🤝 Los que más juegan juntos")
+    pares = asistencia.companeros(matriz)
+    activos_ids = set(t["id_jugador"])
+    pares = pares[pares["id_a"].isin(activos_ids) & pares["id_b"].isin(activos_ids)].head(10)
+    if pares.empty:
+        st.info("Todavía no hay partidos con equipos cargados.")
     else:
-        row = part_sel.loc[part_sel["label"] == opcion].iloc[0]
-        pid = int(row["id_partido"])
-        fsel = pd.to_datetime(row["fecha"]).date()
-        cancha_val = str(row.get("cancha","—")) if pd.notna(row.get("cancha", None)) else "—"
-        ma = int(row["marcador_amarillo"]) if pd.notna(row["marcador_amarillo"]) else 0
-        mz = int(row["marcador_azul"]) if pd.notna(row["marcador_azul"]) else 0
+        st.dataframe(df_highlight(pares.drop(columns=["id_a", "id_b"]), "juntos"), use_container_width=True)
+
+    if es_admin:
+        with st.expander("📋 Revisar flag activo de Jugadores (solo admin)", expanded=False):
+            semanas = st.number_input("Semanas sin jugar", min_value=1, max_value=52,
+                                      value=asistencia.SEMANAS_INACTIVO, key="semanas_inactivo")
+            revisar = asistencia.revisar_activos(matriz, int(semanas))
+            if revisar.empty:
+                st.info("El flag activo coincide con la asistencia.")
+            else:
+                st.dataframe(revisar[["id_jugador","nombre","activo","ultima_fecha","semanas_sin_jugar","partidos_sin_jugar","sugerencia"]],
+                             use_container_width=True)
+
+# =========================
+# Otra fecha / historial de un jugador
+# =========================
+# Abrir un partido o un jugador no vuelve a tocar base ni eventos
+def seccion_otra_fecha(m):
+    store = m["2026/snapshots"]
+    with st.expander("📆 ¿Quieres ver los datos de una fecha diferente?", expanded=False):
+
+        opcion = st.selectbox(
+            "Selecciona un partido",
+            ["(Selecciona uno)"] + snapshots.etiquetas(store),
+            index=0
+        )
 
-        st.markdown("<div class='kpi-box'>", unsafe_allow_html=True)
+        if opcion == "(Selecciona uno)":
+            st.info("Selecciona un partido y aquí verás el resumen y los rankings de esa fecha.")
+            return
 
-        a, b, c, d = st.columns(4)
-        a.metric("🆔 Partido Jugado", pid)
-        b.metric("📅 Fecha", str(fsel))
-        c.metric("📍 Cancha", cancha_val)
-
-        marcador_html = f"""
-        <div style="font-size:18px; font-weight:600;">
-            <span style="color:#f1c40f;">🟡 AMARILLO {ma}</span>
-            &nbsp; - &nbsp;
-            <span style="color:#3498db;">🔵 AZUL {mz}</span>
-        </div>
-        """
-        d.markdown("⚽ **Marcador**", unsafe_allow_html=True)
-        d.markdown(marcador_html, unsafe_allow_html=True)
-
-        st.markdown("</div>", unsafe_allow_html=True)
+        pid = snapshots.partido_por_etiqueta(store, opcion)
+        info = store["partidos"][pid]
+        fsel = info["fecha"]
+        cuadro_partido(("🆔 Partido Jugado", "📅 Fecha"), pid, fsel, info["cancha"], info["marcador_amarillo"], info["marcador_azul"])
 
         st.markdown(f"### 🧾 Rankings del día – {fsel}")
 
-        base_dia = base[(base["id_partido"] == pid) & (base["activo"] == 1)].copy()
-
         cols = st.columns(2)
         for i, pos in enumerate(pos_list):
             with cols[i % 2]:
                 st.subheader(pos.capitalize())
-                r = build_ranking_dia(base_dia, pos)
+                r = tabla_snapshot(store, pid, "dia", pos)
                 if r.empty:
                     st.info("Sin datos para esta posición ese día.")
                 else:
                     show = r[["posicion_ranking","nombre","puntos","partido_completado","goles","asistencia_gol","amarillas","rojas"]].copy()
                     st.dataframe(df_highlight(show, "puntos"), use_container_width=True)
 
+        st.markdown("### ⭐ Rating después del partido")
+        cambios_rating = rating.partido(m["2026/rating"], pid, m["2026/datos"]["jugadores"])
+        if cambios_rating.empty:
+            st.info("Este partido no tiene resultado para el rating.")
+        else:
+            st.dataframe(df_highlight(cambios_rating, "cambio"), use_container_width=True)
+
         ver_acum = st.checkbox(f"Mostrar acumulados a esa fecha ({fsel})", value=True)
 
         if ver_acum:
             st.markdown(f"### 🏆 Acumulados a esa fecha – {fsel}")
 
-            agg_h = acumulados_hasta_fecha(base, fsel)
-            agg_h = agg_h[agg_h["activo"] == 1].copy()
-
-            for pos in ["arquero","defensa","mediocampista","delantero"]:
+            for pos in pos_list:
                 st.subheader(pos.capitalize())
-                dfp = agg_h[agg_h["posicion"] == pos].copy()
+                dfp = tabla_snapshot(store, pid, "hasta", pos)
                 if dfp.empty:
                     st.info("Sin datos.")
                     continue
 
                 if pos == "arquero":
-                    dfp["_p"] = pd.to_numeric(dfp["puntos_arquero_ajustados"], errors="coerce").fillna(0.0)
-                else:
-                    dfp["_p"] = pd.to_numeric(dfp["puntos_total"], errors="coerce").fillna(0.0)
-
-                dfp = dfp.sort_values(
-                    by=["_p","partidos_jugados","goles","asistencia_gol"],
-                    ascending=[False, False, False, False]
-                ).reset_index(drop=True)
-
-                dfp.insert(0, "posicion_ranking", range(1, len(dfp) + 1))
-
-                if pos == "arquero":
-                    dfp["valla_2d"] = pd.to_numeric(dfp["valla_promedio"], errors="coerce").round(2)
                     show = dfp[["posicion_ranking","nombre","puntos_arquero_ajustados","puntos_total","valla_2d","partidos_jugados","goles","asistencia_gol"]].copy()
                     st.dataframe(df_highlight(show, "puntos_arquero_ajustados"), use_container_width=True)
                 else:
                     show = dfp[["posicion_ranking","nombre","puntos_total","partidos_jugados","goles","asistencia_gol"]].copy()
                     st.dataframe(df_highlight(show, "puntos_total"), use_container_width=True)
 
+            st.subheader("🧠 Índice de Regularidad a esa fecha")
+            reg_h = tabla_snapshot(store, pid, "hasta", "regularidad")
+            if reg_h.empty:
+                st.info("Sin datos.")
+            else:
+                pesos_reg = pesos_regularidad()
+                if pesos_reg != motor.PESOS_REGULARIDAD:
+                    reg_h = motor.combinar_regularidad(reg_h, pesos_reg)
+                show = reg_h[["posicion_ranking","nombre","indice_regularidad","posicion","partidos_jugados","partidos_equivalentes","puntos_total","goles","asistencia_gol","amarillas","rojas"]].copy()
+                st.dataframe(df_highlight(show, "indice_regularidad"), use_container_width=True)
+
+def seccion_movimientos(m):
+    store = m["2026/snapshots"]
+    pids = list(store["partidos"])
+    with st.expander("↕️ ¿Quién subió y quién bajó?", expanded=False):
+        if len(pids) < 2:
+            st.info("Hace falta más de un partido para comparar.")
+            return
+
+        etiquetas = {pid: store["partidos"][pid]["label"] for pid in pids}
+        c1, c2 = st.columns(2)
+        desde = c1.selectbox("Desde", pids, index=1, format_func=etiquetas.get, key="mov_desde")
+        hasta = c2.selectbox("Hasta", pids, index=0, format_func=etiquetas.get, key="mov_hasta")
+
+        mov = movimientos(store, desde, hasta)
+        mov = mov.assign(mov=snapshots.flechas(mov))
+        if st.checkbox("Solo quienes cambian de puesto o son nuevos", value=True, key="mov_solo"):
+            mov = mov[(mov["cambio"] != 0) | mov["nuevo"]]
+        if mov.empty:
+            st.info("Nadie cambió de puesto entre esos partidos.")
+            return
+
+        for pos, g in mov.groupby("posicion", sort=False):
+            st.subheader(pos.capitalize())
+            show = g[["posicion_ranking","mov","nombre","posicion_anterior","puntos_total","delta_puntos"]]
+            st.dataframe(df_highlight(show, "mov"), use_container_width=True)
+
+def seccion_historial(m):
+    timeline = m["historial"]
+    with st.expander("👤 Historial de un jugador", expanded=False):
+
+        opciones_j = historial.jugadores(timeline)
+        jid = st.selectbox(
+            "Selecciona un jugador",
+            [None] + list(opciones_j),
+            format_func=lambda i: "(Selecciona uno)" if i is None else opciones_j[i],
+            index=0
+        )
+
+        if jid is None:
+            anteriores = " (incluye temporadas anteriores)" if LIGA["historial_2025"] else ""
+            st.info(f"Selecciona un jugador y aquí verás su evolución partido a partido{anteriores}.")
+            return
+
+        h = historial.serie(timeline, jid)
+
+        a, b, c, d = st.columns(4)
+        a.metric("🗓️ Partidos", len(h))
+        b.metric("⚽ Goles", int(h["goles"].sum()))
+        c.metric("🎯 Asistencias", int(h["asistencias"].sum()))
+        d.metric("🟨 / 🟥", f"{int(h['amarillas'].sum())} / {int(h['rojas'].sum())}")
+
+        def grafico_historial(h):
+            fig, ax = plt.subplots(figsize=(8, 3))
+            for temporada, ht in h.groupby("temporada"):
+                ax.plot(ht["fecha"], ht["puntos_acum"], marker="o", label=str(temporada))
+            ax.set_title(f"Puntos acumulados – {opciones_j[jid]}")
+            ax.set_ylabel("Puntos")
+            ax.grid(True)
+            ax.legend()
+            return fig
+
+        grafico(("historial", jid), grafico_historial, h)
+
+        show = h[["temporada","fecha","id_partido","equipo","posicion","puntos","puntos_acum","goles","asistencias","amarillas","rojas"]].copy()
+        show["fecha"] = show["fecha"].dt.date
+        show = show.sort_values("fecha", ascending=False)
+        if LIGA["historial_2025"]:
+            st.caption("Los puntos de 2025 usan el reglamento de esa temporada; id_partido = -1 en 2025.")
+        st.dataframe(df_highlight(show, "puntos"), use_container_width=True)
+
+# =========================
+# Página: un hueco por sección, en orden
+# =========================
+# sección -> (nodos que necesita, función que la pinta)
+SECCIONES = {
+    "dia": ([f"2026/dia/{pos}" for pos in pos_list], seccion_dia),
+    "anual": ([f"2026/anual/{pos}" for pos in pos_list] + ["2026/snapshots"], seccion_anual),
+    "generales": ([f"2026/general/{col}" for col in motor.STATS_GENERALES], seccion_generales),
+    "valla": (["2026/valla"], seccion_valla),
+    "goles": (["2026/datos"], seccion_goles),
+    "regularidad": (["2026/regularidad"], seccion_regularidad),
+    "rating": (["2026/rating", "2026/activos"], seccion_rating),
+    "rachas": (["2026/rachas", "2026/activos"], seccion_rachas),
+    "asistencia": (["2026/asistencia"], seccion_asistencia),
+    "otra_fecha": (["2026/snapshots", "2026/rating"], seccion_otra_fecha),
+    "movimientos": (["2026/snapshots"], seccion_movimientos),
+    "historial": (["historial"], seccion_historial),
+}
+
+huecos = {}
+huecos["dia"] = st.container()
+huecos["anual"] = st.container()
+
+# Separador visual: Última fecha vs Acumulados
+st.markdown("---")
+st.markdown(
+    "<div style='text-align:center; color:#6b7280; font-size:13px; margin:-6px 0 10px 0;'>"
+    "⬇️ A partir de aquí: estadísticas acumuladas del año ⬇️"
+    "</div>",
+    unsafe_allow_html=True
+)
+
+for nombre in ["generales", "valla", "goles", "regularidad", "rating", "rachas", "asistencia"]:
+    huecos[nombre] = st.container()
+st.markdown("---")
+huecos["otra_fecha"] = st.container()
+huecos["movimientos"] = st.container()
+huecos["historial"] = st.container()
+
+pintadas = set()
+if progresivo:
+    # Cada sección sale apenas están sus nodos (no necesariamente en orden)
+    orden = list(SECCIONES)
+    for i in AVANCE.listos([SECCIONES[s][0] for s in orden], sigue_construyendo):
+        with huecos[orden[i]]:
+            SECCIONES[orden[i]][1](m)
+        pintadas.add(orden[i])
+
+    # Lo de abajo (admin) y lo que no llegó a pintarse usa la temporada ya entregada
+    try:
+        viva = temporada_viva(DATA_FILE)
+        sincronizar(viva, DATA_FILE)
+        modelo = construir_modelo(viva)
+    except Exception as e:
+        st.error(f"No pude leer el archivo '{DATA_FILE}'. Revisa que exista en el repo y tenga las 3 hojas. Detalle: {e}")
+        st.stop()
+    with avisos_archivos:
+        errores_archivos(viva)
+    version_datos = viva.version
+    m = {**modelo, **{k: viva.resultados[k] for k in COMPARTIDOS}}
+
+for nombre, (_, pintar) in SECCIONES.items():
+    if nombre not in pintadas:
+        with huecos[nombre]:
+            pintar(m)
+
 if es_admin:
+    with st.expander("📝 Cargar partido (solo admin)", expanded=False):
+        if not motor.es_almacen(DATA_FILE):
+            st.caption("Los datos salen del Excel. Para cargar partidos desde aquí, pasa la temporada al almacén SQLite "
+                       "(python -m legendarios.almacen importar --db 2026/legendarios.db) y levanta la app con "
+                       "LEGENDARIOS_DATOS=2026/legendarios.db.")
+        else:
+            st.caption("Se guarda el partido y todos sus eventos en una sola transacción: si algo no valida, no se escribe nada. "
+                       "Un id ya cargado se reemplaza completo.")
+            nombres_j = dict(zip(jugadores_df["id_jugador"], jugadores_df["nombre"]))
+            posicion_j = dict(zip(jugadores_df["id_jugador"], jugadores_df["posicion"]))
+            ids_cargados = [int(p) for p in partidos_df["id_partido"]]
+
+            c1, c2, c3, c4, c5 = st.columns(5)
+            pid_nuevo = int(c1.number_input("id_partido", min_value=1, value=max(ids_cargados, default=0) + 1, step=1, key="carga_pid"))
+            fecha_nueva = c2.date_input("Fecha", key="carga_fecha")
+            cancha_nueva = c3.text_input("Cancha", key="carga_cancha")
+            ma_nuevo = int(c4.number_input("Goles amarillo", min_value=0, step=1, key="carga_ma"))
+            mz_nuevo = int(c5.number_input("Goles azul", min_value=0, step=1, key="carga_mz"))
+
+            # Un id ya cargado parte de sus eventos actuales
+            previos = almacen.eventos_de(DATA_FILE, [pid_nuevo])
+            orden_j = sorted((int(j) for j in nombres_j), key=nombres_j.get)
+            col_am, col_az = st.columns(2)
+            lados = {}
+            for col, equipo in [(col_am, "amarillo"), (col_az, "azul")]:
+                ya = [int(j) for j in previos.loc[previos["equipo"] == equipo, "id_jugador"] if j in nombres_j]
+                lados[equipo] = col.multiselect(f"Jugadores {equipo}", orden_j, default=ya, format_func=nombres_j.get,
+                                                key=f"carga_{equipo}_{pid_nuevo}")
+
+            columnas_e = [c for c in almacen.COLUMNAS[motor.HOJA_E] if c not in ("id_partido", "gol_total")]
+            filas = []
+            for equipo, ids in lados.items():
+                rival = mz_nuevo if equipo == "amarillo" else ma_nuevo
+                for j in ids:
+                    previa = previos[(previos["id_jugador"] == j) & (previos["equipo"] == equipo)]
+                    if len(previa):
+                        fila = previa.iloc[0][columnas_e].to_dict()
+                    else:
+                        fila = {c: 0 for c in columnas_e}
+                        fila.update(id_jugador=j, equipo=equipo, gol_recibido=rival, partido_completado=1.0)
+                        if f"fue_{posicion_j.get(j)}" in fila:
+                            fila[f"fue_{posicion_j[j]}"] = 1
+                    filas.append({"nombre": nombres_j[j], **fila})
+            planilla = pd.DataFrame(filas, columns=["nombre"] + columnas_e)
+            planilla = st.data_editor(planilla, disabled=["nombre", "id_jugador", "equipo"], hide_index=True,
+                                      use_container_width=True, key=f"carga_eventos_{pid_nuevo}")
+
+            if st.button("💾 Guardar partido", key="carga_guardar"):
+                partido_nuevo = {
+                    "id_partido": pid_nuevo, "fecha": fecha_nueva, "cancha": cancha_nueva,
+                    "marcador_amarillo": ma_nuevo, "marcador_azul": mz_nuevo,
+                    "resultado_amarillo": almacen.resultado(ma_nuevo, mz_nuevo),
+                    "resultado_azul": almacen.resultado(mz_nuevo, ma_nuevo),
+                }
+                try:
+                    v = almacen.registrar_partido(DATA_FILE, partido_nuevo, planilla.drop(columns="nombre"))
+                except ValueError as e:
+                    st.error(f"No se guardó el partido:\n\n{e}")
+                else:
+                    st.success(f"Partido {pid_nuevo} guardado (versión {v} del almacén).")
+                    st.rerun()
+
+            st.markdown("**Excel**")
+            x1, x2 = st.columns(2)
+            x1.download_button("⬇️ Exportar a Excel", excel_almacen(DATA_FILE, almacen.version(DATA_FILE)), file_name="estadisticas_2026.xlsx",
+                               mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+            subido = x2.file_uploader("Importar Excel (solo se marcan las filas que cambian)", type=["xlsx"], key="carga_importar")
+            if subido is not None and x2.button("Importar", key="carga_importar_ok"):
+                try:
+                    v = almacen.importar_excel(DATA_FILE, subido)
+                except Exception as e:
+                    st.error(f"No se pudo importar: {e}")
+                else:
+                    st.success(f"Importado (versión {v} del almacén).")
+                    st.rerun()
+
+    with st.expander("🤝 Armar equipos para el próximo partido (solo admin)", expanded=False):
+        nombres_j = dict(zip(jugadores_df["id_jugador"], jugadores_df["nombre"]))
+        asistentes = st.multiselect("Asistentes", sorted(nombres_j, key=nombres_j.get), format_func=nombres_j.get)
+        st.caption("Fuerza = puntos por partido de la temporada (con un pequeño ajuste al promedio) + Índice de Regularidad. "
+                   "Un arquero por lado y posiciones repartidas (diferencia máxima de 1 por posición).")
+
+        if len(asistentes) >= 2:
+            fz = equipos.fuerzas(asistentes, jugadores_df, modelo["2026/activos"], modelo["2026/regularidad"])
+            sug = equipos.armar_equipos(fz)
+
+            a, b, c = st.columns(3)
+            a.metric("🟡 Fuerza amarillo", f"{sug['fuerza_amarillo']:.2f}")
+            b.metric("🔵 Fuerza azul", f"{sug['fuerza_azul']:.2f}")
+            c.metric("⚖️ Diferencia", f"{sug['diferencia']:.2f}")
+
+            col_am, col_az = st.columns(2)
+            for col, equipo in [(col_am, "amarillo"), (col_az, "azul")]:
+                with col:
+                    st.markdown(f"**{equipo.capitalize()}** ({len(sug[equipo])})")
+                    st.dataframe(sug[equipo][["nombre","posicion","fuerza"]].round({"fuerza": 2}), use_container_width=True)
+        else:
+            st.info("Selecciona al menos 2 asistentes.")
+
+    with st.expander("🧪 Simulador de reglas (solo admin)", expanded=False):
+        st.caption("Escribe uno o varios valores por regla separados por coma: se prueban todas las combinaciones "
+                   f"(más las de '{reglas.CANDIDATOS_FILE}' si existe) y se comparan con la tabla oficial.")
+        rejilla = {}
+        cols_r = st.columns(2)
+        for i, (perilla, claves) in enumerate(reglas.PERILLAS.items()):
+            oficial = reglas.REGLAS_OFICIALES[claves[0]]
+            texto = cols_r[i % 2].text_input(perilla, value=str(oficial), key=f"regla_{perilla}")
+            try:
+                valores = [float(v) for v in texto.split(",") if v.strip()]
+            except ValueError:
+                st.error(f"'{perilla}': usa números separados por coma.")
+                valores = []
+            rejilla[perilla] = [int(v) if v.is_integer() else v for v in valores] or [oficial]
+
+        try:
+            candidatos = reglas.variantes(rejilla)
+            if Path(reglas.CANDIDATOS_FILE).exists():
+                candidatos.update(reglas.cargar(reglas.CANDIDATOS_FILE))
+        except (ValueError, KeyError) as e:
+            st.error(str(e))
+            candidatos = {}
+
+        if not candidatos:
+            st.info("Cambia al menos un valor para simular.")
+        else:
+            sim = reglas.simular(base, modelo["2026/activos"], candidatos)
+            st.markdown(f"**{len(candidatos)} reglamento(s) simulados**")
+            st.dataframe(sim["resumen"], use_container_width=True)
+
+            elegido = st.selectbox("Ver cambios de puesto de", list(sim["resumen"]["reglamento"]))
+            t = reglas.cambios(sim, elegido)
+            if st.checkbox("Solo quienes cambian de puesto", value=True):
+                t = t[t["cambio"] != 0]
+            show = t[["posicion","nombre","puesto_oficial","puesto_nuevo","cambio","puntos_oficial","puntos_nuevo"]]
+            st.dataframe(df_highlight(show, "cambio"), use_container_width=True)
+
+    with st.expander("🧮 Consultas SQL (solo admin)", expanded=False):
+        st.caption("Tablas: jugadores, partidos, eventos y puntos (una fila por jugador y partido, ya puntuada). Fechas en texto AAAA-MM-DD. Solo lectura.")
+        con = base_sql(DATA_FILE, viva.version)
+        nombre_consulta = st.selectbox(
+            "Consulta",
+            list(consultas.CONSULTAS) + [None],
+            format_func=lambda n: "SQL libre" if n is None else consultas.CONSULTAS[n]["titulo"],
+        )
+        try:
+            if nombre_consulta is None:
+                sql = st.text_area("SQL", value="SELECT cancha, COUNT(*) AS filas FROM puntos GROUP BY cancha")
+                resultado = consultas.consultar(con, sql)
+            else:
+                params = {}
+                orden_j = sorted(nombres_j, key=nombres_j.get)
+                for i, (p, defecto) in enumerate(consultas.CONSULTAS[nombre_consulta]["params"].items()):
+                    if defecto == "jugador":
+                        params[p] = st.selectbox(p, orden_j, index=min(i, len(orden_j) - 1), format_func=nombres_j.get, key=f"sql_{p}")
+                    else:
+                        params[p] = st.number_input(p, value=defecto, step=1, key=f"sql_{p}")
+                resultado = consultas.consulta(con, nombre_consulta, **params)
+            st.dataframe(resultado, use_container_width=True)
+        except Exception as e:
+            st.error(f"La consulta falló: {e}")
+
+    with st.expander("🖼️ Exportar paquete post-partido (solo admin)", expanded=False):
+        st.caption("Resumen del último partido, ranking de la última fecha y ranking del año por posición: "
+                   "un PNG por tabla y un PDF con todas. También: python -m legendarios.exportar --salida export/")
+        if st.button("Generar paquete", key="exportar"):
+            with st.spinner("Dibujando tablas..."):
+                st.session_state["paquete_version"] = viva.version
+                paquete_post_partido(DATA_FILE, viva.version)
+        if st.session_state.get("paquete_version") == viva.version:
+            st.download_button(
+                "⬇️ Descargar paquete (.zip)", paquete_post_partido(DATA_FILE, viva.version),
+                file_name=f"legendarios_2026_v{viva.version}.zip", mime="application/zip",
+            )
+
     with st.expander("📈 Analítica de uso (solo admin)", expanded=False):
         conn = sqlite3.connect(DB_PATH)
         dfv = pd.read_sql_query("SELECT * FROM visits", conn)
@@ -918,3 +1047,20 @@ if es_admin:
 
             st.markdown("### 📅 Visitas por día")
             st.dataframe(por_dia, use_container_width=True)
+
+    with st.expander("🗄️ Caché en memoria (solo admin)", expanded=False):
+        st.caption("Presupuesto en MB por espacio (cache_mb de la liga, o la variable LEGENDARIOS_CACHE_MB, "
+                   f"p. ej. '{LIGA['id']}/modelos=128'). Al pasarse se desaloja lo usado hace más tiempo. "
+                   "La temporada viva queda fijada (fijado_mb): no se desaloja ni se vacía. "
+                   "'hojas' (archivos leídos) la comparten todas las ligas.")
+        stats_cache = cache.CACHE.estadisticas()
+        stats_cache = stats_cache[stats_cache["espacio"].isin(["hojas", *ESPACIOS.values()])].reset_index(drop=True)
+        for _, fila in stats_cache[stats_cache["fijado_mb"] > stats_cache["presupuesto_mb"]].iterrows():
+            st.warning(f"'{fila['espacio']}': la temporada viva ocupa {fila['fijado_mb']:.1f} MB y el presupuesto es de "
+                       f"{fila['presupuesto_mb']:.1f} MB. Se mantiene igual (lo demás del espacio se desaloja): "
+                       "sube el presupuesto de la liga.")
+        st.dataframe(df_highlight(stats_cache, "usado_mb"), use_container_width=True)
+        if st.button("Vaciar caché de la liga", key="vaciar_cache"):
+            for espacio in ESPACIOS.values():
+                cache.CACHE.vaciar(espacio)
+            st.rerun()
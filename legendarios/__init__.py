@@ -0,0 +1,7 @@
+"""
+Motor compartido de las estadísticas de Legendarios FC.
+
+Las apps de Streamlit (2025/app.py, 2026/app.py) solo dibujan; los
+cálculos viven en este paquete para poder reutilizarlos desde la línea
+de comandos (planificador, benchmark) sin levantar Streamlit.
+"""
@@ -0,0 +1,291 @@
+"""
+Almacén transaccional de la temporada en SQLite (alternativa al Excel).
+
+Jugadores, Partidos y Eventos viven en una base SQLite indexada, con las
+mismas columnas que las hojas del Excel. Cada escritura es una sola
+transacción que sube el número de versión de la base y marca con esa
+versión las filas que tocó (un borrado queda como fila con borrado = 1):
+
+- cargar un partido (su fila de Partidos y todos sus Eventos) es todo o
+  nada: no quedan subidas a medias,
+- la app lee solo lo que cambió desde la última versión que vio
+  (`cambios` / `eventos_de`) en vez de volver a leer un libro completo,
+- importar el Excel solo marca las filas que realmente cambiaron, y
+  exportar lo deja con el formato de siempre (mismas hojas y columnas).
+
+Para usarlo como fuente de la app: LEGENDARIOS_DATOS=2026/legendarios.db
+
+    python -m legendarios.almacen importar 2026/estadisticas_2026.xlsx --db 2026/legendarios.db
+    python -m legendarios.almacen exportar copia.xlsx --db 2026/legendarios.db
+    python -m legendarios.almacen version --db 2026/legendarios.db
+"""
+import argparse
+import os
+import sqlite3
+from contextlib import closing, contextmanager
+
+import pandas as pd
+
+from legendarios import cache, motor
+
+# Columnas por hoja (orden del Excel) y su tipo en SQLite
+COLUMNAS = {
+    motor.HOJA_J: {
+        "id_jugador": "INTEGER", "nombre": "TEXT", "posicion": "TEXT", "activo": "INTEGER", "sancion_grave": "INTEGER",
+    },
+    motor.HOJA_P: {
+        "id_partido": "INTEGER", "fecha": "TEXT", "resultado_amarillo": "TEXT", "resultado_azul": "TEXT",
+        "marcador_amarillo": "INTEGER", "marcador_azul": "INTEGER", "cancha": "TEXT",
+    },
+    motor.HOJA_E: {
+        "id_partido": "INTEGER", "id_jugador": "INTEGER", "equipo": "TEXT", "gol_recibido": "INTEGER",
+        "fue_arquero": "INTEGER", "fue_defensa": "INTEGER", "fue_mediocampista": "INTEGER", "fue_delantero": "INTEGER",
+        "gol_primer": "INTEGER", "gol_segundo": "INTEGER", "gol_total": "INTEGER", "autogoles": "INTEGER",
+        "asistencia_gol": "INTEGER", "amarillas": "INTEGER", "rojas": "INTEGER", "penal_atajado": "INTEGER",
+        "partido_completado": "REAL",
+    },
+}
+TABLAS = {motor.HOJA_J: "jugadores", motor.HOJA_P: "partidos", motor.HOJA_E: "eventos"}
+# Jugadores va por su fila en la hoja: el Excel admite un id_jugador repetido
+# (p. ej. un nombre corregido en otra fila) y el almacén debe reproducirlo igual
+CLAVES = {motor.HOJA_J: ["fila"], motor.HOJA_P: ["id_partido"], motor.HOJA_E: ["id_partido", "id_jugador"]}
+
+# Segundos que una escritura espera si otra tiene la base tomada
+ESPERA_BLOQUEO = 10.0
+
+# =========================
+# Conexión y esquema
+# =========================
+def _columnas(hoja: str) -> list:
+    # Las del Excel más las de clave que no son del Excel (la fila de Jugadores)
+    return list(COLUMNAS[hoja]) + [c for c in CLAVES[hoja] if c not in COLUMNAS[hoja]]
+
+def _esquema() -> str:
+    sentencias = ["CREATE TABLE IF NOT EXISTS meta (clave TEXT PRIMARY KEY, valor INTEGER NOT NULL)",
+                  "INSERT OR IGNORE INTO meta VALUES ('version', 0)"]
+    for hoja, columnas in COLUMNAS.items():
+        tabla, clave = TABLAS[hoja], CLAVES[hoja]
+        cols = ", ".join(f"{c} {columnas.get(c, 'INTEGER')}" for c in _columnas(hoja))
+        sentencias.append(
+            f"CREATE TABLE IF NOT EXISTS {tabla} ({cols}, version INTEGER NOT NULL, "
+            f"borrado INTEGER NOT NULL DEFAULT 0, PRIMARY KEY ({', '.join(clave)}))"
+        )
+        sentencias.append(f"CREATE INDEX IF NOT EXISTS idx_{tabla}_version ON {tabla} (version)")
+    sentencias.append("CREATE INDEX IF NOT EXISTS idx_eventos_jugador ON eventos (id_jugador)")
+    return ";\n".join(sentencias) + ";"
+
+def conectar(db: str) -> sqlite3.Connection:
+    """
+    Conexión en modo autocommit (las transacciones se abren a mano); crea el esquema si falta.
+    """
+    con = sqlite3.connect(db, timeout=ESPERA_BLOQUEO, isolation_level=None)
+    con.executescript(_esquema())
+    return con
+
+@contextmanager
+def _transaccion(db: str):
+    """
+    BEGIN IMMEDIATE (toma la escritura antes de leer la versión) y COMMIT al
+    salir; ante cualquier error, ROLLBACK. Entrega (conexión, tx) con
+    tx = {"version": versión nueva, "filas": filas cambiadas}: la versión
+    solo sube si quien escribe sumó alguna fila cambiada.
+    """
+    with closing(conectar(db)) as con:
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            tx = {"version": con.execute("SELECT valor FROM meta WHERE clave = 'version'").fetchone()[0] + 1, "filas": 0}
+            yield con, tx
+            if tx["filas"]:
+                con.execute("UPDATE meta SET valor = ? WHERE clave = 'version'", (tx["version"],))
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+
+def version(db: str) -> int:
+    """
+    Versión actual de la base (0 si está vacía o no existe).
+    """
+    if not os.path.exists(db):
+        return 0
+    # Se consulta en cada recarga de la página: sin pasar por el esquema
+    with closing(sqlite3.connect(db, timeout=ESPERA_BLOQUEO)) as con:
+        try:
+            return con.execute("SELECT valor FROM meta WHERE clave = 'version'").fetchone()[0]
+        except sqlite3.OperationalError:
+            return 0
+
+# =========================
+# Lectura
+# =========================
+# Orden de lectura: el mismo en lecturas completas e incrementales (ver ingesta.Temporada)
+ORDEN = {motor.HOJA_J: "fila", motor.HOJA_P: "id_partido", motor.HOJA_E: "id_partido, rowid"}
+
+def _select(hoja: str, donde: str = "borrado = 0", extra: tuple = ()) -> str:
+    cols = ", ".join(list(COLUMNAS[hoja]) + list(extra))
+    return f"SELECT {cols} FROM {TABLAS[hoja]} WHERE {donde} ORDER BY {ORDEN[hoja]}"
+
+def _leer(db: str, hoja: str) -> pd.DataFrame:
+    with closing(conectar(db)) as con:
+        return pd.read_sql_query(_select(hoja), con)
+
+def leer_hoja(db: str, hoja: str) -> pd.DataFrame:
+    """
+    Equivalente a cache.leer_hoja para el almacén: la tabla vigente, cacheada por versión.
+    """
+    clave = (os.path.abspath(db), "almacen", version(db), hoja)
+    return cache.CACHE.obtener("hojas", clave, _leer, db, hoja).copy(deep=False)
+
+def cambios(db: str, desde: int) -> tuple:
+    """
+    (versión actual, {hoja: filas con version > desde, incluidos los borrados}).
+    """
+    with closing(conectar(db)) as con:
+        con.execute("BEGIN")
+        actual = con.execute("SELECT valor FROM meta WHERE clave = 'version'").fetchone()[0]
+        filas = {
+            hoja: pd.read_sql_query(_select(hoja, "version > ?", ("borrado",)), con, params=(desde,))
+            for hoja in COLUMNAS
+        }
+        con.execute("COMMIT")
+    return actual, filas
+
+def eventos_de(db: str, partidos: list) -> pd.DataFrame:
+    """
+    Eventos vigentes de esos partidos (todas sus filas, no solo las cambiadas).
+    """
+    if not partidos:
+        return pd.DataFrame(columns=list(COLUMNAS[motor.HOJA_E]))
+    marcas = ", ".join("?" * len(partidos))
+    with closing(conectar(db)) as con:
+        return pd.read_sql_query(_select(motor.HOJA_E, f"borrado = 0 AND id_partido IN ({marcas})"),
+                                 con, params=[int(p) for p in partidos])
+
+# =========================
+# Escritura
+# =========================
+def _filas(hoja: str, df: pd.DataFrame) -> list:
+    # Solo las columnas del esquema; fechas como texto AAAA-MM-DD; NaN -> NULL
+    df = df.reindex(columns=_columnas(hoja))
+    if "fecha" in df.columns:
+        df["fecha"] = pd.to_datetime(df["fecha"], errors="coerce").dt.strftime("%Y-%m-%d")
+    df = df.astype(object).where(df.notna(), None)
+    return [tuple(v.item() if hasattr(v, "item") else v for v in fila) for fila in df.itertuples(index=False)]
+
+def _guardar(con: sqlite3.Connection, hoja: str, df: pd.DataFrame, version: int) -> int:
+    """
+    Inserta o actualiza filas por clave; solo las que cambian (o estaban borradas)
+    reciben la versión nueva. Devuelve cuántas filas cambiaron.
+    """
+    tabla, clave, cols = TABLAS[hoja], CLAVES[hoja], _columnas(hoja)
+    resto = [c for c in cols if c not in clave]
+    distinto = " OR ".join([f"{tabla}.{c} IS NOT excluded.{c}" for c in resto] + [f"{tabla}.borrado = 1"])
+    sql = (
+        f"INSERT INTO {tabla} ({', '.join(cols)}, version, borrado) VALUES ({', '.join('?' * len(cols))}, ?, 0) "
+        f"ON CONFLICT ({', '.join(clave)}) DO UPDATE SET "
+        + ", ".join(f"{c} = excluded.{c}" for c in resto)
+        + f", version = excluded.version, borrado = 0 WHERE {distinto}"
+    )
+    antes = con.total_changes
+    con.executemany(sql, [fila + (version,) for fila in _filas(hoja, df)])
+    return con.total_changes - antes
+
+def _borrar_resto(con: sqlite3.Connection, hoja: str, df: pd.DataFrame, version: int, donde: str = "1", params: tuple = ()) -> int:
+    """
+    Marca como borradas las filas vigentes (que cumplen `donde`) cuya clave no está en `df`.
+    """
+    tabla, clave = TABLAS[hoja], CLAVES[hoja]
+    cols = ", ".join(clave)
+    con.execute(f"CREATE TEMP TABLE IF NOT EXISTS _claves_{tabla} AS SELECT {cols} FROM {tabla} WHERE 0")
+    con.execute(f"DELETE FROM _claves_{tabla}")
+    con.executemany(f"INSERT INTO _claves_{tabla} VALUES ({', '.join('?' * len(clave))})",
+                    [tuple(int(v) for v in fila) for fila in df[clave].dropna().itertuples(index=False)])
+    cur = con.execute(
+        f"UPDATE {tabla} SET borrado = 1, version = ? WHERE borrado = 0 AND ({donde}) "
+        f"AND ({cols}) NOT IN (SELECT {cols} FROM _claves_{tabla})",
+        (version, *params),
+    )
+    return cur.rowcount
+
+def importar_excel(db: str, xlsx) -> int:
+    """
+    Reemplaza el contenido por el del Excel (ruta o archivo) en una transacción.
+    Devuelve la versión resultante (la misma si el Excel no trae cambios).
+    """
+    hojas = pd.read_excel(xlsx, sheet_name=list(COLUMNAS))
+    with _transaccion(db) as (con, tx):
+        for hoja, df in hojas.items():
+            df.columns = [str(c).strip() for c in df.columns]
+            if "fila" in CLAVES[hoja]:
+                df = df.assign(fila=range(len(df)))
+            faltan = sorted(set(CLAVES[hoja]) - set(df.columns))
+            if faltan:
+                raise ValueError(f"Hoja {hoja}: faltan columnas: {faltan}")
+            df = df.dropna(subset=CLAVES[hoja])
+            tx["filas"] += _guardar(con, hoja, df, tx["version"]) + _borrar_resto(con, hoja, df, tx["version"])
+    return version(db)
+
+def exportar_excel(db: str, salida) -> None:
+    """
+    Escribe las tres hojas (ruta o buffer) con las columnas del Excel.
+    """
+    with pd.ExcelWriter(salida) as w:
+        for hoja in COLUMNAS:
+            df = _leer(db, hoja)
+            if "fecha" in df.columns:
+                df["fecha"] = pd.to_datetime(df["fecha"], errors="coerce")
+            df.to_excel(w, sheet_name=hoja, index=False)
+
+def resultado(propio: int, rival: int) -> str:
+    return "g" if propio > rival else ("e" if propio == rival else "p")
+
+def registrar_partido(db: str, partido: dict, eventos: pd.DataFrame) -> int:
+    """
+    Guarda un partido (fila de Partidos) y todos sus Eventos en una sola
+    transacción: reemplaza lo que hubiera de ese partido. Valida antes con
+    motor.validate contra los jugadores de la base; si hay errores lanza
+    ValueError y no se escribe nada. Devuelve la versión resultante.
+    """
+    pid = int(partido["id_partido"])
+    partido_df = pd.DataFrame([partido])
+    eventos = eventos.assign(id_partido=pid)
+    eventos = eventos.assign(gol_total=pd.to_numeric(eventos["gol_primer"]).fillna(0) + pd.to_numeric(eventos["gol_segundo"]).fillna(0))
+    for c in motor.FLAG_COLS:
+        if c not in eventos.columns:
+            eventos[c] = 0
+
+    jugadores = _leer(db, motor.HOJA_J)
+    errores = motor.validate(jugadores, partido_df, eventos)
+    if len(eventos) == 0:
+        errores.append("El partido no tiene eventos.")
+    if pd.isna(pd.to_datetime(partido.get("fecha"), errors="coerce")):
+        errores.append("Falta la fecha del partido.")
+    if errores:
+        raise ValueError("\n".join(errores))
+
+    with _transaccion(db) as (con, tx):
+        v = tx["version"]
+        tx["filas"] += _guardar(con, motor.HOJA_P, partido_df, v) + _guardar(con, motor.HOJA_E, eventos, v)
+        tx["filas"] += _borrar_resto(con, motor.HOJA_E, eventos, v, "id_partido = ?", (pid,))
+    return version(db)
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Almacén SQLite de la temporada 2026 (importar / exportar Excel).")
+    parser.add_argument("accion", choices=["importar", "exportar", "version"])
+    parser.add_argument("excel", nargs="?", default="2026/estadisticas_2026.xlsx")
+    parser.add_argument("--db", default="2026/legendarios.db")
+    args = parser.parse_args(argv)
+
+    if args.accion == "importar":
+        print(f"{args.excel} -> {args.db}: versión {importar_excel(args.db, args.excel)}")
+    elif args.accion == "exportar":
+        exportar_excel(args.db, args.excel)
+        print(f"{args.db} -> {args.excel}")
+    else:
+        print(version(args.db))
+
+if __name__ == "__main__":
+    main()
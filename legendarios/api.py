@@ -0,0 +1,279 @@
+"""
+API de solo lectura (JSON sobre HTTP) con las tablas ya calculadas de la
+temporada, para el bot, la pantalla del marcador y cualquier otro cliente
+que hoy tendría que leer la página de Streamlit.
+
+    python -m legendarios.api --puerto 8502
+    python -m legendarios.api --liga otra --puerto 8503   (ver legendarios/ligas.py)
+
+Rutas (todas GET/HEAD):
+
+    /v1/version                         versión de datos y cantidad de partidos
+    /v1/dia/<posicion>                  ranking de la última fecha
+    /v1/anual/<posicion>                ranking acumulado del año
+    /v1/valla                           valla menos vencida
+    /v1/regularidad                     Índice de Regularidad
+    /v1/partidos                        partidos con fecha (orden del selector)
+    /v1/partidos/<id>                   resumen del partido (marcador, goles, rankings del día)
+    /v1/partidos/<id>/hasta/<posicion>  acumulado a la fecha de ese partido
+                                        (<posicion> también puede ser "regularidad")
+    /v1/movimientos/<desde>/<hasta>     cambios de puesto y de puntos entre dos partidos
+
+Cada respuesta lleva un ETag igual a la versión de datos (firma del Excel y
+de los archivos de 2026/eventos). Si el cliente manda If-None-Match con esa
+versión se responde 304 sin tocar las tablas. El JSON de cada ruta se arma
+una sola vez por versión.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from legendarios import ingesta, ligas, motor, planificador, snapshots
+
+# Columnas publicadas (las mismas que muestra 2026/app.py)
+COLS_VALLA = [
+    "posicion_ranking","id_jugador","nombre","valla_promedio_2d","goles_recibidos_arquero",
+    "partidos_equivalentes","partidos_jugados","puntos_total","puntos_arquero_ajustados",
+]
+
+# Segundos entre revisiones del Excel / directorio de eventos (solo stat)
+INTERVALO_REVISION = 2.0
+
+# =========================
+# Datos
+# =========================
+def _firma_archivo(path: str):
+    # El almacén SQLite se sigue por su número de versión (Temporada.sincronizar)
+    if motor.es_almacen(path):
+        return None
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _registros(df: pd.DataFrame, columnas: list | None = None) -> list:
+    if columnas is not None:
+        df = df[[c for c in columnas if c in df.columns]]
+    # to_json ya resuelve NaN -> null, fechas ISO y tipos de numpy
+    return json.loads(df.to_json(orient="records", date_format="iso", force_ascii=False))
+
+def _info(info: dict) -> dict:
+    return {**info, "fecha": str(info["fecha"])}
+
+class Fuente:
+    """
+    Temporada viva + versión de datos estable entre reinicios del proceso.
+    Un cambio en el Excel reconstruye la temporada; los archivos de eventos
+    y las filas nuevas del almacén SQLite se incorporan de forma incremental
+    (ver legendarios/ingesta.py).
+    """
+    def __init__(self, path: str = motor.DATA_FILE, directorio: str = ingesta.EVENTOS_DIR, workers: int | None = None):
+        self.path, self.directorio, self.workers = path, directorio, workers
+        self._lock = threading.Lock()
+        self._revisado = 0.0
+        self._cargar()
+
+    def _cargar(self):
+        self._firma_excel = _firma_archivo(self.path)
+        self.temporada = ingesta.Temporada(self.path, self.directorio, self.workers, grafo=planificador.grafo_2026)
+        self._actualizar_version()
+
+    def _actualizar_version(self):
+        firma = repr((self._firma_excel, self.temporada.version_almacen, sorted(self.temporada.firmas.items())))
+        version = hashlib.sha1(firma.encode()).hexdigest()[:16]
+        # Se reemplaza de una vez: una petición en curso sigue viendo su versión completa
+        self._vigente = (version, self.temporada.resultados, {})
+
+    @property
+    def version(self) -> str:
+        return self._vigente[0]
+
+    def revisar(self):
+        """
+        Como mucho una vez cada INTERVALO_REVISION segundos: incorpora cambios.
+        """
+        ahora = time.monotonic()
+        if ahora - self._revisado < INTERVALO_REVISION:
+            return
+        with self._lock:
+            if ahora - self._revisado < INTERVALO_REVISION:
+                return
+            if _firma_archivo(self.path) != self._firma_excel:
+                self._cargar()
+            elif self.temporada.sincronizar():
+                self._actualizar_version()
+            self._revisado = time.monotonic()
+
+    def respuesta(self, ruta: str) -> tuple:
+        """
+        (version, cuerpo JSON en bytes) de una ruta; None si la ruta no existe.
+        """
+        version, resultados, cache = self._vigente
+        if ruta not in cache:
+            datos = resolver(resultados, ruta, version)
+            cache[ruta] = None if datos is None else json.dumps(datos, ensure_ascii=False).encode("utf-8")
+        return version, cache[ruta]
+
+# =========================
+# Rutas
+# =========================
+RUTAS = [
+    (re.compile(r"^/v1/version$"), "version"),
+    (re.compile(r"^/v1/dia/(\w+)$"), "dia"),
+    (re.compile(r"^/v1/anual/(\w+)$"), "anual"),
+    (re.compile(r"^/v1/valla$"), "valla"),
+    (re.compile(r"^/v1/regularidad$"), "regularidad"),
+    (re.compile(r"^/v1/partidos$"), "partidos"),
+    (re.compile(r"^/v1/partidos/(\d+)$"), "partido"),
+    (re.compile(r"^/v1/partidos/(\d+)/hasta/(\w+)$"), "hasta"),
+    (re.compile(r"^/v1/movimientos/(\d+)/(\d+)$"), "movimientos"),
+]
+
+def resumen_partido(res: dict, pid: int) -> dict | None:
+    store = res["2026/snapshots"]
+    if pid not in store["partidos"]:
+        return None
+    base = res["2026/base"]
+    dia = base[base["id_partido"] == pid]
+    aporte = dia[(dia["gol_total"] > 0) | (dia["asistencia_gol"] > 0)]
+    aporte = aporte[["id_jugador", "nombre", "equipo", "gol_total", "asistencia_gol"]].rename(columns={"gol_total": "goles"})
+    aporte = aporte.sort_values(["goles", "asistencia_gol"], ascending=False)
+    return {
+        "id_partido": pid,
+        **_info(store["partidos"][pid]),
+        "goles_asistencias": _registros(aporte),
+        "dia": {pos: _registros(snapshots.tabla(store, pid, "dia", pos)) for pos in motor.POS_LIST},
+    }
+
+def resolver(res: dict, ruta: str, version: str):
+    """
+    Objeto JSON de una ruta, o None si no existe.
+    """
+    for patron, nombre in RUTAS:
+        m = patron.match(ruta)
+        if m:
+            break
+    else:
+        return None
+
+    store = res["2026/snapshots"]
+    if nombre == "version":
+        return {"version": version, "partidos": len(store["partidos"])}
+    if nombre in ("dia", "anual"):
+        pos = m.group(1)
+        if pos not in motor.POS_LIST:
+            return None
+        cols = snapshots.COLS_DIA if nombre == "dia" else snapshots.COLS_HASTA
+        return _registros(res[f"2026/{nombre}/{pos}"], cols)
+    if nombre == "valla":
+        return _registros(res["2026/valla"], COLS_VALLA)
+    if nombre == "regularidad":
+        return _registros(res["2026/regularidad"], snapshots.COLS_REGULARIDAD)
+    if nombre == "partidos":
+        return [{"id_partido": pid, **_info(i)} for pid, i in store["partidos"].items()]
+    if nombre == "partido":
+        return resumen_partido(res, int(m.group(1)))
+    if nombre == "movimientos":
+        desde, hasta = int(m.group(1)), int(m.group(2))
+        if desde not in store["partidos"] or hasta not in store["partidos"]:
+            return None
+        return _registros(snapshots.movimientos(store, desde, hasta))
+
+    pid, pos = int(m.group(1)), m.group(2)
+    if pid not in store["partidos"] or pos not in (*motor.POS_LIST, "regularidad"):
+        return None
+    return _registros(snapshots.tabla(store, pid, "hasta", pos))
+
+# =========================
+# Servidor
+# =========================
+def _coincide(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    etiquetas = [e.strip().removeprefix("W/") for e in if_none_match.split(",")]
+    return "*" in etiquetas or etag in etiquetas
+
+def crear_servidor(fuente: Fuente, host: str = "127.0.0.1", puerto: int = 8502) -> ThreadingHTTPServer:
+    class Manejador(BaseHTTPRequestHandler):
+        def _responder(self, cuerpo: bool):
+            fuente.revisar()
+            ruta = self.path.split("?", 1)[0].rstrip("/") or "/"
+            etag = f'"{fuente.version}"'
+
+            # Condicional: no se construye ni se serializa nada
+            if _coincide(self.headers.get("If-None-Match"), etag) and any(p.match(ruta) for p, _ in RUTAS):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+
+            version, datos = fuente.respuesta(ruta)
+            if datos is None:
+                datos, codigo = json.dumps({"error": f"Ruta no encontrada: {ruta}"}).encode(), 404
+            else:
+                codigo = 200
+            self.send_response(codigo)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(datos)))
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            if codigo == 200:
+                self.send_header("ETag", f'"{version}"')
+            self.end_headers()
+            if cuerpo:
+                self.wfile.write(datos)
+
+        def do_GET(self):
+            self._responder(cuerpo=True)
+
+        def do_HEAD(self):
+            self._responder(cuerpo=False)
+
+        def log_message(self, formato, *args):
+            if not servidor.silencioso:
+                super().log_message(formato, *args)
+
+    servidor = ThreadingHTTPServer((host, puerto), Manejador)
+    servidor.daemon_threads = True
+    servidor.silencioso = False
+    return servidor
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API JSON de solo lectura con las tablas de la temporada.")
+    parser.add_argument("--excel", default=motor.DATA_FILE)
+    parser.add_argument("--directorio", default=ingesta.EVENTOS_DIR)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8502)
+    parser.add_argument("--liga", help="Id de una liga de legendarios/ligas.py (toma de ahí datos y eventos).")
+    parser.add_argument("--silencioso", action="store_true", help="No registrar cada petición.")
+    args = parser.parse_args(argv)
+
+    if args.liga:
+        liga = ligas.elegir(args.liga)
+        if liga is None:
+            parser.error(f"no existe la liga '{args.liga}'")
+        args.excel, args.directorio = liga["datos"], liga["eventos"]
+    fuente = Fuente(args.excel, args.directorio)
+    servidor = crear_servidor(fuente, args.host, args.puerto)
+    servidor.silencioso = args.silencioso
+    print(f"API en http://{args.host}:{args.puerto}/v1/ (versión de datos {fuente.version})")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Arranque de las apps: importaciones diferidas y precalentamiento.
+
+- `perezoso("matplotlib.pyplot")` devuelve un módulo que se importa recién
+  al usar el primer atributo (la pantalla de acceso no paga matplotlib).
+- `calentar(clave, funcion, *args)` empieza a construir algo pesado (la
+  temporada) en un hilo; `esperar(...)` lo recoge cuando la página lo pide.
+  Las apps lo llaman antes de pedir la clave, así la construcción se
+  solapa con el tiempo que tarda el usuario en escribirla. Si quien lo
+  recibió lo pierde (la caché lo desaloja o se vacía), `olvidar(clave)`
+  deja que se vuelva a calentar.
+- `avance(clave)` junta los resultados parciales de ese precalentamiento
+  (planificador.ejecutar los va avisando): la página pinta cada sección
+  apenas llegan sus nodos, sin esperar a la temporada completa.
+- `python -m legendarios.arranque` levanta Streamlit con la temporada (de
+  cada liga declarada) ya construyéndose desde que arranca el servidor,
+  antes de la primera visita.
+
+Perfil de importaciones de la pantalla de acceso:
+
+    python -m legendarios.arranque --perfil 2026/app.py
+"""
+import argparse
+import importlib
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+
+# =========================
+# Importaciones diferidas
+# =========================
+class _Perezoso:
+    def __init__(self, nombre: str):
+        self._nombre = nombre
+        self._modulo = None
+
+    def __getattr__(self, attr):
+        if self._modulo is None:
+            self._modulo = importlib.import_module(self._nombre)
+        return getattr(self._modulo, attr)
+
+    def __repr__(self):
+        estado = "importado" if self._modulo is not None else "sin importar"
+        return f"<módulo diferido {self._nombre} ({estado})>"
+
+def perezoso(nombre: str):
+    """
+    Módulo que se importa en el primer acceso a un atributo.
+    """
+    return _Perezoso(nombre)
+
+# =========================
+# Precalentamiento
+# =========================
+_LOCK = threading.Lock()
+_HILOS = {}       # clave -> hilo que construye
+_RESULTADOS = {}  # clave -> (ok, valor o excepción)
+_ENTREGADOS = set()  # claves ya recogidas por `esperar` (no se vuelven a calentar hasta `olvidar`)
+
+def calentar(clave, funcion, *args, **kwargs) -> threading.Thread | None:
+    """
+    Empieza `funcion(*args, **kwargs)` en segundo plano, una sola vez por `clave`:
+    no hace nada si ya está en curso o si su resultado ya se entregó.
+    """
+    def construir():
+        try:
+            _RESULTADOS[clave] = (True, funcion(*args, **kwargs))
+        except Exception as e:
+            _RESULTADOS[clave] = (False, e)
+
+    with _LOCK:
+        if clave in _ENTREGADOS:
+            return None
+        if clave not in _HILOS:
+            hilo = threading.Thread(target=construir, name=f"calentar {clave}", daemon=True)
+            _HILOS[clave] = hilo
+            hilo.start()
+        return _HILOS[clave]
+
+def esperar(clave, funcion, *args, **kwargs):
+    """
+    Resultado del precalentamiento de `clave` (lo inicia si nadie lo hizo).
+    Se entrega una sola vez: quien lo recibe lo guarda (st.cache_resource o
+    legendarios.cache); si ya se entregó, se construye de nuevo aquí mismo.
+    """
+    hilo = calentar(clave, funcion, *args, **kwargs)
+    if hilo is not None:
+        hilo.join()
+    with _LOCK:
+        _HILOS.pop(clave, None)
+        _ENTREGADOS.add(clave)
+        resultado = _RESULTADOS.pop(clave, None)
+    try:
+        if resultado is None:
+            return funcion(*args, **kwargs)
+        ok, valor = resultado
+        if not ok:
+            raise valor
+        return valor
+    finally:
+        # Lo entregado ya lo guarda quien lo recibe: el Avance de la clave (todos los
+        # nodos de la construcción, snapshots por partido incluidos) no se retiene más.
+        # Una página que lo esté recorriendo conserva su propia referencia.
+        with _LOCK:
+            _AVANCES.pop(clave, None)
+
+def olvidar(clave):
+    """
+    Quien recibió `clave` ya no la tiene (p. ej. legendarios.cache la desalojó):
+    el próximo `calentar` la vuelve a construir en segundo plano, con su Avance,
+    en vez de que `esperar` la construya dentro del pedido.
+    """
+    with _LOCK:
+        _ENTREGADOS.discard(clave)
+
+def en_curso(clave) -> bool:
+    """
+    True si `clave` se está calentando (o ya terminó) y nadie la recogió todavía.
+    """
+    with _LOCK:
+        return clave in _HILOS
+
+# =========================
+# Resultados parciales
+# =========================
+class Avance:
+    """
+    Resultados que van llegando de una construcción: se pasa `avisar` a
+    planificador.ejecutar (desde cualquier hilo) y la página recorre `listos`.
+    """
+    def __init__(self):
+        self.resultados = {}
+        self._cond = threading.Condition()
+
+    def avisar(self, nombre: str, resultado):
+        with self._cond:
+            self.resultados[nombre] = resultado
+            self._cond.notify_all()
+
+    def listos(self, grupos: list, sigue, intervalo: float = 0.1):
+        """
+        Índices de `grupos` (listas de nombres de nodo) a medida que todos sus
+        nodos están. Termina antes si `sigue()` da False y ya no llegará nada
+        (p. ej. la construcción falló): los grupos no entregados quedan pendientes.
+        """
+        pendientes = dict(enumerate(grupos))
+        while pendientes:
+            with self._cond:
+                hechos = [i for i, g in pendientes.items() if all(n in self.resultados for n in g)]
+                if not hechos:
+                    if not sigue():
+                        return
+                    self._cond.wait(intervalo)
+                    continue
+            for i in hechos:
+                del pendientes[i]
+                yield i
+
+_AVANCES = {}  # clave -> Avance, hasta que `esperar` entrega esa clave
+
+def avance(clave) -> Avance:
+    """
+    Avance compartido de `clave` (el mismo para el precalentamiento y la página).
+    Se descarta cuando `esperar` entrega la construcción de esa clave.
+    """
+    with _LOCK:
+        return _AVANCES.setdefault(clave, Avance())
+
+def construyendo(clave) -> bool:
+    """
+    True mientras el hilo de `clave` sigue vivo.
+    """
+    with _LOCK:
+        hilo = _HILOS.get(clave)
+    return hilo is not None and hilo.is_alive()
+
+# =========================
+# Perfil de arranque
+# =========================
+_SCRIPT_PERFIL = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=300)
+t0 = time.perf_counter()
+at.run()
+t_acceso = time.perf_counter() - t0
+pesados = [m for m in ("matplotlib", "openpyxl", "PIL", "pyarrow") if m in sys.modules]
+res = {"acceso": t_acceso, "modulos": pesados}
+if len(sys.argv) > 2:
+    if sys.argv[3] == "calentado":
+        from legendarios import arranque
+        for hilo in list(arranque._HILOS.values()):
+            hilo.join()
+    t0 = time.perf_counter()
+    at.text_input[0].input(sys.argv[2]).run()
+    res["pagina"] = time.perf_counter() - t0
+print("PERFIL " + json.dumps(res))
+"""
+
+def medir_app(app: str, clave: str | None = None, calentado: bool = True, importtime: bool = False) -> tuple:
+    """
+    Corre la app en un proceso nuevo (sin Streamlit server) y mide:
+    - acceso: hasta pintar la pantalla de acceso (importaciones incluidas),
+    - pagina: con `clave`, lo que tarda la página completa después de ingresarla
+      (con `calentado` se espera antes a que termine el precalentamiento).
+    Devuelve (resultados, salida de -X importtime o "").
+    """
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    comando = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", _SCRIPT_PERFIL, os.path.join(raiz, app)]
+    if clave:
+        comando += [clave, "calentado" if calentado else "frio"]
+    with tempfile.TemporaryDirectory() as tmp:
+        # Las visitas de la medición no van a la analítica real
+        entorno = {**os.environ, "LEGENDARIOS_ANALYTICS_DB": os.path.join(tmp, "analytics.db")}
+        proc = subprocess.run(comando, cwd=raiz, env=entorno, capture_output=True, text=True, check=True)
+    linea = next(l for l in proc.stdout.splitlines() if l.startswith("PERFIL "))
+    return json.loads(linea[len("PERFIL "):]), proc.stderr if importtime else ""
+
+def importaciones_lentas(salida_importtime: str, n: int = 15) -> list:
+    """
+    [(módulo de primer nivel, segundos acumulados)] de la salida de -X importtime.
+    """
+    filas = []
+    for linea in salida_importtime.splitlines():
+        m = re.match(r"import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)", linea)
+        if m and not m.group(2):
+            filas.append((m.group(3), int(m.group(1)) / 1e6))
+    return sorted(filas, key=lambda f: -f[1])[:n]
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Levanta la app con la temporada precalentada, o muestra el perfil de arranque.",
+        epilog="Lo que vaya después de -- se pasa a 'streamlit run' (p. ej. -- --server.port 8501).",
+    )
+    parser.add_argument("app", nargs="?", default="2026/app.py")
+    parser.add_argument("--perfil", action="store_true", help="Solo medir el arranque (no levanta el servidor).")
+    argv = sys.argv[1:] if argv is None else list(argv)
+    corte = argv.index("--") if "--" in argv else len(argv)
+    args = parser.parse_args(argv[:corte])
+    extra = argv[corte + 1:]
+
+    if args.perfil:
+        res, salida = medir_app(args.app, importtime=True)
+        print(f"Pantalla de acceso en {res['acceso']:.2f}s; módulos pesados cargados: {', '.join(res['modulos']) or 'ninguno'}")
+        print(f"{'módulo':<40}{'segundos':>10}")
+        for modulo, t in importaciones_lentas(salida):
+            print(f"{modulo:<40}{t:>10.3f}")
+        return
+
+    # Se importa por nombre (no como __main__) para que la app vea el mismo registro
+    from legendarios import arranque, ingesta, ligas
+    if os.path.normpath(args.app) == os.path.normpath("2026/app.py"):
+        # Una temporada por liga (legendarios/ligas.py), con la misma clave que usa la página
+        for liga in ligas.ligas().values():
+            clave = ("2026", liga["datos"])
+            arranque.calentar(clave, ingesta.Temporada, liga["datos"], directorio=liga["eventos"],
+                              grafo=ligas.grafo(liga), avisar=arranque.avance(clave).avisar, **ingesta.paralelismo())
+
+    from streamlit.web import cli
+    cli.main(["run", args.app, *extra], prog_name="streamlit")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Asistencia y participación: matriz dispersa jugador x partido.
+
+Se arma una vez por versión de los datos (nodo 2026/asistencia) a partir de
+Eventos, en formato CSR (una fila por jugador, sus partidos contiguos):
+
+    indptr[i]:indptr[i+1]   entradas del jugador i
+    columnas                partido de cada entrada (columna, en orden fecha, id_partido)
+    peso                    partido_completado de esa entrada
+    lado                    +1 amarillo, -1 azul, 0 sin equipo
+
+Las consultas son operaciones sobre esos arreglos, sin recorrer jugador por
+jugador: asistencia (conteos por fila), inactividad (última columna de cada
+fila) y compañeros (A·Aᵀ por columnas: pares de jugadores de cada partido,
+juntos cuando los lados coinciden y rivales cuando son opuestos).
+Sin scipy: la matriz es de numpy y la temporada entra holgada en memoria.
+"""
+import numpy as np
+import pandas as pd
+
+LADOS = {"amarillo": 1, "azul": -1}
+
+# Semanas sin jugar a partir de las cuales se sugiere revisar el flag activo
+SEMANAS_INACTIVO = 4
+
+# =========================
+# Construcción
+# =========================
+def construir(datos: dict) -> dict:
+    """
+    {"jugadores", "nombres", "activo", "partidos", "fechas", "indptr", "columnas",
+    "peso", "lado"}. Filas: todos los de Jugadores (también quien no jugó nunca)
+    más los que solo aparecen en Eventos. Columnas: los partidos con fecha.
+    Una fila repetida de (jugador, partido) suma su partido_completado.
+    """
+    partidos = datos["partidos"].dropna(subset=["fecha"]).sort_values(["fecha", "id_partido"], kind="stable")
+    partidos = partidos.drop_duplicates("id_partido")
+    ids_partido = partidos["id_partido"].to_numpy(dtype=int)
+
+    jugadores = datos["jugadores"].drop_duplicates("id_jugador")
+    eventos = datos["eventos"]
+    ids_jugador = np.union1d(jugadores["id_jugador"].to_numpy(dtype=int), eventos["id_jugador"].to_numpy(dtype=int))
+
+    fila = np.searchsorted(ids_jugador, eventos["id_jugador"].to_numpy(dtype=int))
+    columna = pd.Index(ids_partido).get_indexer(eventos["id_partido"].to_numpy(dtype=int))
+    lado = eventos["equipo"].map(LADOS).fillna(0).to_numpy(dtype=np.int8)
+    peso = eventos["partido_completado"].to_numpy(dtype=float)
+
+    # Eventos de partidos sin fecha no entran; (fila, columna) repetidos se juntan
+    ok = columna >= 0
+    clave = fila[ok].astype(np.int64) * max(len(ids_partido), 1) + columna[ok]
+    unicas, primera, inversa = np.unique(clave, return_index=True, return_inverse=True)
+    n_col = max(len(ids_partido), 1)
+
+    por_jugador = jugadores.set_index("id_jugador")
+    nombres = por_jugador["nombre"].reindex(ids_jugador)
+    activo = pd.to_numeric(por_jugador["activo"], errors="coerce").reindex(ids_jugador).fillna(0).astype(int)
+    return {
+        "jugadores": ids_jugador,
+        "nombres": nombres.fillna("").astype(str).to_numpy(),
+        "activo": activo.to_numpy(),
+        "partidos": ids_partido,
+        "fechas": partidos["fecha"].to_numpy(dtype="datetime64[ns]"),
+        "indptr": np.concatenate([[0], np.cumsum(np.bincount(unicas // n_col, minlength=len(ids_jugador)))]),
+        "columnas": (unicas % n_col).astype(np.int64),
+        "peso": np.bincount(inversa, weights=peso[ok], minlength=len(unicas)),
+        "lado": lado[ok][primera],
+    }
+
+def _filas(m: dict) -> np.ndarray:
+    # Fila de cada entrada (la inversa de indptr)
+    return np.repeat(np.arange(len(m["jugadores"])), np.diff(m["indptr"]))
+
+def _ventana(m: dict, desde=None, hasta=None) -> np.ndarray:
+    # Columnas (partidos) dentro de [desde, hasta]
+    fechas = m["fechas"]
+    dentro = np.ones(len(fechas), dtype=bool)
+    if desde is not None:
+        dentro &= fechas >= np.datetime64(pd.Timestamp(desde))
+    if hasta is not None:
+        dentro &= fechas <= np.datetime64(pd.Timestamp(hasta))
+    return dentro
+
+# =========================
+# Consultas
+# =========================
+def asistencia(m: dict, desde=None, hasta=None) -> pd.DataFrame:
+    """
+    Por jugador: partidos jugados, partidos equivalentes (suma de
+    partido_completado), tasas sobre los partidos del período y partidos
+    con cada equipo. De mayor a menor asistencia.
+    """
+    dentro = _ventana(m, desde, hasta)[m["columnas"]]
+    filas = _filas(m)[dentro]
+    n = len(m["jugadores"])
+    total = int(_ventana(m, desde, hasta).sum())
+
+    t = pd.DataFrame({
+        "id_jugador": m["jugadores"],
+        "nombre": m["nombres"],
+        "activo": m["activo"],
+        "partidos": np.bincount(filas, minlength=n),
+        "partidos_equivalentes": np.bincount(filas, weights=m["peso"][dentro], minlength=n),
+        "amarillo": np.bincount(filas, weights=m["lado"][dentro] == 1, minlength=n).astype(int),
+        "azul": np.bincount(filas, weights=m["lado"][dentro] == -1, minlength=n).astype(int),
+    })
+    t["tasa"] = t["partidos"] / total if total else 0.0
+    t["tasa_equivalente"] = t["partidos_equivalentes"] / total if total else 0.0
+    t = t.sort_values(["partidos", "partidos_equivalentes"], ascending=False, kind="stable").reset_index(drop=True)
+    t.insert(0, "posicion_ranking", range(1, len(t) + 1))
+    return t
+
+def inactividad(m: dict, semanas: int = SEMANAS_INACTIVO, fecha=None) -> pd.DataFrame:
+    """
+    Último partido de cada jugador, semanas desde entonces hasta `fecha` (por
+    defecto la del último partido) y partidos que se perdió desde ese día.
+    inactivo: no jugó en las últimas `semanas` (o nunca jugó).
+    """
+    n, n_col = len(m["jugadores"]), len(m["partidos"])
+    ultima = np.full(n, -1)
+    np.maximum.at(ultima, _filas(m), m["columnas"])
+    jugo = ultima >= 0
+
+    if fecha is None:
+        fecha = m["fechas"][-1] if n_col else None
+    fechas_ult = np.full(n, np.datetime64("NaT"), dtype="datetime64[ns]")
+    fechas_ult[jugo] = m["fechas"][ultima[jugo]]
+    dias = (np.datetime64(pd.Timestamp(fecha), "ns") - fechas_ult) / np.timedelta64(1, "D")
+
+    t = pd.DataFrame({
+        "id_jugador": m["jugadores"],
+        "nombre": m["nombres"],
+        "activo": m["activo"],
+        "ultima_fecha": pd.Series(fechas_ult).dt.date,
+        "ultimo_partido": pd.array(np.where(jugo, m["partidos"][ultima] if n_col else 0, 0), dtype="Int64"),
+        "semanas_sin_jugar": np.floor(dias / 7),
+        "partidos_sin_jugar": np.where(jugo, n_col - 1 - ultima, n_col),
+    })
+    t.loc[~jugo, "ultimo_partido"] = pd.NA
+    t["inactivo"] = ~jugo | (t["semanas_sin_jugar"] >= semanas)
+    return t.sort_values(["partidos_sin_jugar", "id_jugador"], ascending=[False, True], kind="stable").reset_index(drop=True)
+
+def revisar_activos(m: dict, semanas: int = SEMANAS_INACTIVO, fecha=None) -> pd.DataFrame:
+    """
+    Jugadores cuyo flag activo de Jugadores no coincide con lo que jugaron:
+    activo = 1 sin jugar hace `semanas` o más, o activo = 0 que sí jugó.
+    """
+    t = inactividad(m, semanas, fecha)
+    revisar = ((t["activo"] == 1) & t["inactivo"]) | ((t["activo"] == 0) & ~t["inactivo"])
+    t = t[revisar].copy()
+    t["sugerencia"] = np.where(t["activo"] == 1, "pasar a inactivo", "pasar a activo")
+    return t.reset_index(drop=True)
+
+def _pares(m: dict, dentro: np.ndarray) -> tuple:
+    """
+    Pares de entradas (a, b) de un mismo partido con fila a < fila b: los
+    términos no nulos de A·Aᵀ sobre el triángulo superior. Se ordenan las
+    entradas por columna (la transpuesta, CSC) y cada partido con k jugadores
+    aporta sus k² combinaciones en un solo bloque vectorizado.
+    """
+    entradas = np.flatnonzero(dentro)
+    entradas = entradas[np.argsort(m["columnas"][entradas], kind="stable")]
+    col = m["columnas"][entradas]
+    k = np.bincount(col, minlength=len(m["partidos"]))[col]
+    inicio = np.searchsorted(col, col)
+
+    izq = np.repeat(np.arange(len(entradas)), k)
+    der = np.repeat(inicio, k) + (np.arange(len(izq)) - np.repeat(np.cumsum(k) - k, k))
+    a, b = entradas[izq], entradas[der]
+    filas = _filas(m)
+    arriba = filas[a] < filas[b]
+    return a[arriba], b[arriba], filas
+
+def companeros(m: dict, minimo: int = 1, desde=None, hasta=None) -> pd.DataFrame:
+    """
+    Pares de jugadores que coincidieron en al menos `minimo` partidos:
+    juntos (mismo equipo), rivales (equipos opuestos) y partidos en común,
+    de más a menos partidos juntos.
+    """
+    columnas = ["id_a", "nombre_a", "id_b", "nombre_b", "juntos", "rivales", "partidos"]
+    a, b, filas = _pares(m, _ventana(m, desde, hasta)[m["columnas"]])
+    if len(a) == 0:
+        return pd.DataFrame(columns=columnas)
+
+    n = len(m["jugadores"])
+    clave = filas[a].astype(np.int64) * n + filas[b]
+    signo = m["lado"][a].astype(int) * m["lado"][b]
+    unicas, inversa = np.unique(clave, return_inverse=True)
+    t = pd.DataFrame({
+        "id_a": m["jugadores"][unicas // n],
+        "nombre_a": m["nombres"][unicas // n],
+        "id_b": m["jugadores"][unicas % n],
+        "nombre_b": m["nombres"][unicas % n],
+        "juntos": np.bincount(inversa, weights=signo == 1).astype(int),
+        "rivales": np.bincount(inversa, weights=signo == -1).astype(int),
+        "partidos": np.bincount(inversa),
+    })
+    t = t[t["partidos"] >= minimo]
+    return t.sort_values(["juntos", "partidos"], ascending=False, kind="stable").reset_index(drop=True)[columnas]
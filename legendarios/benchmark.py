@@ -0,0 +1,226 @@
+"""
+Benchmark de construcción de la temporada.
+
+Genera una temporada sintética (mismo formato del Excel 2026) y mide el
+grafo completo del planificador, incluidos los snapshots de cada partido,
+de forma secuencial y con distintos tamaños de pool, además de la
+ingesta incremental de un partido nuevo desde un archivo CSV, el tipado de
+los contadores de Eventos, la lectura de temporadas cerradas desde el
+archivo histórico (tamaño y tiempo frente a los Excel), las consultas de
+asistencia con la matriz jugador x partido y el arranque
+de 2026/app.py (tiempo hasta pintar la pantalla de acceso y hasta la
+página completa, con y sin precalentamiento).
+
+    python -m legendarios.benchmark --partidos 200 --workers 1,2,4
+"""
+import argparse
+import itertools
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from legendarios import arranque, asistencia, cache, historico, ingesta, motor, planificador, sintetico, snapshots, temporada_2025
+from legendarios.oraculo import tipar_con_texto
+
+def medir(fn, repeticiones: int = 1, preparar=None) -> float:
+    """Mejor tiempo (segundos) de `repeticiones` corridas (`preparar` corre antes de cada una, sin medirse)."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        if preparar:
+            preparar()
+        t0 = time.perf_counter()
+        fn()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+def _excel_en_frio():
+    # Que cada corrida vuelva a leer el Excel (no medir la caché de hojas)
+    cache.CACHE.vaciar("hojas")
+
+def bench_construccion(path: str, workers: list, repeticiones: int) -> list:
+    nodos = planificador.grafo_2026(path)
+    filas = []
+    base = None
+    for w in workers:
+        t = medir(lambda: planificador.ejecutar(nodos, workers=w), repeticiones, preparar=_excel_en_frio)
+        base = base or t
+        filas.append((f"construccion workers={w}", t, base / t))
+    return filas
+
+def bench_snapshots(path: str, repeticiones: int) -> list:
+    """
+    Abrir todos los partidos: recalculando desde base vs leyendo del almacén.
+    """
+    res = planificador.ejecutar(planificador.grafo_2026(path))
+    datos, base, store = res["2026/datos"], res["2026/base"], res["2026/snapshots"]
+    ids = list(store["partidos"])
+
+    def recalcular():
+        for pid in ids:
+            motor.snapshot_partido(datos, base, pid)
+
+    def leer_store():
+        for pid in ids:
+            for pos in motor.POS_LIST:
+                snapshots.tabla(store, pid, "dia", pos)
+                snapshots.tabla(store, pid, "hasta", pos)
+
+    t_rec = medir(recalcular, repeticiones)
+    t_store = medir(leer_store, repeticiones)
+    return [
+        (f"abrir {len(ids)} partidos (recalculo)", t_rec, 1.0),
+        (f"abrir {len(ids)} partidos (store)", t_store, t_rec / t_store),
+    ]
+
+def bench_ingesta(tmp: str, jugadores, partidos, eventos) -> list:
+    """
+    Agregar el último partido: reconstruir todo desde un Excel que ya lo trae
+    vs incorporar su archivo CSV sobre la temporada ya construida.
+    """
+    ultimo = int(partidos["id_partido"].max())
+    completo = os.path.join(tmp, "sintetico.xlsx")
+    previo = sintetico.escribir_excel(os.path.join(tmp, "previo.xlsx"), jugadores, partidos, eventos[eventos["id_partido"] != ultimo])
+    directorio = os.path.join(tmp, "eventos")
+    os.makedirs(directorio, exist_ok=True)
+
+    t_full = medir(lambda: planificador.ejecutar(planificador.grafo_2026(completo)), preparar=_excel_en_frio)
+
+    t = ingesta.Temporada(previo, directorio, grafo=planificador.grafo_2026)
+    eventos[eventos["id_partido"] == ultimo].to_csv(os.path.join(directorio, f"partido_{ultimo}.csv"), index=False)
+    t_inc = medir(t.sincronizar)
+    shutil.rmtree(directorio)
+    return [
+        ("agregar 1 partido (Excel completo)", t_full, 1.0),
+        ("agregar 1 partido (ingesta CSV)", t_inc, t_full / t_inc),
+    ]
+
+def bench_tipado(eventos, repeticiones: int, copias: int = 20) -> list:
+    """
+    Tipado de los contadores de Eventos en una tabla grande (`copias` veces la
+    sintética) con celdas de texto como las de una planilla cargada a mano.
+    """
+    columnas = motor.INT_COLS + ["partido_completado"]
+    grande = pd.concat([eventos] * copias, ignore_index=True)
+    rng = np.random.default_rng(0)
+    for c in columnas:
+        col = grande[c].astype(object)
+        sucias = rng.random(len(col)) < 0.05
+        col[sucias] = [f" {v} ".replace(".", ",") if i % 3 else "" for i, v in enumerate(col[sucias])]
+        grande[c] = col
+
+    t_texto = medir(lambda: tipar_con_texto(grande, columnas), repeticiones)
+    t_lote = medir(lambda: motor.tipar_numeros(grande, columnas), repeticiones)
+    _, informe = motor.tipar_numeros(grande, columnas)
+    return [
+        (f"tipar {len(grande)} filas (texto)", t_texto, 1.0),
+        (f"tipar ({informe['celdas_texto']} celdas de texto)", t_lote, t_texto / t_lote),
+    ]
+
+def bench_historico(tmp: str, path: str, repeticiones: int) -> list:
+    """
+    2025 y la temporada sintética (como si estuviera cerrada) en un solo
+    archivo histórico: tamaño frente a los dos Excel y tiempo de lectura en
+    frío de lo que usa la página 2025, de una temporada completa y de dos
+    columnas de Eventos (consulta entre temporadas).
+    """
+    archivo = os.path.join(tmp, "historico.zip")
+    historico.guardar(archivo, {temporada_2025.TEMPORADA: temporada_2025.DATA_FILE, 2026: path})
+    kb_2025, kb_2026 = os.path.getsize(temporada_2025.DATA_FILE) / 1024, os.path.getsize(path) / 1024
+    kb_archivo = os.path.getsize(archivo) / 1024
+
+    t_2025 = medir(lambda: temporada_2025.cargar_temporada(temporada_2025.DATA_FILE), repeticiones, preparar=_excel_en_frio)
+    t_2025_h = medir(lambda: temporada_2025.cargar_temporada(archivo), repeticiones, preparar=_excel_en_frio)
+
+    hojas = [motor.HOJA_J, motor.HOJA_P, motor.HOJA_E]
+    t_2026 = medir(lambda: [cache.leer_hoja(path, h) for h in hojas], repeticiones, preparar=_excel_en_frio)
+    t_2026_h = medir(lambda: [historico.leer_hoja(archivo, 2026, h) for h in hojas], repeticiones, preparar=_excel_en_frio)
+    t_cols = medir(lambda: historico.leer_hoja(archivo, 2026, motor.HOJA_E, ["id_jugador", "gol_total"]),
+                   repeticiones, preparar=_excel_en_frio)
+    return [
+        (f"leer 2025 (xlsx {kb_2025:.0f} KB)", t_2025, 1.0),
+        (f"leer 2025 (historico {kb_archivo:.0f} KB)", t_2025_h, t_2025 / t_2025_h),
+        (f"leer sintetica (xlsx {kb_2026:.0f} KB)", t_2026, 1.0),
+        ("leer sintetica (historico)", t_2026_h, t_2026 / t_2026_h),
+        ("2 columnas de Eventos (historico)", t_cols, t_2026 / t_cols),
+    ]
+
+def _asistencia_por_jugador(datos):
+    # Sin la matriz: un filtro de Eventos por jugador y los pares partido a partido
+    ev = datos["eventos"].merge(datos["partidos"][["id_partido", "fecha"]].dropna(), on="id_partido")
+    filas = []
+    for jid in datos["jugadores"]["id_jugador"].unique():
+        e = ev[ev["id_jugador"] == jid]
+        filas.append((jid, e["id_partido"].nunique(), e["partido_completado"].sum(), e["fecha"].max()))
+    pares = {}
+    for _, g in ev.groupby("id_partido"):
+        for (a, ea), (b, eb) in itertools.combinations(sorted(zip(g["id_jugador"], g["equipo"])), 2):
+            par = pares.setdefault((a, b), [0, 0])
+            par[0 if ea == eb else 1] += 1
+    return filas, pares
+
+def bench_asistencia(path: str, repeticiones: int) -> list:
+    """
+    Asistencia, inactividad y compañeros de todos los jugadores: recorriendo
+    jugador por jugador frente a la matriz dispersa (construirla incluida).
+    """
+    datos = motor.cargar_temporada(path)
+    def con_matriz():
+        m = asistencia.construir(datos)
+        return asistencia.asistencia(m), asistencia.inactividad(m), asistencia.companeros(m)
+
+    t_scan = medir(lambda: _asistencia_por_jugador(datos), repeticiones)
+    t_matriz = medir(con_matriz, repeticiones)
+    return [
+        ("asistencia + pares (por jugador)", t_scan, 1.0),
+        ("asistencia + pares (matriz dispersa)", t_matriz, t_scan / t_matriz),
+    ]
+
+def bench_arranque(app: str = "2026/app.py", clave: str = "enpausa") -> list:
+    """
+    Cada medición en un proceso nuevo (arranque en frío, como después de un deploy).
+    """
+    frio, _ = arranque.medir_app(app, clave, calentado=False)
+    calentado, _ = arranque.medir_app(app, clave, calentado=True)
+    return [
+        ("pintar pantalla de acceso", frio["acceso"], 1.0),
+        ("pagina tras la clave (sin esperar)", frio["pagina"], 1.0),
+        ("pagina tras la clave (precalentada)", calentado["pagina"], frio["pagina"] / calentado["pagina"]),
+    ]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de construcción de la temporada.")
+    parser.add_argument("--partidos", type=int, default=200)
+    parser.add_argument("--jugadores", type=int, default=80)
+    parser.add_argument("--workers", default=f"1,2,{os.cpu_count()}")
+    parser.add_argument("--repeticiones", type=int, default=1)
+    parser.add_argument("--sin-arranque", action="store_true", help="No medir el arranque de 2026/app.py.")
+    args = parser.parse_args(argv)
+
+    workers = sorted({int(w) for w in args.workers.split(",") if w.strip()})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sintetico.xlsx")
+        temporada = sintetico.generar_temporada(args.partidos, args.jugadores)
+        sintetico.escribir_excel(path, *temporada)
+        print(f"Temporada sintética: {args.partidos} partidos, {args.jugadores} jugadores")
+
+        filas = bench_construccion(path, workers, args.repeticiones)
+        filas += bench_snapshots(path, args.repeticiones)
+        filas += bench_ingesta(tmp, *temporada)
+        filas += bench_tipado(temporada[2], args.repeticiones)
+        filas += bench_historico(tmp, path, args.repeticiones)
+        filas += bench_asistencia(path, args.repeticiones)
+
+    if not args.sin_arranque:
+        filas += bench_arranque()
+
+    print(f"{'caso':<40}{'segundos':>10}{'speedup':>10}")
+    for caso, t, speedup in filas:
+        print(f"{caso:<40}{t:>10.3f}{speedup:>10.2f}")
+
+if __name__ == "__main__":
+    main()
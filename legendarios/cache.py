@@ -0,0 +1,222 @@
+"""
+Caché en memoria con presupuesto en bytes por espacio de nombres.
+
+Reemplaza a los `st.cache_data` sin límite: cada espacio tiene un
+presupuesto propio y, al pasarse, se desaloja lo usado hace más tiempo
+(LRU). Espacios:
+
+- hojas:     hojas del Excel ya leídas (por ruta + mtime + tamaño) o tablas
+             del almacén SQLite (por versión)
+- modelos:   la temporada viva de 2026 (ingesta.Temporada con todos sus
+             resultados, medida de nuevo con cada incorporación; fijada) y
+             las tablas de 2025 por versión de datos
+- snapshots: tablas "a esa fecha" expandidas desde el almacén compacto
+- graficos:  PNG ya dibujados y paquetes de exportación
+
+Con varias ligas (legendarios/ligas.py) modelos, snapshots y graficos van
+por liga: "<liga>/modelos", etc., cada uno con su presupuesto.
+
+Los presupuestos (MB) se cambian con la variable de entorno
+LEGENDARIOS_CACHE_MB, p. ej. "modelos=128,graficos=16" u "otra/modelos=64".
+Lo cacheado se comparte entre sesiones sin copiarse: quien lo recibe no debe
+modificarlo.
+
+Una entrada fijada (`fijar=True`) no se desaloja ni se rechaza por tamaño:
+sale solo cuando otra la reemplaza con la misma clave. Si se pasa del
+presupuesto, se desaloja todo lo demás del espacio y queda excedido
+(estadisticas() lo muestra en "fijado_mb").
+
+`al_salir` (en obtener / poner) se llama cuando la entrada se desaloja, se
+vacía o se rechaza por tamaño, no cuando otra la reemplaza: p. ej.
+arranque.olvidar, para que lo precalentado se vuelva a calentar.
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+PRESUPUESTOS_MB = {"hojas": 64, "modelos": 256, "snapshots": 32, "graficos": 32}
+
+MB = 1024 * 1024
+
+def presupuestos(texto: str | None = None) -> dict:
+    """
+    {espacio: bytes} con los valores por defecto y lo que diga LEGENDARIOS_CACHE_MB.
+    """
+    mb = dict(PRESUPUESTOS_MB)
+    texto = os.environ.get("LEGENDARIOS_CACHE_MB", "") if texto is None else texto
+    for parte in filter(None, (p.strip() for p in texto.split(","))):
+        espacio, _, valor = parte.partition("=")
+        mb[espacio.strip()] = float(valor)
+    return {espacio: int(v * MB) for espacio, v in mb.items()}
+
+# =========================
+# Tamaño de un objeto
+# =========================
+def tamano(obj, _vistos: set | None = None) -> int:
+    """
+    Bytes aproximados de `obj` (DataFrames con deep=True, arrays por nbytes,
+    contenedores recorridos). Un objeto repetido dentro de `obj` se cuenta una vez.
+    """
+    vistos = set() if _vistos is None else _vistos
+    if id(obj) in vistos:
+        return 0
+    vistos.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            return obj.nbytes + sum(sys.getsizeof(x) for x in obj.ravel())
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(tamano(k, vistos) + tamano(v, vistos) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(tamano(x, vistos) for x in obj)
+    if type(obj).__module__.startswith("legendarios.") and hasattr(obj, "__dict__"):
+        # Objetos propios (p. ej. ingesta.Temporada): lo que guardan sus atributos
+        return sys.getsizeof(obj) + tamano(vars(obj), vistos)
+    return sys.getsizeof(obj)
+
+# =========================
+# LRU por espacio
+# =========================
+class CacheLRU:
+    """
+    `obtener(espacio, clave, construir, *args)` devuelve lo cacheado o lo
+    construye (una sola vez aunque lo pidan varias sesiones a la vez).
+    Un valor más grande que el presupuesto de su espacio no se guarda, salvo
+    que se fije (ver el docstring del módulo).
+    """
+    CONTADORES = ("aciertos", "fallos", "desalojos", "rechazados")
+
+    def __init__(self, presupuestos: dict):
+        self.presupuestos = dict(presupuestos)
+        self._entradas = {e: OrderedDict() for e in self.presupuestos}  # clave -> (valor, bytes, fijada)
+        self._usado = dict.fromkeys(self.presupuestos, 0)
+        self._contadores = {e: dict.fromkeys(self.CONTADORES, 0) for e in self.presupuestos}
+        self._lock = threading.Lock()
+        self._construyendo = {}
+        self._al_salir = {}  # (espacio, clave) -> función sin argumentos
+
+    def agregar_espacio(self, espacio: str, presupuesto: int):
+        """
+        Registra `espacio` con `presupuesto` bytes si todavía no existe.
+        """
+        with self._lock:
+            if espacio not in self.presupuestos:
+                self.presupuestos[espacio] = int(presupuesto)
+                self._entradas[espacio] = OrderedDict()
+                self._usado[espacio] = 0
+                self._contadores[espacio] = dict.fromkeys(self.CONTADORES, 0)
+
+    def _buscar(self, espacio: str, clave):
+        entradas = self._entradas[espacio]
+        if clave in entradas:
+            entradas.move_to_end(clave)
+            self._contadores[espacio]["aciertos"] += 1
+            return True, entradas[clave][0]
+        return False, None
+
+    def obtener(self, espacio: str, clave, construir, *args, fijar: bool = False, al_salir=None, **kwargs):
+        with self._lock:
+            hay, valor = self._buscar(espacio, clave)
+            if hay:
+                return valor
+            candado = self._construyendo.setdefault((espacio, clave), threading.Lock())
+
+        with candado:
+            with self._lock:
+                hay, valor = self._buscar(espacio, clave)
+                if hay:
+                    return valor
+                self._contadores[espacio]["fallos"] += 1
+            try:
+                valor = construir(*args, **kwargs)
+                self.poner(espacio, clave, valor, fijar=fijar, al_salir=al_salir)
+            finally:
+                with self._lock:
+                    self._construyendo.pop((espacio, clave), None)
+        return valor
+
+    def poner(self, espacio: str, clave, valor, fijar: bool = False, al_salir=None):
+        n = tamano(valor)
+        with self._lock:
+            entradas, contadores = self._entradas[espacio], self._contadores[espacio]
+            if clave in entradas:
+                self._usado[espacio] -= entradas.pop(clave)[1]
+            self._al_salir.pop((espacio, clave), None)
+            if al_salir is not None:
+                self._al_salir[(espacio, clave)] = al_salir
+            salen = []
+            if n > self.presupuestos[espacio] and not fijar:
+                contadores["rechazados"] += 1
+                salen.append(clave)
+            else:
+                entradas[clave] = (valor, n, fijar)
+                self._usado[espacio] += n
+                # Se desaloja lo no fijado, de lo usado hace más tiempo a lo más reciente
+                sueltas = [c for c, (_, _, fija) in entradas.items() if not fija]
+                for c in sueltas:
+                    if self._usado[espacio] <= self.presupuestos[espacio]:
+                        break
+                    self._usado[espacio] -= entradas.pop(c)[1]
+                    contadores["desalojos"] += 1
+                    salen.append(c)
+            avisos = self._salidas(espacio, salen)
+        for aviso in avisos:
+            aviso()
+
+    def vaciar(self, espacio: str | None = None):
+        """
+        Quita todo lo no fijado de `espacio` (o de todos).
+        """
+        avisos = []
+        with self._lock:
+            for e in [espacio] if espacio else list(self._entradas):
+                entradas = self._entradas[e]
+                salen = [c for c, (_, _, fija) in entradas.items() if not fija]
+                for c in salen:
+                    self._usado[e] -= entradas.pop(c)[1]
+                avisos += self._salidas(e, salen)
+        for aviso in avisos:
+            aviso()
+
+    def _salidas(self, espacio: str, claves: list) -> list:
+        # `al_salir` de las entradas que dejan la caché (se llaman fuera del lock)
+        return [f for f in (self._al_salir.pop((espacio, c), None) for c in claves) if f is not None]
+
+    def estadisticas(self) -> pd.DataFrame:
+        with self._lock:
+            filas = [
+                {
+                    "espacio": e,
+                    "entradas": len(self._entradas[e]),
+                    "usado_mb": self._usado[e] / MB,
+                    "fijado_mb": sum(n for _, n, fija in self._entradas[e].values() if fija) / MB,
+                    "presupuesto_mb": self.presupuestos[e] / MB,
+                    **self._contadores[e],
+                }
+                for e in self.presupuestos
+            ]
+        t = pd.DataFrame(filas)
+        consultas = t["aciertos"] + t["fallos"]
+        t["tasa_aciertos"] = (t["aciertos"] / consultas.where(consultas > 0)).fillna(0.0)
+        return t
+
+# Caché del proceso (la comparten todas las sesiones de Streamlit y la API)
+CACHE = CacheLRU(presupuestos())
+
+def leer_hoja(path: str, hoja: str) -> pd.DataFrame:
+    """
+    pd.read_excel de una hoja, cacheado por versión del archivo (mtime + tamaño).
+    """
+    st = os.stat(path)
+    clave = (os.path.abspath(path), st.st_mtime_ns, st.st_size, hoja)
+    # Copia superficial: con copy-on-write, cambiarla no toca la cacheada
+    return CACHE.obtener("hojas", clave, pd.read_excel, path, sheet_name=hoja).copy(deep=False)
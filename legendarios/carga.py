@@ -0,0 +1,350 @@
+"""
+Prueba de carga de 2026/app.py: N sesiones simultáneas contra un servidor local.
+
+Levanta `streamlit run` (headless) con una liga sintética (legendarios/ligas.py)
+en un directorio temporal, así que no toca los datos ni la analítica reales.
+Cada sesión es una pestaña simulada: abre el websocket de Streamlit y manda
+las mismas recargas que mandaría el navegador, con los valores de sus
+widgets. El recorrido: abrir la página, ingresar el código, elegir partidos
+en el selector y mirar los movimientos entre dos fechas. Una parte de las
+sesiones entra como admin y además ajusta los pesos del índice y corre el
+simulador de reglas. Bajar por la página no vuelve a correr el script en
+Streamlit, así que no se simula.
+
+Reporta:
+- latencia por paso (p50/p90/p99/máx) y recargas por segundo,
+- memoria del servidor (RSS al inicio, después de cada ronda y pico),
+- contención de SQLite en el registro de visitas (legendarios/visitas.py):
+  escrituras, "database is locked" y tiempo de cada escritura.
+
+    python -m legendarios.carga --sesiones 20 --rondas 2 --partidos 60
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+
+import numpy as np
+
+LIGA = "carga"
+CLAVE_USUARIO = "carga"
+CLAVE_ADMIN = "carga-admin"
+
+# =========================
+# Servidor
+# =========================
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+@contextmanager
+def servidor(app: str, entorno: dict, espera: float = 60.0):
+    """
+    `streamlit run app` headless en un puerto libre; entrega (host:puerto, proceso)
+    cuando responde /_stcore/health y lo termina (SIGTERM) al salir.
+    """
+    puerto = _puerto_libre()
+    comando = [sys.executable, "-m", "streamlit", "run", app, "--server.headless", "true",
+               "--server.port", str(puerto), "--browser.gatherUsageStats", "false"]
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    # El log va a un archivo: un pipe sin leer se llena y el servidor se bloquea al escribir
+    with tempfile.TemporaryFile() as log:
+        proc = subprocess.Popen(comando, cwd=raiz, env=entorno, stdout=log, stderr=subprocess.STDOUT)
+        try:
+            limite = time.monotonic() + espera
+            while True:
+                try:
+                    urllib.request.urlopen(f"http://127.0.0.1:{puerto}/_stcore/health", timeout=1)
+                    break
+                except OSError:
+                    if proc.poll() is not None or time.monotonic() > limite:
+                        log.seek(0)
+                        raise RuntimeError(f"El servidor no arrancó:\n{log.read().decode()[-2000:]}")
+                    time.sleep(0.2)
+            yield f"127.0.0.1:{puerto}", proc
+        finally:
+            proc.terminate()
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+def rss_mb(pid: int) -> float | None:
+    """
+    Memoria residente (MB) de un proceso; None si no hay /proc.
+    """
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for linea in f:
+                if linea.startswith("VmRSS:"):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+# =========================
+# Sesión simulada
+# =========================
+class Pestana:
+    """
+    Una sesión de Streamlit por websocket. Como el navegador, en cada recarga
+    manda el valor de todos los widgets que ya tocó.
+    """
+    def __init__(self, ws, query: str, timeout: float):
+        self.ws, self.query, self.timeout = ws, query, timeout
+        self.valores = {}    # id del widget -> WidgetState
+        self.elementos = []  # elementos de la última recarga
+
+    def recargar(self) -> str | None:
+        """
+        Corre el script y espera a que termine; devuelve el texto de la
+        primera excepción que pintó la página (o None).
+        """
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = self.query
+        msg.rerun_script.widget_states.widgets.extend(self.valores.values())
+        self.ws.send(msg.SerializeToString())
+
+        elementos = []
+        while True:
+            f = ForwardMsg()
+            f.ParseFromString(self.ws.recv(timeout=self.timeout))
+            tipo = f.WhichOneof("type")
+            if tipo == "delta" and f.delta.WhichOneof("type") == "new_element":
+                elementos.append(f.delta.new_element)
+            elif tipo == "script_finished":
+                if f.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    elementos = []  # st.rerun(): sigue otra corrida
+                    continue
+                break
+        self.elementos = elementos
+        excepciones = [e.exception for e in elementos if e.WhichOneof("type") == "exception"]
+        return f"{excepciones[0].type}: {excepciones[0].message}" if excepciones else None
+
+    def widget(self, tipo: str, etiqueta: str | None = None, clave: str | None = None):
+        """
+        Primer widget de `tipo` con esa etiqueta o cuya key es `clave`.
+        """
+        for e in self.elementos:
+            if e.WhichOneof("type") != tipo:
+                continue
+            w = getattr(e, tipo)
+            if (etiqueta is None or w.label == etiqueta) and (clave is None or w.id.endswith(f"-{clave}")):
+                return w
+        raise LookupError(f"No encontré {tipo} {etiqueta or clave!r} en la página")
+
+    def poner(self, widget, valor):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        estado = WidgetState(id=widget.id)
+        if isinstance(valor, str):
+            estado.string_value = valor  # text_input y selectbox (etiqueta de la opción)
+        else:
+            estado.double_value = float(valor)  # number_input
+        self.valores[widget.id] = estado
+
+def sesion(url: str, admin: bool, partidos: int, pausa: float, rng: random.Random, timeout: float) -> list:
+    """
+    Un recorrido completo. Devuelve [(paso, segundos, error o None)]; la
+    sesión se corta en el primer paso que falla.
+    """
+    from websockets.sync.client import connect
+
+    pasos = []
+    with connect(f"ws://{url}/_stcore/stream", subprotocols=["streamlit"], max_size=None,
+                 open_timeout=timeout) as ws:
+        tab = Pestana(ws, f"liga={LIGA}", timeout)
+
+        def paso(nombre: str, interaccion=None) -> bool:
+            t0 = time.perf_counter()
+            try:
+                if interaccion:
+                    interaccion()
+                error = tab.recargar()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            pasos.append((nombre, time.perf_counter() - t0, error))
+            if pausa:
+                time.sleep(rng.uniform(0, 2 * pausa))
+            return error is None
+
+        def elegir(tipo: str, valor, **busqueda):
+            # Interacción: buscar el widget en la última recarga y darle valor(widget)
+            def interaccion():
+                w = tab.widget(tipo, **busqueda)
+                tab.poner(w, valor(w))
+            return interaccion
+
+        if not paso("abrir"):
+            return pasos
+        clave = CLAVE_ADMIN if admin else CLAVE_USUARIO
+        if not paso("clave", elegir("text_input", lambda w: clave, etiqueta="🔐 Ingresa tu código de acceso")):
+            return pasos
+        for _ in range(partidos):
+            if not paso("partido", elegir("selectbox", lambda w: rng.choice(w.options[1:]), etiqueta="Selecciona un partido")):
+                return pasos
+        if not paso("movimientos", elegir("selectbox", lambda w: rng.choice(w.options), clave="mov_desde")):
+            return pasos
+        if admin:
+            if not paso("pesos", elegir("number_input", lambda w: round(rng.uniform(0.0, 1.0), 2), clave="peso_asistencia")):
+                return pasos
+            paso("simulador", elegir("text_input", lambda w: f"{w.default}, {rng.randint(1, 5)}", clave="regla_victoria"))
+    return pasos
+
+# =========================
+# Prueba
+# =========================
+def correr(url: str, pid: int, sesiones: int, rondas: int, admins: float, partidos: int, pausa: float,
+           rampa: float, semilla: int, timeout: float) -> dict:
+    """
+    `rondas` veces: `sesiones` sesiones a la vez (arrancan repartidas en
+    `rampa` segundos). Devuelve los pasos medidos y la memoria del servidor.
+    """
+    memoria = {"inicio": rss_mb(pid), "rondas": [], "pico": rss_mb(pid)}
+    pasos = []
+    lock = threading.Lock()
+    fin = threading.Event()
+
+    def muestrear():
+        while not fin.wait(0.2):
+            actual = rss_mb(pid)
+            if actual is not None:
+                memoria["pico"] = max(memoria["pico"], actual)
+
+    def una(i: int, ronda: int):
+        rng = random.Random(semilla * 1_000_003 + ronda * 10_007 + i)
+        time.sleep(rampa * i / max(sesiones - 1, 1))
+        try:
+            hechos = sesion(url, rng.random() < admins, partidos, pausa, rng, timeout)
+        except Exception as e:
+            hechos = [("conectar", 0.0, f"{type(e).__name__}: {e}")]
+        with lock:
+            pasos.extend((ronda, i) + p for p in hechos)
+
+    if memoria["inicio"] is not None:
+        threading.Thread(target=muestrear, daemon=True).start()
+    t0 = time.perf_counter()
+    for ronda in range(rondas):
+        hilos = [threading.Thread(target=una, args=(i, ronda)) for i in range(sesiones)]
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+        memoria["rondas"].append(rss_mb(pid))
+    duracion = time.perf_counter() - t0
+    fin.set()
+    return {"pasos": pasos, "duracion": duracion, "memoria": memoria}
+
+def resumen(res: dict) -> dict:
+    """
+    Latencia por paso (p50/p90/p99/máx), errores y recargas por segundo.
+    """
+    por_paso = {}
+    for _, _, nombre, t, error in res["pasos"]:
+        d = por_paso.setdefault(nombre, {"t": [], "errores": 0})
+        d["t"].append(t)
+        d["errores"] += error is not None
+
+    filas = []
+    for nombre, d in por_paso.items():
+        t = np.array(d["t"])
+        filas.append({
+            "paso": nombre, "n": len(t), "errores": d["errores"],
+            "p50": float(np.percentile(t, 50)), "p90": float(np.percentile(t, 90)),
+            "p99": float(np.percentile(t, 99)), "max": float(t.max()),
+        })
+    ok = sum(1 for *_, error in res["pasos"] if error is None)
+    errores = sorted({error for *_, error in res["pasos"] if error is not None})
+    return {"pasos": filas, "recargas_ok": ok, "recargas_por_segundo": ok / res["duracion"], "errores": errores}
+
+# =========================
+# Datos sintéticos
+# =========================
+def preparar(tmp: str, partidos: int, jugadores: int) -> str:
+    """
+    Liga sintética en `tmp` (Excel, eventos y analítica propios); devuelve
+    la ruta del JSON de ligas para LEGENDARIOS_LIGAS.
+    """
+    from legendarios import sintetico
+
+    datos = os.path.join(tmp, "sintetico.xlsx")
+    sintetico.escribir_excel(datos, *sintetico.generar_temporada(partidos, jugadores))
+    conf = os.path.join(tmp, "ligas.json")
+    with open(conf, "w", encoding="utf-8") as f:
+        json.dump({LIGA: {"nombre": "Prueba de carga", "datos": datos,
+                          "clave_usuario": CLAVE_USUARIO, "clave_admin": CLAVE_ADMIN}}, f)
+    return conf
+
+# =========================
+# CLI
+# =========================
+def _mb(x) -> str:
+    return "?" if x is None else f"{x:.0f}"
+
+def imprimir(res: dict, args):
+    r = resumen(res)
+    print(f"{args.sesiones} sesiones x {args.rondas} ronda(s), {args.admins:.0%} admin, "
+          f"{res['duracion']:.1f}s: {r['recargas_ok']} recargas ({r['recargas_por_segundo']:.2f}/s)")
+    print(f"{'paso':<14}{'n':>6}{'errores':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'máx':>9}")
+    for f in r["pasos"]:
+        print(f"{f['paso']:<14}{f['n']:>6}{f['errores']:>9}{f['p50']:>9.3f}{f['p90']:>9.3f}{f['p99']:>9.3f}{f['max']:>9.3f}")
+
+    m = res["memoria"]
+    print(f"Memoria del servidor (MB): inicio {_mb(m['inicio'])}, después de cada ronda "
+          f"{' -> '.join(_mb(x) for x in m['rondas'])}, pico {_mb(m['pico'])}")
+
+    v = res.get("visitas")
+    if v:
+        print(f"Visitas (SQLite): {v['escrituras']} escrituras, {v['bloqueos']} 'database is locked'; escritura "
+              + ", ".join(f"{q} {v[f'escritura_{q}'] * 1000:.1f} ms" for q in ("p50", "p95", "p99", "max")))
+    for e in r["errores"][:5]:
+        print(f"  error: {e}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga de la página 2026 con sesiones simultáneas.")
+    parser.add_argument("--app", default="2026/app.py")
+    parser.add_argument("--sesiones", type=int, default=10)
+    parser.add_argument("--rondas", type=int, default=1, help="Repetir la ola de sesiones (para ver si la memoria crece).")
+    parser.add_argument("--admins", type=float, default=0.1, help="Fracción de sesiones que entran como admin.")
+    parser.add_argument("--partidos-por-sesion", type=int, default=2, help="Partidos que elige cada sesión en el selector.")
+    parser.add_argument("--pausa", type=float, default=0.5, help="Pausa media (s) entre pasos de una sesión.")
+    parser.add_argument("--rampa", type=float, default=0.0, help="Segundos en que arrancan todas las sesiones (0: a la vez).")
+    parser.add_argument("--partidos", type=int, default=40, help="Partidos de la temporada sintética.")
+    parser.add_argument("--jugadores", type=int, default=60)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=300.0, help="Segundos máximos por recarga.")
+    parser.add_argument("--json", action="store_true", help="Imprimir el resultado crudo en JSON.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        informe = os.path.join(tmp, "visitas.json")
+        entorno = {**os.environ, "LEGENDARIOS_LIGAS": preparar(tmp, args.partidos, args.jugadores),
+                   "LEGENDARIOS_VISITAS_INFORME": informe}
+        with servidor(args.app, entorno) as (url, proc):
+            res = correr(url, proc.pid, args.sesiones, args.rondas, args.admins, args.partidos_por_sesion,
+                         args.pausa, args.rampa, args.semilla, args.timeout)
+        # El servidor deja sus contadores de visitas al terminar
+        if os.path.exists(informe):
+            with open(informe, encoding="utf-8") as f:
+                res["visitas"] = json.load(f)
+
+    if args.json:
+        print(json.dumps({**res, "resumen": resumen(res)}))
+    else:
+        print(f"Temporada sintética: {args.partidos} partidos, {args.jugadores} jugadores")
+        imprimir(res, args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Capa de consultas SQL sobre la temporada (SQLite en memoria).
+
+Carga Jugadores / Partidos / Eventos normalizados y la base puntuada
+(una fila por jugador y partido) en una base SQLite con índices por
+id_jugador, id_partido y fecha. Las preguntas puntuales (cara a cara,
+goles por cancha, rachas...) se resuelven como consultas parametrizadas
+en vez de nuevos bloques de groupby en la app.
+
+La conexión queda en solo lectura: un autorizador deja pasar únicamente
+SELECT (con CTE y funciones) y cada consulta tiene un tiempo máximo.
+
+    python -m legendarios.consultas --consulta goles_por_cancha
+    python -m legendarios.consultas --sql "SELECT COUNT(*) FROM puntos"
+"""
+import argparse
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from legendarios import motor, planificador
+
+# Columnas de la base puntuada que se publican en la tabla "puntos"
+COLS_PUNTOS = [
+    "id_partido", "id_jugador", "fecha", "cancha", "equipo", "posicion_base", "posicion_jugada",
+    "partido_completado", "gol_total", "asistencia_gol", "autogoles", "amarillas", "rojas", "penal_atajado",
+    "goles_recibidos_equipo", "valla_invicta_equipo", "puntos_resultado", "puntos_posicion",
+    "penal_partido", "puntos_partido",
+]
+INDICES = ["id_jugador", "id_partido", "fecha"]
+
+# Segundos máximos por consulta
+TIEMPO_MAXIMO = 3.0
+
+# Una sola conexión compartida entre sesiones: el acceso se serializa
+_LOCK = threading.Lock()
+
+# Acciones permitidas por el autorizador (todo lo demás se rechaza)
+_PERMITIDAS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION, sqlite3.SQLITE_RECURSIVE}
+
+# =========================
+# Consultas predefinidas
+# =========================
+# params: {nombre: valor por defecto}; "jugador" indica un id_jugador a elegir
+CONSULTAS = {
+    "cara_a_cara": {
+        "titulo": "Cara a cara entre dos jugadores",
+        "params": {"a": "jugador", "b": "jugador"},
+        "sql": """
+            SELECT p.id_partido, p.fecha, p.cancha,
+                   CASE WHEN a.equipo = b.equipo THEN 'juntos' ELSE 'rivales' END AS relacion,
+                   a.equipo AS equipo_a, b.equipo AS equipo_b,
+                   a.puntos_resultado AS resultado_a, b.puntos_resultado AS resultado_b,
+                   a.gol_total AS goles_a, b.gol_total AS goles_b,
+                   a.puntos_partido AS puntos_a, b.puntos_partido AS puntos_b
+            FROM puntos a
+            JOIN puntos b ON b.id_partido = a.id_partido AND b.id_jugador = :b
+            JOIN partidos p ON p.id_partido = a.id_partido
+            WHERE a.id_jugador = :a
+            ORDER BY p.fecha DESC, p.id_partido DESC
+        """,
+    },
+    "goles_por_cancha": {
+        "titulo": "Goles por cancha",
+        "params": {},
+        "sql": """
+            SELECT p.cancha,
+                   COUNT(DISTINCT p.id_partido) AS partidos,
+                   SUM(e.gol_total) AS goles,
+                   ROUND(1.0 * SUM(e.gol_total) / COUNT(DISTINCT p.id_partido), 2) AS goles_por_partido
+            FROM puntos e
+            JOIN partidos p ON p.id_partido = e.id_partido
+            GROUP BY p.cancha
+            ORDER BY goles DESC
+        """,
+    },
+    "rachas_gol": {
+        "titulo": "Rachas de partidos seguidos con gol",
+        "params": {"minimo": 2},
+        "sql": """
+            WITH s AS (
+                SELECT id_jugador, fecha, gol_total > 0 AS ok,
+                       ROW_NUMBER() OVER (PARTITION BY id_jugador ORDER BY fecha, id_partido)
+                     - ROW_NUMBER() OVER (PARTITION BY id_jugador, gol_total > 0 ORDER BY fecha, id_partido) AS grupo
+                FROM puntos
+            )
+            SELECT s.id_jugador, j.nombre, COUNT(*) AS partidos_seguidos, MIN(s.fecha) AS desde, MAX(s.fecha) AS hasta
+            FROM s JOIN jugadores j ON j.id_jugador = s.id_jugador
+            WHERE s.ok
+            GROUP BY s.id_jugador, s.grupo
+            HAVING COUNT(*) >= :minimo
+            ORDER BY partidos_seguidos DESC, hasta DESC
+        """,
+    },
+    "rachas_invicto": {
+        "titulo": "Rachas de partidos seguidos sin perder",
+        "params": {"minimo": 2},
+        "sql": """
+            WITH s AS (
+                SELECT id_jugador, fecha, puntos_resultado > 0 AS ok,
+                       ROW_NUMBER() OVER (PARTITION BY id_jugador ORDER BY fecha, id_partido)
+                     - ROW_NUMBER() OVER (PARTITION BY id_jugador, puntos_resultado > 0 ORDER BY fecha, id_partido) AS grupo
+                FROM puntos
+            )
+            SELECT s.id_jugador, j.nombre, COUNT(*) AS partidos_seguidos, MIN(s.fecha) AS desde, MAX(s.fecha) AS hasta
+            FROM s JOIN jugadores j ON j.id_jugador = s.id_jugador
+            WHERE s.ok
+            GROUP BY s.id_jugador, s.grupo
+            HAVING COUNT(*) >= :minimo
+            ORDER BY partidos_seguidos DESC, hasta DESC
+        """,
+    },
+    "partidos_jugador": {
+        "titulo": "Partidos de un jugador",
+        "params": {"id_jugador": "jugador"},
+        "sql": """
+            SELECT e.fecha, e.id_partido, e.cancha, e.equipo, e.posicion_jugada, e.partido_completado,
+                   e.gol_total, e.asistencia_gol, e.amarillas, e.rojas, e.puntos_partido
+            FROM puntos e
+            WHERE e.id_jugador = :id_jugador
+            ORDER BY e.fecha DESC, e.id_partido DESC
+        """,
+    },
+}
+
+# =========================
+# Construcción
+# =========================
+def _tabla_sql(df: pd.DataFrame) -> pd.DataFrame:
+    # Fechas como texto ISO (AAAA-MM-DD): se comparan y ordenan bien en SQLite
+    df = df.copy()
+    if "fecha" in df.columns:
+        df["fecha"] = pd.to_datetime(df["fecha"], errors="coerce").dt.strftime("%Y-%m-%d")
+    return df
+
+def _autorizador(accion, *_):
+    return sqlite3.SQLITE_OK if accion in _PERMITIDAS else sqlite3.SQLITE_DENY
+
+def construir_db(datos: dict, base: pd.DataFrame) -> sqlite3.Connection:
+    """
+    Base SQLite en memoria con las tablas jugadores, partidos, eventos y puntos.
+    """
+    con = sqlite3.connect(":memory:", check_same_thread=False)
+    tablas = {
+        "jugadores": datos["jugadores"],
+        "partidos": datos["partidos"],
+        "eventos": datos["eventos"],
+        "puntos": base[[c for c in COLS_PUNTOS if c in base.columns]],
+    }
+    for nombre, df in tablas.items():
+        _tabla_sql(df).to_sql(nombre, con, index=False)
+        for col in INDICES:
+            if col in df.columns:
+                con.execute(f"CREATE INDEX idx_{nombre}_{col} ON {nombre} ({col})")
+    con.commit()
+
+    con.set_authorizer(_autorizador)
+    return con
+
+# =========================
+# Consulta
+# =========================
+def consultar(con: sqlite3.Connection, sql: str, params: dict | None = None) -> pd.DataFrame:
+    """
+    Ejecuta una sola sentencia SELECT con parámetros nombrados (:nombre).
+    Lanza sqlite3.Error si la consulta no es de lectura o supera TIEMPO_MAXIMO.
+    """
+    limite = time.perf_counter() + TIEMPO_MAXIMO
+    with _LOCK:
+        con.set_progress_handler(lambda: time.perf_counter() > limite, 10_000)
+        try:
+            cur = con.execute(sql, params or {})
+            columnas = [d[0] for d in cur.description or []]
+            return pd.DataFrame(cur.fetchall(), columns=columnas)
+        finally:
+            con.set_progress_handler(None, 0)
+
+def consulta(con: sqlite3.Connection, nombre: str, **params) -> pd.DataFrame:
+    """
+    Ejecuta una de las CONSULTAS predefinidas; los parámetros que falten toman su valor por defecto.
+    """
+    definicion = CONSULTAS[nombre]
+    valores = {k: v for k, v in definicion["params"].items() if v != "jugador"}
+    valores.update(params)
+    faltan = sorted(set(definicion["params"]) - set(valores))
+    if faltan:
+        raise ValueError(f"La consulta '{nombre}' necesita: {faltan}")
+    return consultar(con, definicion["sql"], valores)
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consultas SQL sobre la temporada 2026.")
+    parser.add_argument("--excel", default=motor.DATA_FILE)
+    parser.add_argument("--consulta", choices=sorted(CONSULTAS))
+    parser.add_argument("--sql")
+    parser.add_argument("--param", action="append", default=[], help="nombre=valor (se puede repetir)")
+    args = parser.parse_args(argv)
+
+    res = planificador.ejecutar(planificador.subgrafo(planificador.grafo_2026(args.excel), ["2026/base"]))
+    con = construir_db(res["2026/datos"], res["2026/base"])
+    params = {}
+    for p in args.param:
+        k, v = p.split("=", 1)
+        params[k] = int(v) if v.lstrip("-").isdigit() else v
+
+    if args.consulta:
+        df = consulta(con, args.consulta, **params)
+    else:
+        df = consultar(con, args.sql or "SELECT name FROM sqlite_master WHERE type = 'table'", params)
+    print(df.to_string(index=False))
+
+if __name__ == "__main__":
+    main()
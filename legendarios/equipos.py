@@ -0,0 +1,135 @@
+"""
+Sugerencia de equipos balanceados (amarillo vs azul) para el próximo partido.
+
+Cada asistente recibe una fuerza estimada a partir de la temporada y se
+reparten en dos equipos con estas restricciones duras:
+- por cada posición base, la diferencia de cantidad entre equipos es a lo
+  sumo 1 (con 2 arqueros queda uno por lado; lo mismo para defensas,
+  mediocampistas y delanteros);
+- los equipos tienen el mismo tamaño (±1).
+
+Dentro de eso se minimiza la diferencia de fuerza con búsqueda local:
+se parte de un reparto goloso y se aplica el mejor intercambio de dos
+jugadores de la misma posición (evaluados todos a la vez con numpy)
+hasta que ninguno mejora. Se prueban todas las formas válidas de ubicar
+a los "sobrantes" de posiciones impares y algunos arranques aleatorios.
+"""
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from legendarios import motor
+
+# Partidos "ficticios" con el promedio de la liga que se suman a cada jugador
+# (evita que alguien con un solo partido bueno parezca el mejor)
+PARTIDOS_PRIOR = 2.0
+
+# Peso del Índice de Regularidad dentro de la fuerza (el resto: puntos por partido)
+PESO_REGULARIDAD = 0.25
+
+REINICIOS = 8
+
+# =========================
+# Fuerza por jugador
+# =========================
+def fuerzas(ids: list, jugadores: pd.DataFrame, agg: pd.DataFrame, regularidad: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Fuerza de cada id_jugador en `ids` (escala: puntos por partido):
+    (1 - PESO_REGULARIDAD) * puntos por partido equivalente (encogidos al promedio)
+    + PESO_REGULARIDAD * 2 * índice de regularidad * promedio de la liga.
+    Quien no tiene partidos en la temporada recibe el promedio.
+    """
+    sel = jugadores[jugadores["id_jugador"].isin(ids)][["id_jugador", "nombre", "posicion"]].drop_duplicates("id_jugador")
+    sel = sel.merge(agg[["id_jugador", "puntos_total", "partidos_equivalentes"]], on="id_jugador", how="left")
+
+    pe_total = float(agg["partidos_equivalentes"].sum())
+    media = float(agg["puntos_total"].sum()) / pe_total if pe_total > 0 else 0.0
+
+    pts = sel["puntos_total"].fillna(0.0).astype(float)
+    pe = sel["partidos_equivalentes"].fillna(0.0).astype(float)
+    por_partido = (pts + PARTIDOS_PRIOR * media) / (pe + PARTIDOS_PRIOR)
+
+    if regularidad is not None and len(regularidad):
+        indice = sel["id_jugador"].map(regularidad.set_index("id_jugador")["indice_regularidad"]).fillna(0.5)
+    else:
+        indice = pd.Series(0.5, index=sel.index)
+
+    sel["fuerza"] = (1 - PESO_REGULARIDAD) * por_partido + PESO_REGULARIDAD * 2 * indice.astype(float) * media
+    sel["posicion"] = sel["posicion"].astype(str).str.strip().str.lower()
+    return sel.drop(columns=["puntos_total", "partidos_equivalentes"]).reset_index(drop=True)
+
+# =========================
+# Búsqueda
+# =========================
+def _reparto_inicial(f, grupos, extra_amarillo, rng, aleatorio) -> np.ndarray:
+    """
+    Reparto goloso respetando cupos por posición: cada jugador va al
+    equipo más débil que aún tenga cupo en su posición. 0 = amarillo, 1 = azul.
+    """
+    lado = np.zeros(len(f), dtype=np.int8)
+    suma = [0.0, 0.0]
+    for g, extra in zip(grupos, extra_amarillo):
+        cupo = [len(g) // 2 + extra, len(g) - len(g) // 2 - extra]
+        orden = rng.permutation(g) if aleatorio else g[np.argsort(-f[g], kind="stable")]
+        for i in orden:
+            s = 0 if (cupo[0] and (suma[0] <= suma[1] or not cupo[1])) else 1
+            lado[i] = s
+            suma[s] += f[i]
+            cupo[s] -= 1
+    return lado
+
+def _mejorar(f, cod, lado) -> tuple:
+    """
+    Mejor intercambio entre equipos (misma posición) hasta que ninguno reduzca la diferencia.
+    """
+    while True:
+        a, b = np.flatnonzero(lado == 0), np.flatnonzero(lado == 1)
+        d = f[a].sum() - f[b].sum()
+        if len(a) == 0 or len(b) == 0:
+            return lado, abs(d)
+
+        # Intercambiar a[i] con b[j] cambia la diferencia en -2 * (f[a[i]] - f[b[j]])
+        nueva = np.abs(d - 2 * (f[a][:, None] - f[b][None, :]))
+        nueva[cod[a][:, None] != cod[b][None, :]] = np.inf
+        i, j = np.unravel_index(np.argmin(nueva), nueva.shape)
+        if nueva[i, j] >= abs(d) - 1e-9:
+            return lado, abs(d)
+        lado[a[i]], lado[b[j]] = 1, 0
+
+def armar_equipos(fz: pd.DataFrame, reinicios: int = REINICIOS, seed: int = 0) -> dict:
+    """
+    Reparte los jugadores de `fz` (salida de fuerzas) en dos equipos.
+    Devuelve {"amarillo", "azul" (DataFrames), "fuerza_amarillo", "fuerza_azul", "diferencia"}.
+    """
+    if len(fz) < 2:
+        raise ValueError("Se necesitan al menos 2 jugadores para armar equipos.")
+
+    f = fz["fuerza"].to_numpy(dtype=float)
+    cod, _ = pd.factorize(fz["posicion"])
+    grupos = [np.flatnonzero(cod == c) for c in range(cod.max() + 1)]
+    impares = [k for k, g in enumerate(grupos) if len(g) % 2]
+    rng = np.random.default_rng(seed)
+
+    mejor_lado, mejor_dif = None, np.inf
+    # Cada posición impar deja un sobrante: se prueban todas las ubicaciones con tamaños ±1
+    for bits in itertools.product((0, 1), repeat=len(impares)):
+        if abs(2 * sum(bits) - len(bits)) > 1:
+            continue
+        extra = [0] * len(grupos)
+        for k, bit in zip(impares, bits):
+            extra[k] = bit
+        for r in range(reinicios):
+            lado, dif = _mejorar(f, cod, _reparto_inicial(f, grupos, extra, rng, aleatorio=r > 0))
+            if dif < mejor_dif - 1e-9:
+                mejor_lado, mejor_dif = lado.copy(), dif
+
+    orden_pos = {p: i for i, p in enumerate(motor.POS_LIST)}
+    res = {}
+    for s, equipo in enumerate(["amarillo", "azul"]):
+        t = fz[mejor_lado == s].copy()
+        t["_o"] = t["posicion"].map(orden_pos).fillna(len(orden_pos))
+        res[equipo] = t.sort_values(["_o", "fuerza"], ascending=[True, False]).drop(columns=["_o"]).reset_index(drop=True)
+        res[f"fuerza_{equipo}"] = float(t["fuerza"].sum())
+    res["diferencia"] = abs(res["fuerza_amarillo"] - res["fuerza_azul"])
+    return res
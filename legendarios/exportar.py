@@ -0,0 +1,230 @@
+"""
+Exportación del paquete post-partido (imágenes PNG y un PDF) para compartir.
+
+Genera en una sola pasada:
+- resumen del último partido (marcador + goles y asistencias del día),
+- ranking de la última fecha por posición,
+- ranking acumulado del año por posición.
+
+Todas las páginas se dibujan sobre la misma figura de matplotlib (sin
+pyplot): la figura se toma de un pool, se limpia entre página y página y
+se devuelve al pool al terminar, así que exportar no crea una figura por
+tabla y se puede llamar desde varias sesiones a la vez.
+
+    python -m legendarios.exportar --salida export/ --formatos png,pdf
+"""
+import argparse
+import io
+import os
+import queue
+import time
+import zipfile
+from contextlib import contextmanager
+
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from legendarios import motor, planificador
+
+# Columnas de cada tabla (las mismas que muestra 2026/app.py)
+COLS_DIA = ["posicion_ranking","nombre","puntos","partido_completado","goles","asistencia_gol","amarillas","rojas"]
+COLS_ANUAL = ["posicion_ranking","nombre","puntos_total","partidos_jugados","partidos_equivalentes","goles","asistencia_gol","amarillas","rojas"]
+COLS_ANUAL_ARQ = [
+    "posicion_ranking","nombre","puntos_arquero_ajustados","puntos_total","valla_2d",
+    "partidos_jugados","partidos_equivalentes","goles","asistencia_gol","amarillas","rojas",
+]
+
+# Encabezados cortos para que las tablas quepan en el ancho de un celular
+ETIQUETAS = {
+    "posicion_ranking": "#", "nombre": "Jugador", "equipo": "Equipo", "puntos": "Puntos", "puntos_total": "Puntos",
+    "puntos_arquero_ajustados": "Pts ajust.", "valla_2d": "Valla", "partido_completado": "Part. compl.",
+    "partidos_jugados": "PJ", "partidos_equivalentes": "PE", "goles": "Goles", "asistencia_gol": "Asist.",
+    "amarillas": "Amar.", "rojas": "Rojas",
+}
+ANCHO_RELATIVO = {"nombre": 3.5, "posicion_ranking": 0.5}
+
+ANCHO = 10.0       # pulgadas
+ALTO_FILA = 0.3    # pulgadas por fila de tabla
+DPI = 150
+
+COLOR_ENCABEZADO = "#e5e7eb"
+COLOR_CEBRA = "#f9fafb"
+
+# =========================
+# Pool de figuras
+# =========================
+_POOL = queue.SimpleQueue()
+
+@contextmanager
+def lienzo():
+    """
+    Figura reutilizable (con su canvas Agg). Se devuelve limpia al pool.
+    """
+    try:
+        fig = _POOL.get_nowait()
+    except queue.Empty:
+        fig = Figure()
+        FigureCanvasAgg(fig)
+    try:
+        yield fig
+    finally:
+        fig.clear()
+        _POOL.put(fig)
+
+# =========================
+# Páginas
+# =========================
+def _texto(v) -> str:
+    # Mismo criterio que df_highlight: enteros sin decimales, floats a 2
+    if isinstance(v, float):
+        return "—" if pd.isna(v) else (f"{v:.0f}" if v.is_integer() else f"{v:.2f}")
+    return "—" if v is None or (not isinstance(v, str) and pd.isna(v)) else str(v)
+
+def dibujar(fig: Figure, titulo: str, df: pd.DataFrame, subtitulo: str = "", resaltar: str | None = None):
+    """
+    Dibuja una página (título + tabla) sobre `fig`, ajustando el alto a las filas.
+    """
+    fig.clear()
+    alto = 1.1 + ALTO_FILA * (max(len(df), 1) + 1)
+    fig.set_size_inches(ANCHO, alto)
+    fig.text(0.02, 1 - 0.35 / alto, titulo, fontsize=14, fontweight="bold", va="center")
+    if subtitulo:
+        fig.text(0.02, 1 - 0.7 / alto, subtitulo, fontsize=10, color="#4b5563", va="center")
+
+    ax = fig.add_axes([0.02, 0.2 / alto, 0.96, 1 - 1.2 / alto])
+    ax.axis("off")
+    if df.empty:
+        ax.text(0.5, 0.5, "Sin datos", ha="center", va="center", color="#6b7280")
+        return
+
+    celdas = [[_texto(v) for v in fila] for fila in df.itertuples(index=False)]
+    etiquetas = [ETIQUETAS.get(c, c) for c in df.columns]
+    tabla = ax.table(cellText=celdas, colLabels=etiquetas, bbox=[0, 0, 1, 1], cellLoc="center")
+    tabla.auto_set_font_size(False)
+    tabla.set_fontsize(9)
+
+    pesos = [ANCHO_RELATIVO.get(c, 1.0) for c in df.columns]
+    anchos = [p / sum(pesos) for p in pesos]
+    col_nombre = list(df.columns).index("nombre") if "nombre" in df.columns else None
+    col_resaltar = list(df.columns).index(resaltar) if resaltar in df.columns else None
+    for (r, c), celda in tabla.get_celld().items():
+        celda.set_width(anchos[c])
+        if c == col_nombre and r > 0:
+            celda.set_text_props(ha="left")
+            celda.PAD = 0.02
+        if r == 0:
+            celda.set_facecolor(COLOR_ENCABEZADO)
+            celda.set_text_props(fontweight="bold")
+        elif r % 2 == 0:
+            celda.set_facecolor(COLOR_CEBRA)
+        if r > 0 and c == col_resaltar:
+            celda.set_text_props(fontweight="bold")
+
+def resumen_partido(datos: dict, base: pd.DataFrame) -> tuple:
+    """
+    (título, subtítulo, tabla de goles y asistencias) del último partido.
+    """
+    partidos = datos["partidos"]
+    ultima = motor.ultima_fecha(partidos)
+    if pd.isna(ultima):
+        return "Último partido", "Sin fechas válidas", pd.DataFrame()
+
+    p = partidos.loc[partidos["fecha"] == ultima].sort_values("id_partido", ascending=False).iloc[0]
+    pid = int(p["id_partido"])
+    ma = int(p["marcador_amarillo"]) if pd.notna(p["marcador_amarillo"]) else 0
+    mz = int(p["marcador_azul"]) if pd.notna(p["marcador_azul"]) else 0
+    cancha = str(p.get("cancha", "—"))
+
+    dia = base[base["id_partido"] == pid]
+    aporte = dia[(dia["gol_total"] > 0) | (dia["asistencia_gol"] > 0)]
+    tabla = aporte[["nombre", "equipo", "gol_total", "asistencia_gol"]].rename(columns={"gol_total": "goles"})
+    tabla = tabla.sort_values(["goles", "asistencia_gol"], ascending=False).reset_index(drop=True)
+
+    titulo = f"Partido {pid} – {ultima.date()} – {cancha}"
+    subtitulo = f"AMARILLO {ma}  -  {mz} AZUL"
+    return titulo, subtitulo, tabla
+
+def paginas(resultados: dict) -> list:
+    """
+    [(nombre_archivo, título, subtítulo, tabla, columna_resaltada)] en el orden del paquete.
+    `resultados` son los del planificador (o el modelo de la app) con las claves 2026/*.
+    """
+    datos, base = resultados["2026/datos"], resultados["2026/base"]
+    ultima = motor.ultima_fecha(datos["partidos"])
+    fecha = ultima.date() if pd.notna(ultima) else "—"
+
+    titulo, subtitulo, tabla = resumen_partido(datos, base)
+    pags = [("00_resumen_partido", titulo, subtitulo, tabla, "goles")]
+
+    for i, pos in enumerate(motor.POS_LIST, start=1):
+        r = resultados[f"2026/dia/{pos}"]
+        pags.append((f"1{i}_dia_{pos}", f"Última fecha – {pos.capitalize()}", str(fecha),
+                     r[COLS_DIA] if not r.empty else r, "puntos"))
+
+    for i, pos in enumerate(motor.POS_LIST, start=1):
+        r = resultados[f"2026/anual/{pos}"]
+        cols, resaltar = (COLS_ANUAL_ARQ, "puntos_arquero_ajustados") if pos == "arquero" else (COLS_ANUAL, "puntos_total")
+        pags.append((f"2{i}_anual_{pos}", f"Ranking del año – {pos.capitalize()}", f"Acumulado hasta {fecha}",
+                     r[cols] if not r.empty else r, resaltar))
+    return pags
+
+# =========================
+# Paquete
+# =========================
+def paquete(resultados: dict, formatos=("png", "pdf")) -> dict:
+    """
+    {nombre_archivo: bytes}: un PNG por página y/o un solo PDF con todas.
+    """
+    archivos = {}
+    pdf_buf = io.BytesIO() if "pdf" in formatos else None
+    with lienzo() as fig:
+        pdf = PdfPages(pdf_buf) if pdf_buf is not None else None
+        try:
+            for nombre, titulo, subtitulo, tabla, resaltar in paginas(resultados):
+                dibujar(fig, titulo, tabla, subtitulo, resaltar)
+                if "png" in formatos:
+                    buf = io.BytesIO()
+                    fig.savefig(buf, format="png", dpi=DPI)
+                    archivos[f"{nombre}.png"] = buf.getvalue()
+                if pdf is not None:
+                    pdf.savefig(fig)
+        finally:
+            if pdf is not None:
+                pdf.close()
+    if pdf_buf is not None:
+        archivos["legendarios_2026.pdf"] = pdf_buf.getvalue()
+    return archivos
+
+def comprimir(archivos: dict) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+        for nombre, contenido in archivos.items():
+            z.writestr(nombre, contenido)
+    return buf.getvalue()
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta el paquete post-partido (PNG / PDF).")
+    parser.add_argument("--excel", default=motor.DATA_FILE)
+    parser.add_argument("--salida", default="export")
+    parser.add_argument("--formatos", default="png,pdf")
+    args = parser.parse_args(argv)
+
+    nodos = planificador.grafo_2026(args.excel)
+    objetivos = [n.nombre for n in nodos if n.nombre.startswith(("2026/dia/", "2026/anual/"))]
+    resultados = planificador.ejecutar(planificador.subgrafo(nodos, objetivos))
+
+    t0 = time.perf_counter()
+    archivos = paquete(resultados, tuple(f.strip() for f in args.formatos.split(",")))
+    os.makedirs(args.salida, exist_ok=True)
+    for nombre, contenido in archivos.items():
+        with open(os.path.join(args.salida, nombre), "wb") as f:
+            f.write(contenido)
+    print(f"{len(archivos)} archivo(s) en {args.salida} ({time.perf_counter() - t0:.2f}s)")
+
+if __name__ == "__main__":
+    main()
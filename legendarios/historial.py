@@ -0,0 +1,180 @@
+"""
+Historial por jugador (series de tiempo entre temporadas).
+
+Se construye una vez por versión de datos: una tabla larga ordenada por
+(id_jugador, fecha) guardada como dict de arrays, más un índice
+id_jugador -> (inicio, fin). Leer la historia de un jugador es un slice
+de largo = partidos jugados, sin recorrer la temporada.
+
+2025 no tiene id_jugador: se resuelve con el número de camiseta (que en
+2026 es el id) o, si no, por nombre normalizado. Los que no aparecen en
+2026 reciben ids negativos estables (-1, -2, ... por orden alfabético).
+"""
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from legendarios import motor
+
+COLUMNAS = [
+    "id_jugador", "temporada", "fecha", "id_partido", "equipo", "posicion",
+    "puntos", "puntos_acum", "goles", "asistencias", "amarillas", "rojas", "partido_completado",
+]
+
+def normalizar_nombre(nombre) -> str:
+    s = unicodedata.normalize("NFKD", str(nombre))
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    return " ".join(s.upper().split())
+
+# =========================
+# Filas por temporada
+# =========================
+def filas_2026(base: pd.DataFrame) -> pd.DataFrame:
+    """
+    Una fila por jugador y partido con los puntos de la regla 2026 (puntos_partido).
+    """
+    if base.empty:
+        return pd.DataFrame(columns=COLUMNAS + ["nombre"])
+
+    f = base.groupby(["id_jugador", "id_partido"], as_index=False).agg(
+        nombre=("nombre", "first"),
+        fecha=("fecha", "first"),
+        equipo=("equipo", "first"),
+        posicion=("posicion_jugada", "first"),
+        puntos=("puntos_partido", "sum"),
+        goles=("gol_total", "sum"),
+        asistencias=("asistencia_gol", "sum"),
+        amarillas=("amarillas", "sum"),
+        rojas=("rojas", "sum"),
+        partido_completado=("partido_completado", "sum"),
+    )
+    f["temporada"] = 2026
+    return f
+
+def resolver_ids_2025(df_2025: pd.DataFrame, jugadores_2026: pd.DataFrame) -> dict:
+    """
+    Mapea cada nombre de 2025 a un id_jugador (ver docstring del módulo).
+    `df_2025` trae "# camiseta" desde el merge con la hoja Jugadores.
+    """
+    ids_2026 = set(pd.to_numeric(jugadores_2026["id_jugador"], errors="coerce").dropna().astype(int))
+    por_nombre_2026 = {
+        normalizar_nombre(n): int(i)
+        for i, n in zip(jugadores_2026["id_jugador"], jugadores_2026["nombre"])
+    }
+
+    camisetas = {}
+    if "# camiseta" in df_2025.columns:
+        pares = df_2025[["jugador", "# camiseta"]].drop_duplicates("jugador")
+        num = pd.to_numeric(pares["# camiseta"], errors="coerce")
+        camisetas = {n: int(c) for n, c in zip(pares["jugador"], num) if pd.notna(c) and int(c) in ids_2026}
+
+    mapa, sin_id = {}, []
+    for nombre in df_2025["jugador"].unique():
+        if nombre in camisetas:
+            mapa[nombre] = camisetas[nombre]
+        elif normalizar_nombre(nombre) in por_nombre_2026:
+            mapa[nombre] = por_nombre_2026[normalizar_nombre(nombre)]
+        else:
+            sin_id.append(nombre)
+
+    for i, nombre in enumerate(sorted(sin_id, key=normalizar_nombre)):
+        mapa[nombre] = -(i + 1)
+    return mapa
+
+def jugadores_2026(path: str) -> dict:
+    """
+    Solo la hoja Jugadores de 2026, con la forma de los datos de la temporada
+    ({"jugadores": df}): es lo único que filas_2025 necesita. Si el archivo
+    2026 falta o no se puede leer, sale vacía y todos quedan con id negativo.
+    """
+    try:
+        jugadores = motor.leer_tabla(path, motor.HOJA_J)
+        jugadores.columns = [str(c).strip() for c in jugadores.columns]
+        jugadores = jugadores[["id_jugador", "nombre"]]
+    except Exception:
+        # Excel ausente o roto, hoja o columnas faltantes: la página 2025 no depende de 2026
+        jugadores = pd.DataFrame(columns=["id_jugador", "nombre"])
+    return {"jugadores": jugadores}
+
+def filas_2025(df: pd.DataFrame, datos_2026: dict) -> pd.DataFrame:
+    """
+    Una fila por jugador y fecha con los puntos de la regla 2025.
+    `df` es el resultado de temporada_2025.cargar_temporada.
+    """
+    f = df.groupby(["jugador", "fecha"], as_index=False).agg(
+        equipo=("equipo", "first"),
+        posicion=("posicion", "first"),
+        puntos=("puntos", "sum"),
+        goles=("goles", "sum"),
+        asistencias=("asistencias", "sum"),
+        amarillas=("tarjetas_amarillas", "sum"),
+        rojas=("tarjetas_rojas", "sum"),
+    )
+    mapa = resolver_ids_2025(df, datos_2026["jugadores"])
+
+    f["id_jugador"] = f["jugador"].map(mapa).astype(int)
+    f["equipo"] = f["equipo"].astype(str).str.strip().str.lower()
+    f["posicion"] = f["posicion"].astype(str).str.strip().str.lower()
+    f["id_partido"] = -1  # 2025 no tiene id_partido
+    f["partido_completado"] = 1.0
+    f["temporada"] = 2025
+    return f.rename(columns={"jugador": "nombre"})
+
+# =========================
+# Almacén
+# =========================
+def construir_timeline(*tablas: pd.DataFrame) -> dict:
+    """
+    Junta las filas de todas las temporadas en el almacén:
+    {"columnas": {col: array}, "indice": {id: (ini, fin)},
+     "nombres": {id: nombre}, "alias": {(temporada, nombre): id}}.
+    """
+    filas = pd.concat([t for t in tablas if not t.empty], ignore_index=True)
+    filas["fecha"] = pd.to_datetime(filas["fecha"])
+    filas = filas.sort_values(["id_jugador", "fecha", "temporada", "id_partido"], kind="stable").reset_index(drop=True)
+    filas["puntos_acum"] = filas.groupby(["id_jugador", "temporada"])["puntos"].cumsum()
+
+    ids = filas["id_jugador"].to_numpy()
+    cortes = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1], True])
+    indice = {int(ids[a]): (int(a), int(b)) for a, b in zip(cortes[:-1], cortes[1:])}
+
+    # Nombre a mostrar: el más reciente (2026 manda sobre 2025)
+    ultimos = filas.sort_values(["temporada", "fecha"]).groupby("id_jugador")["nombre"].last()
+
+    return {
+        "columnas": {c: filas[c].to_numpy() for c in COLUMNAS},
+        "indice": indice,
+        "nombres": {int(i): str(n) for i, n in ultimos.items()},
+        "alias": {(int(t), str(n)): int(i) for t, n, i in filas[["temporada", "nombre", "id_jugador"]].drop_duplicates().itertuples(index=False)},
+    }
+
+# =========================
+# Consulta
+# =========================
+def serie(timeline: dict, id_jugador: int, temporada: int | None = None) -> pd.DataFrame:
+    """
+    Historia de un jugador en orden cronológico (O(partidos jugados)).
+    """
+    rango = timeline["indice"].get(int(id_jugador))
+    if rango is None:
+        return pd.DataFrame(columns=COLUMNAS)
+
+    ini, fin = rango
+    df = pd.DataFrame({c: a[ini:fin] for c, a in timeline["columnas"].items()})
+    if temporada is not None:
+        df = df[df["temporada"] == temporada].reset_index(drop=True)
+    return df
+
+def id_por_nombre(timeline: dict, temporada: int, nombre: str) -> int | None:
+    return timeline["alias"].get((temporada, nombre))
+
+def jugadores(timeline: dict, temporada: int | None = None) -> dict:
+    """
+    {id_jugador: nombre} ordenado por nombre; opcionalmente solo quienes jugaron esa temporada.
+    """
+    ids = timeline["nombres"]
+    if temporada is not None:
+        con_temporada = {i for (t, _), i in timeline["alias"].items() if t == temporada}
+        ids = {i: n for i, n in ids.items() if i in con_temporada}
+    return dict(sorted(ids.items(), key=lambda x: x[1]))
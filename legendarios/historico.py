@@ -0,0 +1,213 @@
+"""
+Archivo histórico: todas las temporadas cerradas en un solo archivo comprimido.
+
+Cada columna de cada hoja de cada temporada es un bloque propio dentro de
+un ZIP (comprimido por separado) y un índice JSON dice dónde está cada
+una, así que leer una temporada, o solo dos columnas de una hoja, descomprime
+solo esos bloques y nunca parsea un libro completo:
+
+    historico.zip
+        indice.json     {temporada: {origen, hojas: {hoja: {filas, columnas}}}}
+        2025/1/0.npy    temporada / nº de hoja / nº de columna: numéricas, booleanas y fechas (numpy)
+        2025/1/1.json   columnas de texto o mixtas (celda a celda, None = vacía)
+
+Lo leído es igual a lo que devuelve pd.read_excel de esa hoja (mismas
+columnas, tipos y valores). Para que la página 2025 y el historial entre
+temporadas lo usen: LEGENDARIOS_DATOS_2025=historico.zip
+
+    python -m legendarios.historico crear 2025=2025/datos.xlsx
+    python -m legendarios.historico info
+"""
+import argparse
+import io
+import json
+import os
+import zipfile
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from legendarios import cache
+
+HISTORICO_FILE = os.environ.get("LEGENDARIOS_HISTORICO", "historico.zip")
+INDICE = "indice.json"
+FORMATO = 1
+
+def es_historico(path: str) -> bool:
+    return str(path).endswith(".zip")
+
+# =========================
+# Codificación por columna
+# =========================
+def _celda(v):
+    if v is None or v is pd.NaT or (isinstance(v, (float, np.floating)) and np.isnan(v)):
+        return None
+    if isinstance(v, (bool, np.bool_)):
+        return bool(v)
+    if isinstance(v, (int, np.integer)):
+        return int(v)
+    if isinstance(v, (float, np.floating)):
+        return float(v)
+    if isinstance(v, str):
+        return v
+    if isinstance(v, (datetime, date)):
+        # Fecha suelta en una columna mixta: vuelve como Timestamp
+        return {"fecha": pd.Timestamp(v).isoformat()}
+    raise ValueError(f"Tipo de celda no soportado en el archivo histórico: {type(v).__name__}")
+
+def _de_celda(v):
+    if v is None:
+        return np.nan
+    if isinstance(v, dict):
+        return pd.Timestamp(v["fecha"])
+    return v
+
+def codificar(s: pd.Series) -> tuple:
+    """
+    (bytes, tipo, extensión) de una columna: numpy para números, booleanos
+    y fechas; JSON celda a celda para texto y columnas mixtas.
+    """
+    if s.dtype.kind in "biufM" and isinstance(s.dtype, np.dtype):
+        buf = io.BytesIO()
+        np.save(buf, s.to_numpy(), allow_pickle=False)
+        return buf.getvalue(), str(s.dtype), "npy"
+    tipo = "str" if pd.api.types.is_string_dtype(s) and s.dtype != object else "object"
+    valores = [_celda(v) for v in s.astype(object)]
+    return json.dumps(valores, ensure_ascii=False).encode("utf-8"), tipo, "json"
+
+def decodificar(datos: bytes, tipo: str) -> np.ndarray | pd.Series:
+    if tipo == "str":
+        return pd.Series(json.loads(datos), dtype="str")
+    if tipo == "object":
+        return pd.Series([_de_celda(v) for v in json.loads(datos)], dtype=object)
+    return np.load(io.BytesIO(datos), allow_pickle=False)
+
+# =========================
+# Escritura
+# =========================
+def guardar(path: str, temporadas: dict):
+    """
+    Escribe el archivo con `temporadas` ({temporada: ruta del Excel}). Las
+    temporadas que ya estaban en `path` y no se pasan se conservan tal cual.
+    Se escribe en un temporal y se reemplaza al final: quien lo esté leyendo
+    no ve un archivo a medias.
+    """
+    indice = {}
+    previas = {}
+    if os.path.exists(path):
+        previas = {t: v for t, v in leer_indice(path).items() if int(t) not in {int(x) for x in temporadas}}
+
+    tmp = f"{path}.tmp"
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+        if previas:
+            with zipfile.ZipFile(path) as viejo:
+                for t, info in previas.items():
+                    for hoja in info["hojas"].values():
+                        for col in hoja["columnas"]:
+                            zf.writestr(col["miembro"], viejo.read(col["miembro"]))
+                    indice[t] = info
+
+        for temporada, xlsx in sorted(temporadas.items()):
+            hojas = {}
+            for h, (nombre_hoja, df) in enumerate(pd.read_excel(xlsx, sheet_name=None).items()):
+                columnas = []
+                for i, c in enumerate(df.columns):
+                    datos, tipo, ext = codificar(df[c])
+                    miembro = f"{temporada}/{h}/{i}.{ext}"
+                    zf.writestr(miembro, datos)
+                    columnas.append({"nombre": str(c), "miembro": miembro, "tipo": tipo})
+                hojas[nombre_hoja] = {"filas": len(df), "columnas": columnas}
+            indice[str(temporada)] = {"origen": str(xlsx), "hojas": hojas}
+
+        indice = dict(sorted(indice.items(), key=lambda x: int(x[0])))
+        zf.writestr(INDICE, json.dumps({"formato": FORMATO, "temporadas": indice}, ensure_ascii=False, indent=1))
+    os.replace(tmp, path)
+
+# =========================
+# Lectura
+# =========================
+def leer_indice(path: str) -> dict:
+    """
+    {temporada (texto): {"origen", "hojas": {hoja: {"filas", "columnas"}}}}.
+    """
+    with zipfile.ZipFile(path) as zf:
+        indice = json.loads(zf.read(INDICE))
+    if indice.get("formato") != FORMATO:
+        raise ValueError(f"{path}: formato de archivo histórico {indice.get('formato')} (se esperaba {FORMATO})")
+    return indice["temporadas"]
+
+def temporadas(path: str = HISTORICO_FILE) -> list:
+    if not os.path.exists(path):
+        return []
+    return sorted(int(t) for t in leer_indice(path))
+
+def _leer(path: str, temporada: int, hoja: str, columnas: tuple | None) -> pd.DataFrame:
+    indice = leer_indice(path)
+    if str(temporada) not in indice:
+        raise KeyError(f"{path}: no tiene la temporada {temporada}")
+    info = indice[str(temporada)]["hojas"].get(hoja)
+    if info is None:
+        raise KeyError(f"{path}: la temporada {temporada} no tiene la hoja '{hoja}'")
+
+    elegidas = info["columnas"]
+    if columnas is not None:
+        # Como snapshots.compactar: las que falten se omiten
+        por_nombre = {c["nombre"]: c for c in elegidas}
+        elegidas = [por_nombre[c] for c in columnas if c in por_nombre]
+    with zipfile.ZipFile(path) as zf:
+        datos = {c["nombre"]: decodificar(zf.read(c["miembro"]), c["tipo"]) for c in elegidas}
+    return pd.DataFrame(datos, index=pd.RangeIndex(info["filas"]))
+
+def leer_hoja(path: str, temporada: int, hoja: str, columnas: list | None = None) -> pd.DataFrame:
+    """
+    Equivalente a cache.leer_hoja para una temporada del archivo: solo las
+    `columnas` pedidas (todas si es None), cacheado por versión del archivo.
+    """
+    st = os.stat(path)
+    columnas = None if columnas is None else tuple(columnas)
+    clave = (os.path.abspath(path), st.st_mtime_ns, st.st_size, "historico", int(temporada), hoja, columnas)
+    return cache.CACHE.obtener("hojas", clave, _leer, path, int(temporada), hoja, columnas).copy(deep=False)
+
+def tamanos(path: str = HISTORICO_FILE) -> pd.DataFrame:
+    """
+    Bytes comprimidos y sin comprimir por temporada y hoja.
+    """
+    indice = leer_indice(path)
+    with zipfile.ZipFile(path) as zf:
+        info = {i.filename: i for i in zf.infolist()}
+    filas = []
+    for t, temporada in indice.items():
+        for hoja, h in temporada["hojas"].items():
+            miembros = [info[c["miembro"]] for c in h["columnas"]]
+            filas.append({
+                "temporada": int(t), "hoja": hoja, "filas": h["filas"], "columnas": len(miembros),
+                "bytes": sum(m.compress_size for m in miembros),
+                "bytes_sin_comprimir": sum(m.file_size for m in miembros),
+            })
+    return pd.DataFrame(filas)
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archivo histórico de temporadas cerradas (un ZIP por columnas).")
+    parser.add_argument("accion", choices=["crear", "info"])
+    parser.add_argument("temporadas", nargs="*", help="temporada=ruta del Excel, p. ej. 2025=2025/datos.xlsx")
+    parser.add_argument("--archivo", default=HISTORICO_FILE)
+    args = parser.parse_args(argv)
+
+    if args.accion == "crear":
+        if not args.temporadas:
+            parser.error("indica al menos una temporada (p. ej. 2025=2025/datos.xlsx)")
+        pares = dict(t.split("=", 1) for t in args.temporadas)
+        guardar(args.archivo, {int(t): xlsx for t, xlsx in pares.items()})
+        for t, xlsx in pares.items():
+            print(f"{xlsx} -> {args.archivo} (temporada {t})")
+
+    t = tamanos(args.archivo)
+    print(t.to_string(index=False))
+    print(f"Total: {os.path.getsize(args.archivo) / 1024:.1f} KB")
+
+if __name__ == "__main__":
+    main()
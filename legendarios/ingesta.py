@@ -0,0 +1,417 @@
+"""
+Ingesta incremental de partidos desde archivos sueltos.
+
+Además del Excel, la temporada acepta archivos de eventos por partido en
+un directorio (por defecto 2026/eventos/):
+
+    2026/eventos/
+        partidos.csv        filas nuevas de la hoja Partidos (opcional; fechas ISO)
+        partido_7.csv       eventos del partido 7 (mismas columnas que la hoja Eventos)
+        partido_8.jsonl     eventos del partido 8, un objeto JSON por línea
+
+Cada archivo se lee línea a línea y pasa por la misma normalización y
+validación de la hoja Eventos. Al aparecer (o cambiar) un archivo solo se
+parsean y puntúan sus filas; la base de la temporada se actualiza
+reemplazando las filas de ese partido y los nodos agregados se recalculan
+a partir de ella. Los snapshots de partidos anteriores se reutilizan y los
+nodos de INCREMENTALES (rating, rachas) se actualizan solo con los partidos nuevos.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import threading
+
+import pandas as pd
+
+from legendarios import almacen, motor, planificador, rachas, rating
+
+EVENTOS_DIR = "2026/eventos"
+ARCHIVOS_PARTIDOS = ("partidos.csv", "partidos.jsonl")
+PATRON_EVENTOS = re.compile(r"^partido_(\d+)\.(csv|jsonl)$")
+
+# Nodos que saben actualizarse solo con los partidos afectados:
+# nombre -> funcion(resultado_previo, base, afectados)
+INCREMENTALES = {"2026/rating": rating.actualizar, "2026/rachas": rachas.actualizar}
+
+# =========================
+# Lectura de archivos
+# =========================
+def escanear(directorio: str) -> dict:
+    """
+    {nombre: (mtime_ns, tamaño)} de los archivos reconocidos del directorio.
+    """
+    if not os.path.isdir(directorio):
+        return {}
+    firmas = {}
+    with os.scandir(directorio) as it:
+        for e in it:
+            if e.is_file() and (PATRON_EVENTOS.match(e.name) or e.name in ARCHIVOS_PARTIDOS):
+                st = e.stat()
+                firmas[e.name] = (st.st_mtime_ns, st.st_size)
+    return firmas
+
+def leer_filas(path: str) -> pd.DataFrame:
+    """
+    Lee un CSV o un JSONL fila a fila. En el CSV todo llega como texto,
+    igual que una celda sin formato del Excel; los tipos se resuelven después.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".jsonl"):
+            filas = [json.loads(linea) for linea in f if linea.strip()]
+        else:
+            filas = list(csv.DictReader(f))
+    return pd.DataFrame(filas)
+
+def preparar_partidos(path: str, partidos_excel: pd.DataFrame) -> tuple:
+    """
+    Filas nuevas de Partidos. Devuelve (partidos, errores).
+    No se aceptan id_partido que ya estén en la hoja Partidos del Excel.
+    """
+    nombre = os.path.basename(path)
+    p = leer_filas(path)
+    p.columns = [str(c).strip() for c in p.columns]
+
+    if not motor.REQ_PARTIDOS.issubset(set(p.columns)):
+        return p, [f"{nombre}: faltan columnas: {sorted(list(motor.REQ_PARTIDOS - set(p.columns)))}"]
+
+    errores = []
+    p["fecha"] = pd.to_datetime(p["fecha"], errors="coerce")
+    p["id_partido"] = pd.to_numeric(p["id_partido"], errors="coerce")
+    for c in ["marcador_amarillo", "marcador_azul"]:
+        p[c] = pd.to_numeric(p[c], errors="coerce")
+
+    if p["id_partido"].isna().any():
+        errores.append(f"{nombre}: hay filas sin id_partido numérico.")
+    if p["fecha"].isna().any():
+        errores.append(f"{nombre}: hay fechas vacías o inválidas (usa AAAA-MM-DD).")
+    if p["id_partido"].duplicated().any():
+        errores.append(f"{nombre}: hay id_partido repetidos.")
+    ya = set(pd.to_numeric(partidos_excel["id_partido"], errors="coerce").dropna().astype(int))
+    repetidos = sorted(set(p["id_partido"].dropna().astype(int)) & ya)
+    if repetidos:
+        errores.append(f"{nombre}: los partidos {repetidos} ya están en la hoja Partidos del Excel.")
+    if errores:
+        return p, errores
+
+    p["id_partido"] = p["id_partido"].astype(int)
+    return p, []
+
+def preparar_archivo(path: str, id_partido: int, datos: dict, informe: dict | None = None) -> tuple:
+    """
+    Eventos de un partido con las reglas de la hoja Eventos.
+    Devuelve (eventos, errores); con errores el archivo no se incorpora.
+    `datos` solo necesita "jugadores" y "partidos"; `informe` recibe el
+    tipado de sus celdas, como en motor.preparar_eventos.
+    """
+    nombre = os.path.basename(path)
+    ev = motor.normalizar_eventos(leer_filas(path))
+    if ev.empty:
+        return ev, [f"{nombre}: no tiene filas."]
+
+    # El id_partido sale del nombre del archivo si no viene en las filas
+    if "id_partido" not in ev.columns:
+        ev["id_partido"] = id_partido
+    faltan = motor.REQ_EVENTOS - set(ev.columns)
+    if faltan:
+        return ev, [f"{nombre}: faltan columnas: {sorted(faltan)}"]
+
+    errores = [
+        f"{nombre}: {e}" for e in motor.validate(datos["jugadores"], datos["partidos"], ev)
+        if e.startswith(("Eventos", "Hoja Eventos"))
+    ]
+    if (pd.to_numeric(ev["id_partido"], errors="coerce") != id_partido).any():
+        errores.append(f"{nombre}: todas las filas deben tener id_partido = {id_partido}.")
+    if errores:
+        return ev, errores
+    return motor.preparar_eventos(ev, informe), []
+
+# =========================
+# Temporada viva
+# =========================
+class Temporada:
+    """
+    Resultados del planificador para el Excel más los archivos del directorio.
+    `sincronizar()` incorpora solo lo nuevo o modificado; `version` sube con
+    cada cambio (sirve como clave de caché). Es seguro llamarla desde varias
+    sesiones a la vez.
+    """
+    def __init__(self, path: str = motor.DATA_FILE, directorio: str = EVENTOS_DIR,
+                 workers: int | None = None, grafo=planificador.grafo_app_2026,
+                 hilos: bool = False, avisar=None):
+        self.path, self.directorio, self.workers, self.grafo = path, directorio, workers, grafo
+        self.hilos = hilos
+        # `avisar` (ver planificador.ejecutar) solo recibe la construcción que queda
+        # vigente al terminar: si hay archivos en el directorio, la que los incorpora
+        self._avisar = avisar
+        # Con el almacén SQLite como fuente, versión de la base ya incorporada
+        self.version_almacen = almacen.version(path) if motor.es_almacen(path) else None
+        self.resultados = planificador.ejecutar(grafo(path), workers=workers, hilos=hilos,
+                                                avisar=None if escanear(directorio) else avisar)
+        self.version = 0
+        self.firmas = {}
+        self.errores = {}
+
+        self._excel = self.resultados["2026/datos"]
+        self._partidos_extra = pd.DataFrame(columns=list(motor.REQ_PARTIDOS))
+        self._eventos_archivo = {}  # id_partido -> eventos preparados
+        self._tipado_archivo = {}   # id_partido -> tipado de su archivo (ver motor.preparar_eventos)
+        self._origen = {}           # nombre de archivo -> id_partido
+        self._lock = threading.Lock()
+        self.sincronizar()
+        self._avisar = None
+
+    def sincronizar(self) -> bool:
+        """
+        Revisa el directorio (solo stat) y, si la fuente es el almacén, su número
+        de versión; incorpora lo que cambió. True si hubo cambios.
+        """
+        if escanear(self.directorio) == self.firmas and not self._almacen_cambio():
+            return False
+        with self._lock:
+            hubo = False
+            if self._almacen_cambio():
+                self._aplicar_almacen()
+                hubo = True
+            firmas = escanear(self.directorio)
+            tocados = {n for n in firmas.keys() | self.firmas.keys() if firmas.get(n) != self.firmas.get(n)}
+            if tocados:
+                self._aplicar(firmas, tocados)
+                self.firmas = firmas
+                hubo = True
+            if hubo:
+                self.version += 1
+            return hubo
+
+    def _almacen_cambio(self) -> bool:
+        return self.version_almacen is not None and almacen.version(self.path) != self.version_almacen
+
+    def _aplicar_almacen(self):
+        """
+        Incorpora las filas del almacén posteriores a version_almacen: de Eventos
+        se releen solo los partidos tocados. Un cambio en Jugadores (toca a todos)
+        o una temporada sin eventos se vuelve a leer completa.
+        """
+        actual, filas = almacen.cambios(self.path, self.version_almacen)
+        cambio_j, cambio_p, cambio_e = filas[motor.HOJA_J], filas[motor.HOJA_P], filas[motor.HOJA_E]
+        previo = self._excel
+
+        if len(cambio_j) or len(previo["eventos"]) == 0:
+            self._excel = motor.cargar_temporada(self.path)
+            afectados = set(pd.to_numeric(previo["partidos"]["id_partido"], errors="coerce").dropna().astype(int))
+            afectados |= set(pd.to_numeric(self._excel["partidos"]["id_partido"], errors="coerce").dropna().astype(int))
+        else:
+            ids_p = set(cambio_p["id_partido"].astype(int))
+            ids_e = set(cambio_e["id_partido"].astype(int))
+            afectados = ids_p | ids_e
+
+            nuevos_p = cambio_p[cambio_p["borrado"] == 0].drop(columns="borrado")
+            nuevos_p = nuevos_p.assign(fecha=pd.to_datetime(nuevos_p["fecha"], errors="coerce"),
+                                       id_partido=nuevos_p["id_partido"].astype(int))
+            partidos = previo["partidos"][~previo["partidos"]["id_partido"].isin(ids_p)]
+            partidos = pd.concat([partidos, nuevos_p], ignore_index=True).sort_values("id_partido", kind="stable")
+
+            # Todas las filas de cada partido tocado, tipadas como en cargar_temporada
+            nuevos_e = almacen.eventos_de(self.path, sorted(ids_e))
+            eventos = previo["eventos"][~previo["eventos"]["id_partido"].isin(ids_e)]
+            # El tipado de los partidos releídos reemplaza al que tenían
+            tipado = previo["tipado"][~previo["tipado"].index.isin(ids_e)]
+            if len(nuevos_e):
+                informe = {}
+                nuevos_e = motor.preparar_eventos(motor.normalizar_eventos(nuevos_e), informe)
+                eventos = pd.concat([eventos, nuevos_e], ignore_index=True)
+                tipado = pd.concat([tipado, informe["por_partido"]]).sort_index()
+            eventos = eventos.sort_values("id_partido", kind="stable")
+
+            jugadores = previo["jugadores"]
+            self._excel = {
+                "jugadores": jugadores,
+                "partidos": partidos.reset_index(drop=True),
+                "eventos": eventos.reset_index(drop=True),
+                "errores": motor.validate(jugadores, partidos, eventos),
+                "tipado": tipado,
+            }
+
+        self.version_almacen = actual
+        if afectados:
+            jugadores, partidos = self._jugadores_partidos()
+            self._reconstruir(jugadores, partidos, afectados)
+
+    def _jugadores_partidos(self) -> tuple:
+        jugadores, partidos = self._excel["jugadores"], self._excel["partidos"]
+        if len(self._excel["eventos"]) == 0:
+            # cargar_temporada solo tipa los ids cuando el Excel trae eventos
+            jugadores = jugadores.assign(id_jugador=pd.to_numeric(jugadores["id_jugador"], errors="coerce").astype(int))
+            partidos = partidos.assign(id_partido=pd.to_numeric(partidos["id_partido"], errors="coerce").astype(int))
+        if len(self._partidos_extra):
+            partidos = pd.concat([partidos, self._partidos_extra], ignore_index=True)
+        return jugadores, partidos
+
+    def _aplicar(self, firmas: dict, tocados: set):
+        afectados = set()
+
+        # 1) Partidos nuevos: si cambian, se reintentan los archivos rechazados
+        if tocados & set(ARCHIVOS_PARTIDOS):
+            extra, ok = [], True
+            for nombre in ARCHIVOS_PARTIDOS:
+                self.errores.pop(nombre, None)
+                if nombre in firmas:
+                    p, errs = preparar_partidos(os.path.join(self.directorio, nombre), self._excel["partidos"])
+                    if errs:
+                        self.errores[nombre], ok = errs, False
+                    else:
+                        extra.append(p)
+            if ok:
+                anteriores = set(self._partidos_extra["id_partido"])
+                self._partidos_extra = pd.concat(extra, ignore_index=True) if extra else self._partidos_extra.iloc[:0]
+                afectados |= anteriores | set(self._partidos_extra["id_partido"])
+                tocados |= {n for n in self.errores if PATRON_EVENTOS.match(n)}
+
+        jugadores, partidos = self._jugadores_partidos()
+        referencia = {"jugadores": jugadores, "partidos": partidos}
+        ids_excel = set(self._excel["eventos"]["id_partido"]) if len(self._excel["eventos"]) else set()
+
+        # 2) Archivos de eventos (uno por partido)
+        for nombre in sorted(tocados):
+            m = PATRON_EVENTOS.match(nombre)
+            if not m:
+                continue
+            pid = int(m.group(1))
+            self.errores.pop(nombre, None)
+            if self._origen.get(nombre) == pid:
+                del self._origen[nombre]
+                del self._eventos_archivo[pid]
+                del self._tipado_archivo[pid]
+                afectados.add(pid)
+            if nombre not in firmas:
+                continue
+            if pid in ids_excel or pid in self._eventos_archivo:
+                self.errores[nombre] = [f"{nombre}: el partido {pid} ya tiene eventos cargados (Excel u otro archivo)."]
+                continue
+            informe = {}
+            ev, errs = preparar_archivo(os.path.join(self.directorio, nombre), pid, referencia, informe)
+            if errs:
+                self.errores[nombre] = errs
+                continue
+            self._eventos_archivo[pid] = ev
+            self._tipado_archivo[pid] = informe["por_partido"]
+            self._origen[nombre] = pid
+            afectados.add(pid)
+
+        if afectados:
+            self._reconstruir(jugadores, partidos, afectados)
+
+    def _reconstruir(self, jugadores: pd.DataFrame, partidos: pd.DataFrame, afectados: set):
+        """
+        Puntúa solo los partidos afectados y recalcula lo que depende de la base.
+        """
+        previo = self.resultados
+        archivos = [self._eventos_archivo[pid] for pid in sorted(self._eventos_archivo)]
+        eventos = pd.concat([self._excel["eventos"], *archivos], ignore_index=True) if archivos else self._excel["eventos"]
+        tipado = [self._tipado_archivo[pid] for pid in sorted(self._tipado_archivo)]
+        tipado = pd.concat([self._excel["tipado"], *tipado]).sort_index() if tipado else self._excel["tipado"]
+        datos = {"jugadores": jugadores, "partidos": partidos, "eventos": eventos, "errores": self._excel["errores"],
+                 "tipado": tipado}
+
+        nuevos = [self._eventos_archivo[pid] for pid in sorted(afectados & set(self._eventos_archivo))]
+        # Filas de la fuente (Excel o almacén) de esos partidos, si cambiaron ahí
+        propios = self._excel["eventos"]
+        propios = propios[propios["id_partido"].isin(afectados)] if len(propios) else propios
+        if len(propios):
+            nuevos.insert(0, propios)
+        base = previo["2026/base"]
+        base = base[~base["id_partido"].isin(afectados)] if len(base) else base
+        if nuevos:
+            base_nueva = motor.construir_base({"jugadores": jugadores, "partidos": partidos, "eventos": pd.concat(nuevos, ignore_index=True)})
+            base = pd.concat([base, base_nueva], ignore_index=True) if len(base) else base_nueva
+
+        ids = sorted(pd.to_numeric(partidos["id_partido"], errors="coerce").dropna().astype(int).unique().tolist())
+        nodos = self.grafo(self.path, ids=ids)
+        recalcular = planificador.descendientes(nodos, ["2026/datos", "2026/base"])
+        previos = {k: v for k, v in previo.items() if k not in recalcular and k in {n.nombre for n in nodos}}
+        previos["2026/datos"], previos["2026/base"] = datos, base
+        for nombre, actualizar in INCREMENTALES.items():
+            if nombre in previo and nombre in recalcular:
+                previos[nombre] = actualizar(previo[nombre], base, afectados)
+
+        # Snapshots de partidos anteriores al primer partido afectado: no cambian
+        fechas = partidos.drop_duplicates("id_partido").set_index("id_partido")["fecha"]
+        desde = fechas[fechas.index.isin(afectados)].min()
+        for pid in ids:
+            clave = f"2026/partido/{pid}"
+            if clave in previo and pd.notna(desde) and fechas.get(pid) < desde:
+                previos[clave] = previo[clave]
+
+        self.resultados = planificador.ejecutar(nodos, workers=self.workers, previos=previos,
+                                                hilos=self.hilos, avisar=self._avisar)
+
+def paralelismo() -> dict:
+    """
+    workers/hilos de la Temporada de las apps: con LEGENDARIOS_WORKERS > 1, un
+    pool de procesos; si no, LEGENDARIOS_HILOS hilos (por defecto 4), así los
+    nodos de la página van llegando mientras se construye el resto.
+    """
+    workers = int(os.environ.get("LEGENDARIOS_WORKERS", "1"))
+    if workers > 1:
+        return {"workers": workers}
+    return {"workers": int(os.environ.get("LEGENDARIOS_HILOS", "4")), "hilos": True}
+
+# =========================
+# Resumen rápido
+# =========================
+def resumen_rapido(path: str = motor.DATA_FILE, directorio: str = EVENTOS_DIR) -> dict | None:
+    """
+    motor.ultimo_partido leyendo solo la hoja Partidos (más partidos.csv/jsonl
+    del directorio, con el mismo criterio que Temporada): alcanza para pintar
+    el cuadro de la última fecha sin esperar a Eventos ni a ningún cálculo.
+    """
+    partidos = motor.leer_tabla(path, motor.HOJA_P)
+    partidos["fecha"] = pd.to_datetime(partidos["fecha"], errors="coerce")
+    partidos["id_partido"] = pd.to_numeric(partidos["id_partido"], errors="coerce")
+
+    firmas = escanear(directorio)
+    extra = []
+    for nombre in ARCHIVOS_PARTIDOS:
+        if nombre in firmas:
+            p, errs = preparar_partidos(os.path.join(directorio, nombre), partidos)
+            if errs:
+                # Temporada tampoco incorpora ninguno si alguno tiene errores
+                extra = []
+                break
+            extra.append(p)
+    if extra:
+        partidos = pd.concat([partidos, *extra], ignore_index=True)
+    return motor.ultimo_partido(partidos)
+
+def firma_datos(path: str = motor.DATA_FILE, directorio: str = EVENTOS_DIR) -> tuple:
+    """
+    Versión de los datos sin leerlos: stat del Excel (o versión del almacén)
+    y de los archivos del directorio.
+    """
+    if motor.es_almacen(path):
+        fuente = ("almacen", almacen.version(path))
+    else:
+        st = os.stat(path)
+        fuente = (st.st_mtime_ns, st.st_size)
+    return fuente + (tuple(sorted(escanear(directorio).items())),)
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Revisa los archivos de eventos por partido y muestra qué se incorpora.")
+    parser.add_argument("--excel", default=motor.DATA_FILE)
+    parser.add_argument("--directorio", default=EVENTOS_DIR)
+    args = parser.parse_args(argv)
+
+    t = Temporada(args.excel, args.directorio, grafo=planificador.grafo_2026)
+    for nombre, pid in sorted(t._origen.items()):
+        print(f"OK     {nombre}: partido {pid}, {len(t._eventos_archivo[pid])} filas")
+    for nombre, errs in sorted(t.errores.items()):
+        for e in errs:
+            print(f"ERROR  {e}")
+    print(f"Eventos en la temporada: {len(t.resultados['2026/datos']['eventos'])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Varias ligas en un mismo proceso de Streamlit.
+
+Cada liga tiene su fuente de datos (Excel o almacén SQLite), su directorio
+de eventos por partido, sus claves de acceso y su base de analítica. El
+código importado (pandas, motor, matplotlib) se comparte; lo cacheado no:
+cada liga tiene sus propios espacios en legendarios/cache.py ("<liga>/modelos",
+"<liga>/snapshots", "<liga>/graficos") con su propio presupuesto.
+
+La liga se elige con ?liga=<id> en la URL (sin parámetro: LIGA_DEFECTO).
+Las ligas se declaran en un JSON (LEGENDARIOS_LIGAS, por defecto ligas.json):
+
+    {
+      "otra": {
+        "nombre": "Otra Liga",
+        "datos": "otra/estadisticas.xlsx",
+        "clave_usuario": "...", "clave_admin": "...",
+        "historial_2025": "otra/temporada_2025.xlsx",
+        "cache_mb": {"modelos": 64}
+      }
+    }
+
+Lo que falte se completa: eventos en <carpeta de datos>/eventos, analítica en
+<carpeta de datos>/analytics.db y presupuestos por defecto de la caché. Sin
+historial_2025 el historial por jugador es solo de 2026 (nunca se mezcla la
+temporada 2025 de otra liga). Sin archivo (o si no la redefine), LIGA_DEFECTO
+es la liga de siempre, con su Excel 2025 de temporada_2025.DATA_FILE.
+"""
+import functools
+import json
+import os
+import re
+
+from legendarios import cache, ingesta, motor, planificador, temporada_2025
+
+LIGAS_FILE = os.environ.get("LEGENDARIOS_LIGAS", "ligas.json")
+LIGA_DEFECTO = "legendarios"
+
+# Espacios de la caché que se separan por liga ("hojas" va por ruta de archivo)
+ESPACIOS = ["modelos", "snapshots", "graficos"]
+
+CAMPOS = ["nombre", "datos", "eventos", "clave_usuario", "clave_admin", "analytics_db", "logo", "historial_2025", "cache_mb"]
+
+_ID_VALIDO = re.compile(r"^[a-z0-9_-]+$")
+
+def _por_defecto() -> dict:
+    return {
+        "nombre": "Legendarios FC",
+        "datos": motor.DATA_FILE,
+        "eventos": ingesta.EVENTOS_DIR,
+        "clave_usuario": "enpausa",
+        "clave_admin": "legendariosgms",
+        "analytics_db": os.environ.get("LEGENDARIOS_ANALYTICS_DB", "2026/analytics.db"),
+        "logo": "2026/logo.png",
+        "historial_2025": temporada_2025.DATA_FILE,
+        "cache_mb": {},
+    }
+
+def _completar(liga_id: str, conf: dict) -> dict:
+    faltan = [c for c in ("datos", "clave_usuario", "clave_admin") if not conf.get(c)]
+    if faltan:
+        raise ValueError(f"Liga '{liga_id}': faltan {faltan}")
+    desconocidos = sorted(set(conf) - set(CAMPOS))
+    if desconocidos:
+        raise ValueError(f"Liga '{liga_id}': campos desconocidos {desconocidos}")
+    carpeta = os.path.dirname(conf["datos"])
+    return {
+        "id": liga_id,
+        "nombre": conf.get("nombre", liga_id),
+        "datos": conf["datos"],
+        "eventos": conf.get("eventos", os.path.join(carpeta, "eventos")),
+        "clave_usuario": conf["clave_usuario"],
+        "clave_admin": conf["clave_admin"],
+        "analytics_db": conf.get("analytics_db", os.path.join(carpeta, "analytics.db")),
+        "logo": conf.get("logo"),
+        "historial_2025": conf.get("historial_2025"),
+        "cache_mb": dict(conf.get("cache_mb", {})),
+    }
+
+def cargar(path: str = LIGAS_FILE) -> dict:
+    """
+    {id: configuración completa} con LIGA_DEFECTO más las del JSON (si existe).
+    Dos ligas no pueden compartir datos, eventos, analítica ni historial 2025.
+    """
+    declaradas = {LIGA_DEFECTO: _por_defecto()}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            declaradas.update(json.load(f))
+
+    ligas = {}
+    for liga_id, conf in declaradas.items():
+        if not _ID_VALIDO.match(liga_id):
+            raise ValueError(f"Liga '{liga_id}': el id solo admite minúsculas, números, '-' y '_'")
+        ligas[liga_id] = _completar(liga_id, conf)
+
+    for campo in ("datos", "eventos", "analytics_db", "historial_2025"):
+        rutas = [os.path.abspath(l[campo]) for l in ligas.values() if l[campo]]
+        if len(set(rutas)) < len(rutas):
+            raise ValueError(f"Dos ligas comparten '{campo}': cada liga necesita el suyo")
+    return ligas
+
+_LIGAS = None
+
+def ligas() -> dict:
+    """
+    Ligas declaradas (se leen una vez por proceso).
+    """
+    global _LIGAS
+    if _LIGAS is None:
+        _LIGAS = cargar()
+    return _LIGAS
+
+def elegir(liga_id: str | None) -> dict | None:
+    """
+    Configuración de la liga pedida (LIGA_DEFECTO si no se pide ninguna); None si no existe.
+    """
+    return ligas().get(liga_id or LIGA_DEFECTO)
+
+def grafo(liga: dict):
+    """
+    Grafo de la temporada viva de la liga (el `grafo` de ingesta.Temporada):
+    2026 más el historial, con 2025 solo si la liga declara historial_2025.
+    """
+    return functools.partial(planificador.grafo_app_2026, historial_2025=liga["historial_2025"])
+
+def espacios(liga: dict) -> dict:
+    """
+    {espacio: nombre en la caché} de la liga, registrándolos la primera vez
+    con el presupuesto de la liga (o el de por defecto del espacio).
+    """
+    nombres = {}
+    defecto = cache.presupuestos()
+    for espacio in ESPACIOS:
+        nombre = f"{liga['id']}/{espacio}"
+        mb = liga["cache_mb"].get(espacio)
+        presupuesto = defecto[espacio] if mb is None else int(mb * cache.MB)
+        # LEGENDARIOS_CACHE_MB también acepta "<liga>/<espacio>=MB"
+        cache.CACHE.agregar_espacio(nombre, defecto.get(nombre, presupuesto))
+        nombres[espacio] = nombre
+    return nombres
@@ -0,0 +1,589 @@
+"""
+Motor de cálculo de la temporada 2026 (sin Streamlit).
+
+Contiene la carga, normalización, validación, puntajes y rankings que
+muestra 2026/app.py, para poder reutilizarlos desde el planificador de
+construcción, el benchmark u otras herramientas.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from legendarios.cache import leer_hoja
+
+# =========================
+# Parámetros / constantes
+# =========================
+# Fuente de la temporada: el Excel, o el almacén SQLite (legendarios/almacen.py)
+# si LEGENDARIOS_DATOS apunta a un .db
+DATA_FILE = os.environ.get("LEGENDARIOS_DATOS", "2026/estadisticas_2026.xlsx")
+HOJA_J = "Jugadores"
+HOJA_P = "Partidos"
+HOJA_E = "Eventos"
+
+EQUIPOS_VALIDOS = {"amarillo", "azul"}
+POS_VALIDAS = {"arquero", "defensa", "mediocampista", "delantero"}
+
+# Orden de presentación de las posiciones
+POS_LIST = ["arquero", "defensa", "mediocampista", "delantero"]
+
+# Flags de posición jugada (nuevas)
+FLAG_COLS = ["fue_arquero", "fue_defensa", "fue_mediocampista", "fue_delantero"]
+
+# Contadores enteros de Eventos (incluye flags)
+INT_COLS = ["gol_recibido", "autogoles", "asistencia_gol", "amarillas", "rojas", "penal_atajado"] + FLAG_COLS
+
+# Rankings generales del año (columna, solo se listan valores > 0)
+STATS_GENERALES = ["goles", "asistencia_gol", "amarillas", "rojas", "autogoles"]
+
+# =========================
+# Carga de datos
+# =========================
+def es_almacen(path: str) -> bool:
+    return str(path).endswith((".db", ".sqlite", ".sqlite3"))
+
+def leer_tabla(path: str, hoja: str) -> pd.DataFrame:
+    """
+    Una hoja del Excel, o la tabla equivalente del almacén SQLite (ambas cacheadas).
+    """
+    if es_almacen(path):
+        from legendarios import almacen  # almacen importa motor
+        return almacen.leer_hoja(path, hoja)
+    return leer_hoja(path, hoja)
+
+def leer_excel(path: str):
+    jugadores = leer_tabla(path, HOJA_J)
+    partidos = leer_tabla(path, HOJA_P)
+    eventos = leer_tabla(path, HOJA_E)
+    return jugadores, partidos, eventos
+
+def ids_partidos(path: str) -> list:
+    """
+    Lee solo la hoja Partidos y devuelve los id_partido válidos
+    (sirve para armar el grafo de snapshots sin cargar Eventos).
+    """
+    partidos = leer_tabla(path, HOJA_P)
+    return sorted(pd.to_numeric(partidos["id_partido"], errors="coerce").dropna().astype(int).unique().tolist())
+
+# =========================
+# Normalización básica
+# =========================
+def normalizar(jugadores, partidos, eventos):
+    partidos["fecha"] = pd.to_datetime(partidos["fecha"], errors="coerce")
+    jugadores["posicion"] = jugadores["posicion"].astype(str).str.strip().str.lower()
+    eventos = normalizar_eventos(eventos)
+    return jugadores, partidos, eventos
+
+def normalizar_eventos(eventos):
+    """
+    Normalización de la hoja Eventos (o de un archivo de eventos de un partido).
+    """
+    eventos.columns = [str(c).strip() for c in eventos.columns]
+
+    # Asegurar columnas nuevas (compatibilidad si aún no existen)
+    for c in FLAG_COLS:
+        if c not in eventos.columns:
+            eventos[c] = 0
+
+    return eventos
+
+# =========================
+# Validaciones robustas
+# =========================
+REQ_JUGADORES = {"id_jugador", "nombre", "posicion", "activo", "sancion_grave"}
+REQ_PARTIDOS = {"id_partido", "fecha", "resultado_amarillo", "resultado_azul", "marcador_amarillo", "marcador_azul"}
+
+# Requeridos Eventos (incluye flags nuevos)
+REQ_EVENTOS = {
+    "id_partido","id_jugador","equipo","gol_recibido",
+    "fue_delantero","fue_arquero","fue_defensa","fue_mediocampista",
+    "gol_primer","gol_segundo","gol_total",
+    "autogoles","asistencia_gol","amarillas","rojas","penal_atajado"
+}
+
+def validate(jugadores, partidos, eventos):
+    errors = []
+
+    req_j, req_p, req_e = REQ_JUGADORES, REQ_PARTIDOS, REQ_EVENTOS
+
+    if not req_j.issubset(set(jugadores.columns)):
+        errors.append(f"Hoja Jugadores: faltan columnas: {sorted(list(req_j - set(jugadores.columns)))}")
+    if not req_p.issubset(set(partidos.columns)):
+        errors.append(f"Hoja Partidos: faltan columnas: {sorted(list(req_p - set(partidos.columns)))}")
+    if not req_e.issubset(set(eventos.columns)):
+        errors.append(f"Hoja Eventos: faltan columnas: {sorted(list(req_e - set(eventos.columns)))}")
+
+    if len(eventos) == 0:
+        return errors
+
+    ev = eventos.copy()
+    ev["id_partido"] = pd.to_numeric(ev["id_partido"], errors="coerce")
+    ev["id_jugador"] = pd.to_numeric(ev["id_jugador"], errors="coerce")
+    ev = ev.dropna(subset=["id_partido", "id_jugador"])
+    ev["id_partido"] = ev["id_partido"].astype(int)
+    ev["id_jugador"] = ev["id_jugador"].astype(int)
+
+    ids_j = set(pd.to_numeric(jugadores["id_jugador"], errors="coerce").dropna().astype(int).tolist())
+    ids_p = set(pd.to_numeric(partidos["id_partido"], errors="coerce").dropna().astype(int).tolist())
+
+    if (ev["id_jugador"].isin(ids_j) == False).any():
+        errors.append("Eventos: hay id_jugador que no existen en Jugadores (revisa filas).")
+
+    if (ev["id_partido"].isin(ids_p) == False).any():
+        errors.append("Eventos: hay id_partido que no existen en Partidos (revisa filas).")
+
+    bad_team = eventos[~eventos["equipo"].astype(str).str.strip().str.lower().isin(EQUIPOS_VALIDOS)]
+    if len(bad_team) > 0:
+        errors.append("Eventos: hay valores en 'equipo' distintos a 'amarillo'/'azul' (en minúscula).")
+
+    bad_pos = jugadores[~jugadores["posicion"].astype(str).str.strip().str.lower().isin(POS_VALIDAS)]
+    if len(bad_pos) > 0:
+        errors.append("Jugadores: hay valores en 'posicion' fuera de: arquero/defensa/mediocampista/delantero (minúscula).")
+
+    dup = eventos.duplicated(subset=["id_partido", "id_jugador"]).sum()
+    if dup > 0:
+        errors.append(f"Eventos: hay {dup} duplicados (id_partido + id_jugador). Debe ser 1 fila por jugador por partido.")
+
+    return errors
+
+# =========================
+# Tipado de columnas numéricas
+# =========================
+# Tipos de celda que ya son número (bool no: como texto, True no es un número)
+_TIPOS_NUMERO = [int, float, np.int64, np.int32, np.float64, np.float32]
+_tipo = np.frompyfunc(type, 1, 1)
+
+def tipar_numeros(df: pd.DataFrame, columnas: list) -> tuple:
+    """
+    Pasa `columnas` a float con el mismo criterio que astype(str) + coma
+    decimal + strip + pd.to_numeric(errors="coerce"), pero sin convertir
+    todo a texto:
+    - las columnas ya numéricas se usan tal cual,
+    - en las demás, las celdas que ya son número se copian directo y solo
+      el resto (texto, coma decimal, blancos) se limpia como texto, el de
+      todas las columnas junto en una sola pasada.
+    Devuelve ({columna: Serie float, NaN donde no hay número}, informe) con
+    informe = {"columnas_numericas", "celdas_texto", "celdas_invalidas"} y los
+    mismos conteos de celdas por fila ("texto_por_fila", "invalidas_por_fila").
+    """
+    salida, textos = {}, []
+    informe = {"columnas_numericas": 0, "celdas_texto": 0, "celdas_invalidas": 0}
+    texto_fila, invalidas_fila = np.zeros(len(df), dtype=int), np.zeros(len(df), dtype=int)
+    for c in columnas:
+        s = df[c]
+        if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+            salida[c] = s.astype(float)
+            informe["columnas_numericas"] += 1
+            continue
+
+        valores = s.to_numpy(dtype=object)
+        es_num = np.isin(_tipo(valores), _TIPOS_NUMERO)
+        num = np.full(len(valores), np.nan)
+        num[es_num] = valores[es_num].astype(float)
+        pos = np.flatnonzero(~es_num & pd.notna(valores))
+        texto_fila[pos] += 1
+        textos.append((c, pos, valores[pos]))
+        salida[c] = num
+
+    if textos:
+        limpio = pd.Series(np.concatenate([v for _, _, v in textos]), dtype=object)
+        limpio = limpio.astype(str).str.replace(",", ".", regex=False).str.strip()
+        limpio = pd.to_numeric(limpio, errors="coerce").astype(float).to_numpy()
+        informe["celdas_texto"] = len(limpio)
+        informe["celdas_invalidas"] = int(np.isnan(limpio).sum())
+        inicio = 0
+        for c, pos, _ in textos:
+            salida[c][pos] = limpio[inicio:inicio + len(pos)]
+            salida[c] = pd.Series(salida[c], index=df.index, name=c)
+            invalidas_fila[pos] += np.isnan(salida[c].to_numpy()[pos])
+            inicio += len(pos)
+    informe["texto_por_fila"], informe["invalidas_por_fila"] = texto_fila, invalidas_fila
+    return salida, informe
+
+def tipado_vacio() -> pd.DataFrame:
+    """
+    Informe de tipado por partido sin filas (ver preparar_eventos).
+    """
+    return pd.DataFrame({"celdas_texto": pd.Series(dtype=int), "celdas_invalidas": pd.Series(dtype=int)},
+                        index=pd.Index([], dtype=int, name="id_partido"))
+
+# =========================
+# Preparación de Eventos (tipos)
+# =========================
+def preparar_eventos(eventos_df: pd.DataFrame, informe: dict | None = None) -> pd.DataFrame:
+    """
+    Tipos de Eventos. Si se pasa `informe`, se completa con el de tipar_numeros
+    y con "por_partido": celdas_texto / celdas_invalidas de cada id_partido
+    (DataFrame indexado por id_partido, solo las filas que quedan).
+    """
+    eventos_df["equipo"] = eventos_df["equipo"].astype(str).str.strip().str.lower()
+
+    # Recalcular gol_total
+    eventos_df["gol_primer"] = pd.to_numeric(eventos_df["gol_primer"], errors="coerce").fillna(0).astype(int)
+    eventos_df["gol_segundo"] = pd.to_numeric(eventos_df["gol_segundo"], errors="coerce").fillna(0).astype(int)
+    eventos_df["gol_total"] = (eventos_df["gol_primer"] + eventos_df["gol_segundo"]).astype(int)
+
+    # partido_completado (float) - compatibilidad con fraccion_partido
+    if "partido_completado" in eventos_df.columns:
+        col_pc = "partido_completado"
+    elif "fraccion_partido" in eventos_df.columns:
+        col_pc = "fraccion_partido"
+    else:
+        col_pc = None
+
+    # Enteros (incluye flags) y partido_completado, en una sola pasada
+    numeros, informe_tipos = tipar_numeros(eventos_df, INT_COLS + ([col_pc] if col_pc else []))
+    if informe is not None:
+        informe.update(informe_tipos)
+
+    for c in INT_COLS:
+        eventos_df[c] = numeros[c].fillna(0).astype(int)
+
+    if col_pc is None:
+        eventos_df["partido_completado"] = 1.0
+    else:
+        eventos_df["partido_completado"] = numeros[col_pc].fillna(1.0).astype(float)
+
+    # ids
+    eventos_df["id_partido"] = pd.to_numeric(eventos_df["id_partido"], errors="coerce")
+    eventos_df["id_jugador"] = pd.to_numeric(eventos_df["id_jugador"], errors="coerce")
+    quedan = eventos_df[["id_partido","id_jugador"]].notna().all(axis=1).to_numpy()
+    if informe is not None:
+        conteo = pd.DataFrame({
+            "id_partido": eventos_df["id_partido"].to_numpy()[quedan].astype(int),
+            "celdas_texto": informe_tipos["texto_por_fila"][quedan],
+            "celdas_invalidas": informe_tipos["invalidas_por_fila"][quedan],
+        })
+        informe["por_partido"] = conteo.groupby("id_partido").sum()
+    eventos_df = eventos_df[quedan]
+    eventos_df["id_partido"] = eventos_df["id_partido"].astype(int)
+    eventos_df["id_jugador"] = eventos_df["id_jugador"].astype(int)
+    return eventos_df
+
+def cargar_temporada(path: str) -> dict:
+    """
+    Lee el Excel, normaliza, valida y prepara tipos.
+    Devuelve {"jugadores", "partidos", "eventos", "errores", "tipado"}, con
+    "tipado" las celdas numéricas de Eventos que llegaron como texto (y las
+    que no eran número), por partido (ver preparar_eventos).
+    """
+    return preparar_temporada(*leer_excel(path))
+
+def preparar_temporada(jugadores, partidos, eventos) -> dict:
+    """
+    cargar_temporada para las tres hojas ya leídas (p. ej. una temporada sintética).
+    """
+    jugadores, partidos, eventos = normalizar(jugadores, partidos, eventos)
+    errores = validate(jugadores, partidos, eventos)
+    informe = {"por_partido": tipado_vacio()}
+    if len(eventos) > 0:
+        eventos = preparar_eventos(eventos, informe)
+        jugadores["id_jugador"] = pd.to_numeric(jugadores["id_jugador"], errors="coerce").astype(int)
+        partidos["id_partido"] = pd.to_numeric(partidos["id_partido"], errors="coerce").astype(int)
+    return {"jugadores": jugadores, "partidos": partidos, "eventos": eventos, "errores": errores,
+            "tipado": informe["por_partido"]}
+
+# =========================
+# Merge base + puntos por partido
+# =========================
+def construir_base(datos: dict) -> pd.DataFrame:
+    jugadores_df, partidos_df, eventos_df = datos["jugadores"], datos["partidos"], datos["eventos"]
+
+    base = (
+        eventos_df
+        .merge(jugadores_df, on="id_jugador", how="left")
+        .merge(partidos_df, on="id_partido", how="left", suffixes=("", "_partido"))
+    )
+
+    # Guardar posición base y calcular posición jugada
+    base["posicion_base"] = base["posicion"].astype(str).str.strip().str.lower()
+
+    # Para advertir si marcan más de una posición jugada
+    base["_flags_sum"] = (
+        base["fue_arquero"].fillna(0).astype(int) +
+        base["fue_defensa"].fillna(0).astype(int) +
+        base["fue_mediocampista"].fillna(0).astype(int) +
+        base["fue_delantero"].fillna(0).astype(int)
+    )
+
+    # Posición jugada: el primer flag marcado (en el orden de POS_LIST) o la base
+    flags = [base[c].fillna(0).astype(int) == 1 for c in FLAG_COLS]
+    base["posicion_jugada"] = np.select(flags, POS_LIST, default=base["posicion_base"].to_numpy())
+
+    base["activo"] = pd.to_numeric(base["activo"], errors="coerce").fillna(0).astype(int)
+    base["sancion_grave"] = pd.to_numeric(base["sancion_grave"], errors="coerce").fillna(0).astype(int)
+
+    recibidos = base["marcador_azul"].where(base["equipo"] == "amarillo", base["marcador_amarillo"])
+    base["goles_recibidos_equipo"] = pd.to_numeric(recibidos, errors="coerce").fillna(0).astype(int)
+    base["valla_invicta_equipo"] = (base["goles_recibidos_equipo"] == 0).astype(int)
+
+    # Puntos por fila con el reglamento oficial (reglas.REGLAS_OFICIALES):
+    # resultado y posición jugada se prorratean, tarjetas/autogol (penal_partido) no
+    from legendarios import reglas  # reglas importa motor
+    base = base.assign(**reglas.puntos_por_fila(base))
+
+    # Puntos por partido (con partido_completado para TODOS)
+    base["puntos_participacion"] = (base["puntos_resultado"] + base["puntos_posicion"]) * base["partido_completado"]
+    base["puntos_partido"] = base["puntos_participacion"] + base["penal_partido"]
+    return base
+
+# =========================
+# Acumulados por jugador - por POSICIÓN BASE
+# =========================
+def acumulados(base_df: pd.DataFrame) -> pd.DataFrame:
+    agg_f = base_df.groupby(["id_jugador","nombre","posicion_base","activo","sancion_grave"], as_index=False).agg(
+        puntos_partido_total=("puntos_partido","sum"),
+        partidos_jugados=("id_partido","nunique"),
+        partidos_equivalentes=("partido_completado","sum"),
+        goles=("gol_total","sum"),
+        asistencia_gol=("asistencia_gol","sum"),
+        autogoles=("autogoles","sum"),
+        amarillas=("amarillas","sum"),
+        rojas=("rojas","sum"),
+        penales_atajados=("penal_atajado","sum"),
+        goles_recibidos_arquero=("gol_recibido","sum"),
+    )
+
+    # Renombrar a "posicion" para no romper el resto del código
+    agg_f = agg_f.rename(columns={"posicion_base": "posicion"})
+
+    # Penalización umbrales reiniciables (reglas.REGLAS_OFICIALES)
+    from legendarios import reglas  # reglas importa motor
+    umbrales = reglas.penal_umbrales(agg_f, [reglas.REGLAS_OFICIALES])
+    agg_f["penal_umbral_amarillas"] = umbrales["amarillas"][:, 0]
+    agg_f["penal_umbral_rojas"] = umbrales["rojas"][:, 0]
+
+    agg_f["puntos_total"] = agg_f["puntos_partido_total"] + agg_f["penal_umbral_amarillas"] + agg_f["penal_umbral_rojas"]
+    agg_f.loc[agg_f["sancion_grave"] == 1, "puntos_total"] = 0
+
+    # Valla menos vencida (usa gol_recibido / partidos_equivalentes) - por POSICIÓN BASE arquero
+    mask_arq = (agg_f["posicion"] == "arquero") & (agg_f["partidos_equivalentes"] > 0)
+    agg_f["valla_promedio"] = pd.Series([float("nan")] * len(agg_f), dtype="float64")
+    agg_f.loc[mask_arq, "valla_promedio"] = (
+        agg_f.loc[mask_arq, "goles_recibidos_arquero"] / agg_f.loc[mask_arq, "partidos_equivalentes"]
+    )
+
+    agg_f["puntos_arquero_ajustados"] = agg_f["puntos_total"].astype(float)
+    agg_f.loc[mask_arq, "puntos_arquero_ajustados"] = (
+        agg_f.loc[mask_arq, "puntos_total"].astype(float) - agg_f.loc[mask_arq, "valla_promedio"]
+    )
+
+    return agg_f
+
+def acumulados_hasta_fecha(base_df, fecha_limite):
+    return acumulados(base_df[base_df["fecha"].dt.date <= fecha_limite].copy())
+
+def activos(agg_df: pd.DataFrame) -> pd.DataFrame:
+    return agg_df[agg_df["activo"] == 1].copy()
+
+# =========================
+# Ranking con desempate
+# =========================
+def rank_puntos(df_in, use_arquero_ajustado=False):
+    df = df_in.copy()
+    df["_p"] = df["puntos_arquero_ajustados"] if use_arquero_ajustado else df["puntos_total"]
+    df["_p"] = pd.to_numeric(df["_p"], errors="coerce").fillna(0.0).astype(float)
+
+    df = df.sort_values(
+        by=["_p","partidos_jugados","goles","asistencia_gol"],
+        ascending=[False, False, False, False]
+    ).reset_index(drop=True)
+
+    df.insert(0, "posicion_ranking", range(1, len(df) + 1))
+    return df.drop(columns=["_p"])
+
+def ranking_acumulado_pos(agg_activos: pd.DataFrame, pos: str) -> pd.DataFrame:
+    """
+    Ranking acumulado de una posición base.
+    Arqueros usan Puntos Ajustados y traen valla_2d.
+    """
+    dfp = agg_activos[agg_activos["posicion"] == pos].copy()
+    if dfp.empty:
+        return dfp
+
+    ranked = rank_puntos(dfp, use_arquero_ajustado=(pos == "arquero"))
+    if pos == "arquero":
+        ranked["valla_2d"] = pd.to_numeric(ranked["valla_promedio"], errors="coerce").round(2)
+    return ranked
+
+# =========================
+# Ranking del día por POSICIÓN JUGADA
+# =========================
+def build_ranking_dia(base_dia: pd.DataFrame, pos: str) -> pd.DataFrame:
+    """
+    Ranking del día:
+    - Se filtra por posicion_jugada (lo que jugó ese día).
+    - Se rankea por puntos_partido (ya calculados con reglas de la posición jugada).
+    """
+    if base_dia.empty:
+        return base_dia
+
+    dfp = base_dia[base_dia["posicion_jugada"] == pos].copy()
+    if dfp.empty:
+        return dfp
+
+    dfp["puntos_rank"] = pd.to_numeric(dfp["puntos_partido"], errors="coerce").fillna(0.0).astype(float)
+
+    r = dfp.groupby(["id_jugador","nombre"], as_index=False).agg(
+        puntos=("puntos_rank","sum"),
+        partido_completado=("partido_completado","sum"),
+        goles=("gol_total","sum"),
+        asistencia_gol=("asistencia_gol","sum"),
+        amarillas=("amarillas","sum"),
+        rojas=("rojas","sum"),
+    )
+
+    r["puntos"] = pd.to_numeric(r["puntos"], errors="coerce").fillna(0.0).astype(float)
+
+    r = r.sort_values(
+        by=["puntos","partido_completado","goles","asistencia_gol"],
+        ascending=[False, False, False, False]
+    ).reset_index(drop=True)
+
+    r.insert(0, "posicion_ranking", range(1, len(r) + 1))
+    return r
+
+def ultima_fecha(partidos_df: pd.DataFrame):
+    return partidos_df["fecha"].dropna().max()
+
+def ultimo_partido(partidos_df: pd.DataFrame) -> dict | None:
+    """
+    Datos del cuadro de la última fecha: el partido de mayor id en esa fecha.
+    None si no hay fechas válidas.
+    """
+    uf = ultima_fecha(partidos_df)
+    if pd.isna(uf):
+        return None
+    p = partidos_df.loc[partidos_df["fecha"] == uf].sort_values("id_partido", ascending=False).iloc[0]
+    return {
+        "id_partido": int(p["id_partido"]),
+        "fecha": uf,
+        "cancha": str(p.get("cancha", "—")),
+        "marcador_amarillo": int(p["marcador_amarillo"]) if pd.notna(p["marcador_amarillo"]) else 0,
+        "marcador_azul": int(p["marcador_azul"]) if pd.notna(p["marcador_azul"]) else 0,
+    }
+
+def ranking_ultima_fecha(datos: dict, base: pd.DataFrame, pos: str) -> pd.DataFrame:
+    uf = ultima_fecha(datos["partidos"])
+    if pd.isna(uf):
+        return base.iloc[0:0]
+    base_ultima_fecha = base[(base["fecha"].dt.date == uf.date()) & (base["activo"] == 1)].copy()
+    return build_ranking_dia(base_ultima_fecha, pos)
+
+def snapshot_hasta_partido(datos: dict, base: pd.DataFrame, id_partido: int) -> dict:
+    """
+    Acumulados (solo activos) a la fecha de un partido, rankeados por posición,
+    más el Índice de Regularidad a esa fecha (clave "regularidad").
+    Devuelve {clave: ranking}; vacío si el partido no tiene fecha.
+    """
+    partidos_df = datos["partidos"]
+    fila = partidos_df[pd.to_numeric(partidos_df["id_partido"], errors="coerce") == id_partido]
+    fila = fila.dropna(subset=["fecha"])
+    if fila.empty:
+        return {}
+
+    fsel = pd.to_datetime(fila.iloc[0]["fecha"]).date()
+    agg_h = activos(acumulados_hasta_fecha(base, fsel))
+    tablas = {pos: ranking_acumulado_pos(agg_h, pos) for pos in POS_LIST}
+    tablas["regularidad"] = indice_regularidad(agg_h)
+    return tablas
+
+def ranking_dia_partido(base: pd.DataFrame, id_partido: int) -> dict:
+    """
+    Rankings del día (posición jugada, solo activos) de un partido: {posicion: ranking}.
+    """
+    base_dia = base[(base["id_partido"] == id_partido) & (base["activo"] == 1)].copy()
+    return {pos: build_ranking_dia(base_dia, pos) for pos in POS_LIST}
+
+def snapshot_partido(datos: dict, base: pd.DataFrame, id_partido: int) -> dict:
+    return {
+        "id_partido": id_partido,
+        "dia": ranking_dia_partido(base, id_partido),
+        "hasta": snapshot_hasta_partido(datos, base, id_partido),
+    }
+
+# =========================
+# Rankings generales año
+# =========================
+def ranking_estadistica(agg_activos: pd.DataFrame, col: str) -> pd.DataFrame:
+    r = agg_activos.sort_values(by=[col,"partidos_jugados"], ascending=[False, False]).reset_index(drop=True)
+    r = r[r[col] > 0].copy()
+    r.insert(0, "posicion_ranking", range(1, len(r) + 1))
+    return r
+
+def ranking_valla(agg_activos: pd.DataFrame) -> pd.DataFrame:
+    valla = agg_activos[agg_activos["posicion"] == "arquero"].copy()
+    valla = valla[valla["partidos_equivalentes"] > 0].copy()
+    valla["valla_promedio_num"] = pd.to_numeric(valla["valla_promedio"], errors="coerce").fillna(0.0).astype(float)
+    valla["valla_promedio_2d"] = valla["valla_promedio_num"].round(2)
+
+    valla = valla.sort_values(by=["valla_promedio_num","partidos_equivalentes"], ascending=[True, False]).reset_index(drop=True)
+    valla.insert(0, "posicion_ranking", range(1, len(valla) + 1))
+    return valla
+
+def resumen_partidos(partidos_df: pd.DataFrame) -> pd.DataFrame:
+    resumen = partidos_df.copy().dropna(subset=["fecha"]).sort_values("fecha", ascending=False)
+    resumen["goles_total_partido"] = resumen["marcador_amarillo"].fillna(0).astype(int) + resumen["marcador_azul"].fillna(0).astype(int)
+    return resumen
+
+# =========================
+# Índice de Regularidad
+# =========================
+# Pesos por componente (deben sumar 1)
+PESOS_REGULARIDAD = {"asistencia": 0.40, "rol": 0.35, "ofensivo": 0.15, "disciplina": 0.10}
+
+def componentes_regularidad(agg_activos: pd.DataFrame) -> pd.DataFrame:
+    """
+    Scores 0-1 de cada componente, en una sola pasada agrupada:
+    - score_asistencia: partidos_equivalentes / máximo
+    - score_rol: percentil de puntos dentro de su posición (arqueros: ajustados)
+    - score_ofensivo: percentil de goles + asistencias
+    - score_disciplina: 1 - percentil del castigo por tarjetas
+    """
+    reg = agg_activos.copy()
+
+    max_part_eq = reg["partidos_equivalentes"].max() if len(reg) else 1
+    reg["score_asistencia"] = (reg["partidos_equivalentes"] / max_part_eq) if max_part_eq else 0
+
+    puntos_rol = reg["puntos_total"].where(reg["posicion"] != "arquero", reg["puntos_arquero_ajustados"])
+    reg["_p_rol"] = pd.to_numeric(puntos_rol, errors="coerce").fillna(0.0).astype(float)
+    reg["score_rol"] = (
+        reg.groupby("posicion")["_p_rol"].rank(pct=True)
+        .where(reg["posicion"].isin(POS_VALIDAS), 0.0)
+        .fillna(0.0)
+    )
+
+    reg["ofensivo"] = reg["goles"] + reg["asistencia_gol"]
+    reg["score_ofensivo"] = reg["ofensivo"].rank(pct=True) if len(reg) else 0
+
+    reg["castigo_disciplina"] = (reg["amarillas"] * 1) + (reg["rojas"] * 3) + ((reg["amarillas"] // 5) * 3) + ((reg["rojas"] // 3) * 5)
+    disc_pct = reg["castigo_disciplina"].rank(pct=True) if len(reg) else 0
+    reg["score_disciplina"] = 1 - disc_pct
+    return reg.drop(columns=["_p_rol"])
+
+def combinar_regularidad(reg: pd.DataFrame, pesos: dict | None = None) -> pd.DataFrame:
+    """
+    Índice = suma ponderada de los componentes, ya ordenado y con posicion_ranking.
+    Sirve para re-ponderar sin recalcular percentiles.
+    """
+    pesos = {**PESOS_REGULARIDAD, **(pesos or {})}
+    reg = reg.drop(columns=["posicion_ranking"], errors="ignore").copy()
+
+    reg["indice_regularidad"] = (
+        pesos["asistencia"] * reg["score_asistencia"] +
+        pesos["rol"] * reg["score_rol"] +
+        pesos["ofensivo"] * reg["score_ofensivo"] +
+        pesos["disciplina"] * reg["score_disciplina"]
+    )
+
+    reg = reg.sort_values(
+        by=["indice_regularidad","partidos_jugados","goles","asistencia_gol"],
+        ascending=[False, False, False, False]
+    ).reset_index(drop=True)
+
+    reg.insert(0, "posicion_ranking", range(1, len(reg) + 1))
+    return reg
+
+def indice_regularidad(agg_activos: pd.DataFrame, pesos: dict | None = None) -> pd.DataFrame:
+    return combinar_regularidad(componentes_regularidad(agg_activos), pesos)
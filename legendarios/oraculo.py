@@ -0,0 +1,592 @@
+"""
+Oráculo diferencial: compara los caminos optimizados con las implementaciones
+fila a fila de referencia, sobre temporadas aleatorias y casos borde.
+
+Las referencias de abajo son copias congeladas de cómo se calculaba todo
+fila a fila (puntos_posicion, resultado_puntos, acumulados_hasta_fecha,
+rank_puntos y el recorrido por fecha de 2025). Si se optimiza motor (o
+temporada_2025), estas NO se tocan: son la verdad contra la que se compara.
+
+Comprobaciones, cada una con el tiempo de la referencia y del camino optimizado:
+- puntos por fila:  motor.construir_base
+- acumulados:       rankings "a esa fecha" leídos del almacén de snapshots
+- movimientos:      snapshots.movimientos entre partidos seguidos
+- reglamento:       reglas.puntuar / reglas.rankings (formulación matricial)
+- ingesta:          Temporada con la mitad en el Excel y el resto por archivos
+                    frente a reconstruir todo (solo temporadas aleatorias)
+- tipado:           motor.tipar_numeros frente a todo a texto
+- 2025 por fecha:   temporada_2025.puntos_por_fecha
+
+    python -m legendarios.oraculo --aleatorias 20 --partidos 10 --jugadores 30
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from legendarios import ingesta, motor, planificador, reglas, sintetico, snapshots, temporada_2025
+
+# Tolerancia de los puntos en coma flotante (prorrateo por partido_completado)
+TOLERANCIA = 1e-9
+
+COLS_BASE = [
+    "id_partido", "id_jugador", "posicion_base", "posicion_jugada", "puntos_resultado",
+    "goles_recibidos_equipo", "valla_invicta_equipo", "penal_partido", "puntos_posicion", "puntos_partido",
+]
+
+# =========================
+# Referencias (copias congeladas, fila a fila)
+# =========================
+def _posicion_jugada(fila) -> str:
+    if int(fila.get("fue_arquero", 0)) == 1:
+        return "arquero"
+    if int(fila.get("fue_defensa", 0)) == 1:
+        return "defensa"
+    if int(fila.get("fue_mediocampista", 0)) == 1:
+        return "mediocampista"
+    if int(fila.get("fue_delantero", 0)) == 1:
+        return "delantero"
+    return str(fila.get("posicion_base", "")).strip().lower()
+
+def _resultado_puntos(fila):
+    eq = fila["equipo"]
+    r = str(fila["resultado_amarillo"]).strip().lower() if eq == "amarillo" else str(fila["resultado_azul"]).strip().lower()
+    if r == "g":
+        return 3
+    if r == "e":
+        return 1
+    return 0
+
+def _goles_recibidos_equipo(fila):
+    if fila["equipo"] == "amarillo":
+        return int(fila["marcador_azul"]) if pd.notna(fila["marcador_azul"]) else 0
+    return int(fila["marcador_amarillo"]) if pd.notna(fila["marcador_amarillo"]) else 0
+
+def _puntos_posicion(fila):
+    pos_jugada = str(fila.get("posicion_jugada", "")).strip().lower()
+    pos_base = str(fila.get("posicion_base", "")).strip().lower()
+
+    goles = int(fila["gol_total"])
+    asis = int(fila["asistencia_gol"])
+    pen_at = int(fila["penal_atajado"])
+    valla = int(fila["valla_invicta_equipo"])
+    cambio_pos = (pos_jugada != pos_base)
+
+    puntos = 0
+    if pos_jugada == "arquero":
+        puntos += 3 * valla
+        puntos += 3 * pen_at
+        if not cambio_pos:
+            puntos += 3 * goles
+        puntos += 1 * asis
+        if cambio_pos and goles >= 3:
+            puntos += 1
+    elif pos_jugada == "defensa":
+        puntos += 3 * valla
+        if not cambio_pos:
+            puntos += 3 * goles
+        puntos += 1 * asis
+        if goles >= 3:
+            puntos += 1
+    elif pos_jugada in ("mediocampista", "delantero"):
+        puntos += 1 * asis
+        if goles >= 3:
+            puntos += 1
+    return puntos
+
+def base_referencia(datos: dict) -> pd.DataFrame:
+    """
+    La base puntuada recorriendo las filas una por una.
+    """
+    b = (
+        datos["eventos"]
+        .merge(datos["jugadores"], on="id_jugador", how="left")
+        .merge(datos["partidos"], on="id_partido", how="left", suffixes=("", "_partido"))
+    )
+    b["activo"] = pd.to_numeric(b["activo"], errors="coerce").fillna(0).astype(int)
+    b["sancion_grave"] = pd.to_numeric(b["sancion_grave"], errors="coerce").fillna(0).astype(int)
+
+    calculadas = defaultdict(list)
+    for fila in b.to_dict("records"):
+        fila["posicion_base"] = str(fila["posicion"]).strip().lower()
+        fila["posicion_jugada"] = _posicion_jugada(fila)
+        fila["puntos_resultado"] = _resultado_puntos(fila)
+        fila["goles_recibidos_equipo"] = _goles_recibidos_equipo(fila)
+        fila["valla_invicta_equipo"] = int(fila["goles_recibidos_equipo"] == 0)
+        fila["penal_partido"] = -1 * fila["amarillas"] - 3 * fila["rojas"] - 1 * fila["autogoles"]
+        fila["puntos_posicion"] = _puntos_posicion(fila)
+        fila["puntos_partido"] = (fila["puntos_resultado"] + fila["puntos_posicion"]) * fila["partido_completado"] + fila["penal_partido"]
+        for c in COLS_BASE[2:]:
+            calculadas[c].append(fila[c])
+
+    for c in COLS_BASE[2:]:
+        b[c] = calculadas[c] if len(b) else pd.Series(dtype=float)
+    return b
+
+def acumulados_referencia(base_df: pd.DataFrame) -> pd.DataFrame:
+    agg_f = base_df.groupby(["id_jugador","nombre","posicion_base","activo","sancion_grave"], as_index=False).agg(
+        puntos_partido_total=("puntos_partido","sum"),
+        partidos_jugados=("id_partido","nunique"),
+        partidos_equivalentes=("partido_completado","sum"),
+        goles=("gol_total","sum"),
+        asistencia_gol=("asistencia_gol","sum"),
+        autogoles=("autogoles","sum"),
+        amarillas=("amarillas","sum"),
+        rojas=("rojas","sum"),
+        penales_atajados=("penal_atajado","sum"),
+        goles_recibidos_arquero=("gol_recibido","sum"),
+    )
+    agg_f = agg_f.rename(columns={"posicion_base": "posicion"})
+
+    agg_f["penal_umbral_amarillas"] = (-3) * (agg_f["amarillas"] // 5)
+    agg_f["penal_umbral_rojas"] = (-5) * (agg_f["rojas"] // 3)
+    agg_f["puntos_total"] = agg_f["puntos_partido_total"] + agg_f["penal_umbral_amarillas"] + agg_f["penal_umbral_rojas"]
+    agg_f.loc[agg_f["sancion_grave"] == 1, "puntos_total"] = 0
+
+    mask_arq = (agg_f["posicion"] == "arquero") & (agg_f["partidos_equivalentes"] > 0)
+    agg_f["valla_promedio"] = pd.Series([float("nan")] * len(agg_f), dtype="float64")
+    agg_f.loc[mask_arq, "valla_promedio"] = (
+        agg_f.loc[mask_arq, "goles_recibidos_arquero"] / agg_f.loc[mask_arq, "partidos_equivalentes"]
+    )
+    agg_f["puntos_arquero_ajustados"] = agg_f["puntos_total"].astype(float)
+    agg_f.loc[mask_arq, "puntos_arquero_ajustados"] = (
+        agg_f.loc[mask_arq, "puntos_total"].astype(float) - agg_f.loc[mask_arq, "valla_promedio"]
+    )
+    return agg_f
+
+def acumulados_hasta_fecha_referencia(base_df, fecha_limite):
+    return acumulados_referencia(base_df[base_df["fecha"].dt.date <= fecha_limite].copy())
+
+def rank_puntos_referencia(df_in, use_arquero_ajustado=False):
+    df = df_in.copy()
+    df["_p"] = df["puntos_arquero_ajustados"] if use_arquero_ajustado else df["puntos_total"]
+    df["_p"] = pd.to_numeric(df["_p"], errors="coerce").fillna(0.0).astype(float)
+    df = df.sort_values(
+        by=["_p","partidos_jugados","goles","asistencia_gol"],
+        ascending=[False, False, False, False]
+    ).reset_index(drop=True)
+    df.insert(0, "posicion_ranking", range(1, len(df) + 1))
+    return df.drop(columns=["_p"])
+
+def ranking_referencia(agg: pd.DataFrame, pos: str) -> pd.DataFrame:
+    """
+    Ranking acumulado de una posición base entre los activos (como la tabla anual).
+    """
+    dfp = agg[(agg["activo"] == 1) & (agg["posicion"] == pos)].copy()
+    if dfp.empty:
+        return dfp
+    ranked = rank_puntos_referencia(dfp, use_arquero_ajustado=(pos == "arquero"))
+    if pos == "arquero":
+        ranked["valla_2d"] = pd.to_numeric(ranked["valla_promedio"], errors="coerce").round(2)
+    return ranked
+
+def puntos_por_fecha_referencia(df: pd.DataFrame) -> dict:
+    fechas_ordenadas = sorted(df["fecha"].unique(), reverse=True)
+    resumen_fecha = []
+    puntos_por_jugador_fecha = []
+
+    for fecha in fechas_ordenadas:
+        df_fecha = df[df["fecha"] == fecha].copy()
+        puntajes = df_fecha.groupby("jugador")["puntos"].sum().reset_index().sort_values(by="puntos", ascending=False)
+        resumen_fecha.append({"Fecha": fecha.date(), "Jugador de la Fecha": puntajes.iloc[0]["jugador"], "Puntos": puntajes.iloc[0]["puntos"]})
+        for _, row in puntajes.iterrows():
+            puntos_por_jugador_fecha.append({"Fecha": fecha.date(), "Jugador": row["jugador"], "Puntos": row["puntos"]})
+
+    df_resumen = pd.DataFrame(resumen_fecha)
+    df_evolutivo = pd.DataFrame(puntos_por_jugador_fecha)
+    df_acumulado = df_evolutivo.groupby("Jugador")["Puntos"].sum().reset_index().sort_values(by="Puntos", ascending=False).reset_index(drop=True)
+    df_acumulado.insert(0, "Posición", range(1, len(df_acumulado) + 1))
+    return {"resumen": df_resumen, "evolutivo": df_evolutivo, "acumulado": df_acumulado}
+
+def tipar_con_texto(eventos, columnas):
+    # Lo que hacía preparar_eventos antes: todo a texto, columna por columna
+    return {
+        c: pd.to_numeric(eventos[c].astype(str).str.replace(",", ".", regex=False).str.strip(), errors="coerce")
+        for c in columnas
+    }
+
+# =========================
+# Temporadas de prueba
+# =========================
+def temporada_aleatoria(semilla: int, n_partidos: int = 10, n_jugadores: int = 30) -> tuple:
+    """
+    Temporada sintética con las ramas difíciles mezcladas al azar: posición
+    jugada distinta de la base (arquero <-> campo, dos flags), tripletes,
+    tarjetas que cruzan los umbrales, partido_completado 0 / fraccionario /
+    vacío / con coma, partidos en la misma fecha, empates, resultados con
+    mayúsculas o vacíos, inactivos y sanción grave.
+    """
+    rng = np.random.default_rng(semilla)
+    j, p, e = sintetico.generar_temporada(n_partidos, n_jugadores, seed=semilla)
+    n = len(e)
+
+    cambia = rng.random(n) < 0.2
+    elegida = rng.integers(0, len(motor.FLAG_COLS), n)
+    for k, c in enumerate(motor.FLAG_COLS):
+        e[c] = np.where(cambia, (elegida == k).astype(int), e[c])
+    dos = np.flatnonzero(rng.random(n) < 0.03)
+    for i in dos:
+        e.loc[i, motor.FLAG_COLS[int(rng.integers(len(motor.FLAG_COLS)))]] = 1
+
+    tri = rng.random(n) < 0.06
+    e.loc[tri, "gol_primer"] += 2
+    e.loc[tri, "gol_segundo"] += 1
+    e.loc[rng.random(n) < 0.05, "penal_atajado"] = 1
+
+    for jid in rng.choice(e["id_jugador"].unique(), size=3, replace=False):
+        filas = e["id_jugador"] == jid
+        e.loc[filas, "amarillas"] = rng.integers(0, 3, filas.sum())
+    for jid in rng.choice(e["id_jugador"].unique(), size=2, replace=False):
+        filas = e["id_jugador"] == jid
+        e.loc[filas, "rojas"] = rng.integers(0, 2, filas.sum())
+
+    u = rng.random(n)
+    pc = e["partido_completado"].astype(object)
+    pc[u < 0.05] = 0.0
+    pc[(u >= 0.05) & (u < 0.10)] = 0.25
+    pc[(u >= 0.10) & (u < 0.13)] = None
+    pc[(u >= 0.13) & (u < 0.16)] = "0,5"
+    pc[(u >= 0.16) & (u < 0.18)] = " 1 "
+    e["partido_completado"] = pc
+
+    p["resultado_amarillo"] = p["resultado_amarillo"].astype(object)
+    p["resultado_azul"] = p["resultado_azul"].astype(object)
+    p["marcador_azul"] = p["marcador_azul"].astype(float)
+    for k in range(len(p)):
+        x = rng.random()
+        if k and x < 0.2:
+            p.loc[k, "fecha"] = p.loc[k - 1, "fecha"]
+        x = rng.random()
+        if x < 0.15:
+            p.loc[k, ["resultado_amarillo", "resultado_azul"]] = "e"
+        elif x < 0.25:
+            p.loc[k, "resultado_amarillo"] = f" {str(p.loc[k, 'resultado_amarillo']).upper()} "
+        elif x < 0.30:
+            p.loc[k, ["resultado_amarillo", "resultado_azul"]] = ""
+        if rng.random() < 0.05:
+            p.loc[k, "marcador_azul"] = np.nan
+
+    j["posicion"] = np.where(rng.random(len(j)) < 0.1, " " + j["posicion"].str.capitalize() + " ", j["posicion"])
+    j["activo"] = np.where(rng.random(len(j)) < 0.1, 0, j["activo"])
+    j.loc[int(rng.integers(len(j))), "sancion_grave"] = 1
+    return j, p, e
+
+def casos_borde() -> dict:
+    """
+    {nombre: (jugadores, partidos, eventos)} de temporadas chicas armadas a mano.
+    """
+    casos = {}
+
+    casos["un partido"] = sintetico.generar_temporada(1, 12, seed=1)
+
+    j, p, e = sintetico.generar_temporada(4, 16, seed=2)
+    p["fecha"] = p["fecha"].iloc[0]
+    casos["todos en la misma fecha"] = (j, p, e)
+
+    # Todos empatan en puntos: solo deciden los desempates
+    j, p, e = sintetico.generar_temporada(4, 16, seed=3)
+    for c in ["gol_primer", "gol_segundo", "gol_total", "asistencia_gol", "amarillas", "rojas", "autogoles", "penal_atajado", "gol_recibido"]:
+        e[c] = 0
+    e["partido_completado"] = 1.0
+    p[["resultado_amarillo", "resultado_azul"]] = "e"
+    p[["marcador_amarillo", "marcador_azul"]] = 0
+    casos["empates en puntos"] = (j, p, e)
+
+    # Justo en los umbrales de tarjetas y uno por debajo
+    j, p, e = sintetico.generar_temporada(10, 12, seed=4)
+    e[["amarillas", "rojas"]] = 0
+    ids = e["id_jugador"].unique()
+    for jid, col, veces in [(ids[0], "amarillas", 5), (ids[1], "amarillas", 10), (ids[2], "amarillas", 4),
+                            (ids[3], "rojas", 3), (ids[4], "rojas", 2), (ids[5], "rojas", 6)]:
+        filas = e.index[e["id_jugador"] == jid][:veces]
+        e.loc[filas, col] = 1
+    casos["umbrales exactos"] = (j, p, e)
+
+    # Arqueros de campo y jugadores de campo al arco, con tripletes
+    j, p, e = sintetico.generar_temporada(6, 12, seed=5)
+    base = e["id_jugador"].map(j.set_index("id_jugador")["posicion"])
+    arq = (base == "arquero").to_numpy()
+    e.loc[arq, motor.FLAG_COLS] = 0
+    e.loc[arq, "fue_defensa"] = 1
+    campo_al_arco = np.flatnonzero(~arq)[::5]
+    e.loc[campo_al_arco, motor.FLAG_COLS] = 0
+    e.loc[campo_al_arco, "fue_arquero"] = 1
+    e.loc[::3, ["gol_primer", "gol_segundo"]] = [2, 1]
+    casos["cambio de posición"] = (j, p, e)
+
+    # El mejor goleador con sanción grave (puntos_total = 0)
+    j, p, e = sintetico.generar_temporada(6, 12, seed=6)
+    goleador = e.groupby("id_jugador")["gol_total"].sum().idxmax()
+    j.loc[j["id_jugador"] == goleador, ["activo", "sancion_grave"]] = [1, 1]
+    casos["sanción grave"] = (j, p, e)
+
+    # Arqueros que nunca completaron minutos: valla_promedio vacía
+    j, p, e = sintetico.generar_temporada(6, 12, seed=7)
+    e.loc[e["fue_arquero"] == 1, "partido_completado"] = 0.0
+    casos["arquero sin minutos"] = (j, p, e)
+
+    j, p, e = sintetico.generar_temporada(3, 8, seed=8)
+    casos["sin eventos"] = (j, p, e.iloc[:0])
+
+    return casos
+
+def temporada_2025_aleatoria(semilla: int, n_fechas: int = 12, n_jugadores: int = 20) -> pd.DataFrame:
+    """
+    Filas con lo que usa puntos_por_fecha (fecha, jugador, puntos), con muchos empates.
+    """
+    rng = np.random.default_rng(semilla)
+    fechas = pd.Timestamp("2025-01-04") + pd.to_timedelta(7 * rng.integers(0, n_fechas, n_fechas * n_jugadores), unit="D")
+    return pd.DataFrame({
+        "fecha": fechas,
+        "jugador": [f"JUGADOR {i}" for i in rng.integers(1, n_jugadores + 1, len(fechas))],
+        "puntos": rng.integers(-2, 5, len(fechas)),
+    })
+
+# =========================
+# Comparación
+# =========================
+def diferencia(esperado: pd.DataFrame, obtenido: pd.DataFrame, columnas: list | None = None) -> str | None:
+    """
+    None si son iguales (floats con TOLERANCIA); si no, la primera línea útil del detalle.
+    """
+    if columnas is not None:
+        faltan = [c for c in columnas if c not in obtenido.columns]
+        if faltan:
+            return f"faltan columnas {faltan}"
+        esperado, obtenido = esperado[columnas], obtenido[columnas]
+    if len(esperado) == 0 and len(obtenido) == 0:
+        return None
+    try:
+        pd.testing.assert_frame_equal(
+            esperado.reset_index(drop=True), obtenido.reset_index(drop=True),
+            check_dtype=False, check_exact=False, rtol=TOLERANCIA, atol=TOLERANCIA,
+            check_index_type=False, check_column_type=False,
+        )
+    except AssertionError as err:
+        return " ".join(str(err).split())[:300]
+    return None
+
+class Registro:
+    """
+    Tiempos acumulados y fallas por comprobación.
+    """
+    def __init__(self):
+        self.casos = defaultdict(int)
+        self.tiempos = defaultdict(lambda: [0.0, 0.0])
+        self.fallas = []
+
+    def medir(self, comprobacion: str, lado: int, fn, *args):
+        t0 = time.perf_counter()
+        res = fn(*args)
+        self.tiempos[comprobacion][lado] += time.perf_counter() - t0
+        return res
+
+    def comparar(self, comprobacion: str, temporada: str, detalle: str | None):
+        self.casos[comprobacion] += 1
+        if detalle:
+            self.fallas.append((comprobacion, temporada, detalle))
+
+REF, OPT = 0, 1
+
+def _ids_ordenados(partidos: pd.DataFrame) -> list:
+    p = partidos.dropna(subset=["fecha"]).sort_values(["fecha", "id_partido"], kind="stable")
+    return [int(x) for x in p["id_partido"]]
+
+def _movimientos_referencia(a: dict, b: dict) -> pd.DataFrame:
+    filas = []
+    for pos in motor.POS_LIST:
+        antes = a[pos].set_index("id_jugador") if len(a[pos]) else pd.DataFrame(columns=["posicion_ranking", "puntos_total"])
+        for r in b[pos].itertuples(index=False):
+            nuevo = r.id_jugador not in antes.index
+            anterior = pd.NA if nuevo else int(antes.loc[r.id_jugador, "posicion_ranking"])
+            previos = 0.0 if nuevo else float(antes.loc[r.id_jugador, "puntos_total"])
+            filas.append((pos, int(r.id_jugador), r.posicion_ranking, anterior,
+                          pd.NA if nuevo else anterior - r.posicion_ranking, float(r.puntos_total) - previos, nuevo))
+    cols = ["posicion", "id_jugador", "posicion_ranking", "posicion_anterior", "cambio", "delta_puntos", "nuevo"]
+    return pd.DataFrame(filas, columns=cols).sort_values(["posicion", "id_jugador"]).reset_index(drop=True)
+
+def comparar_temporada(nombre: str, hojas: tuple, reg: Registro):
+    """
+    Corre la referencia y los caminos optimizados sobre una temporada y anota las diferencias.
+    """
+    datos_ref = motor.preparar_temporada(*(h.copy() for h in hojas))
+    datos = motor.preparar_temporada(*(h.copy() for h in hojas))
+
+    # Puntos por fila
+    base_ref = reg.medir("puntos por fila", REF, base_referencia, datos_ref)
+    base = reg.medir("puntos por fila", OPT, motor.construir_base, datos)
+    reg.comparar("puntos por fila", nombre, diferencia(base_ref, base, COLS_BASE))
+
+    # Acumulados a la fecha de cada partido, contra el almacén de snapshots ya construido
+    ids = _ids_ordenados(datos["partidos"])
+    res = planificador.ejecutar(planificador.grafo_2026("", ids=ids), previos={"2026/datos": datos, "2026/base": base})
+    store = res["2026/snapshots"]
+    fechas = datos_ref["partidos"].set_index("id_partido")["fecha"]
+    rankings_ref = {}
+    for pid in ids:
+        def referencia(pid=pid):
+            agg = acumulados_hasta_fecha_referencia(base_ref, fechas[pid].date())
+            return {pos: ranking_referencia(agg, pos) for pos in motor.POS_LIST}
+        rankings_ref[pid] = reg.medir("acumulados", REF, referencia)
+        tablas = reg.medir("acumulados", OPT, lambda pid=pid: {pos: snapshots.tabla(store, pid, "hasta", pos) for pos in motor.POS_LIST})
+        for pos in motor.POS_LIST:
+            cols = [c for c in snapshots.COLS_HASTA if c in tablas[pos].columns] or None
+            reg.comparar("acumulados", nombre, _con_contexto(diferencia(rankings_ref[pid][pos], tablas[pos], cols), f"partido {pid}, {pos}"))
+
+    # Movimientos entre partidos seguidos
+    for desde, hasta in zip(ids, ids[1:]):
+        esperado = reg.medir("movimientos", REF, _movimientos_referencia, rankings_ref[desde], rankings_ref[hasta])
+        mov = reg.medir("movimientos", OPT, snapshots.movimientos, store, desde, hasta)
+        mov = mov.sort_values(["posicion", "id_jugador"]).reset_index(drop=True)
+        reg.comparar("movimientos", nombre, _con_contexto(diferencia(esperado, mov, list(esperado.columns)), f"{desde} -> {hasta}"))
+
+    # Reglamento oficial en la formulación matricial, contra la tabla de fin de temporada
+    agg_ref = reg.medir("reglamento", REF, acumulados_referencia, base_ref)
+    finales = {pos: ranking_referencia(agg_ref, pos) for pos in motor.POS_LIST}
+    activos = res["2026/activos"].reset_index(drop=True)
+    def matricial():
+        puntos = reglas.puntuar(base, activos, [reglas.REGLAS_OFICIALES])
+        return puntos, reglas.rankings(activos, puntos)
+    puntos, puestos = reg.medir("reglamento", OPT, matricial)
+    obtenido = activos[["id_jugador", "posicion"]].assign(puntos_total=puntos[:, 0], posicion_ranking=puestos[:, 0])
+    esperado = pd.concat([t for t in finales.values() if len(t)] or [obtenido.iloc[:0]])
+    clave = ["posicion", "id_jugador"]
+    reg.comparar("reglamento", nombre, diferencia(
+        esperado.sort_values(clave).reset_index(drop=True), obtenido.sort_values(clave).reset_index(drop=True),
+        clave + ["puntos_total", "posicion_ranking"],
+    ))
+
+    # Tipado de los contadores con celdas de texto como las de una planilla
+    columnas = motor.INT_COLS + ["partido_completado"]
+    sucio = _ensuciar(hojas[2], columnas, len(ids))
+    esperado = reg.medir("tipado", REF, tipar_con_texto, sucio, columnas)
+    obtenido, _ = reg.medir("tipado", OPT, motor.tipar_numeros, sucio, columnas)
+    reg.comparar("tipado", nombre, diferencia(pd.DataFrame(esperado).astype(float), pd.DataFrame(obtenido)))
+
+def _con_contexto(detalle: str | None, contexto: str) -> str | None:
+    return f"{contexto}: {detalle}" if detalle else None
+
+def _ensuciar(eventos: pd.DataFrame, columnas: list, semilla: int) -> pd.DataFrame:
+    rng = np.random.default_rng(semilla)
+    sucio = eventos.copy()
+    for c in columnas:
+        col = sucio[c].astype(object)
+        u = rng.random(len(col))
+        col[u < 0.05] = [f" {v} ".replace(".", ",") for v in col[u < 0.05]]
+        col[(u >= 0.05) & (u < 0.07)] = ""
+        col[(u >= 0.07) & (u < 0.08)] = "x"
+        col[(u >= 0.08) & (u < 0.09)] = None
+        sucio[c] = col
+    return sucio
+
+def comparar_ingesta(nombre: str, hojas: tuple, tmp: str, reg: Registro):
+    """
+    Mitad de los partidos en el Excel y el resto como archivos del directorio de
+    eventos, incorporados de a uno; al final debe dar lo mismo que construir todo.
+    Tiempos: construir todo desde el Excel frente a incorporar el último partido.
+    """
+    j, p, e = hojas
+    pids = sorted(p["id_partido"])
+    corte = max(1, len(pids) // 2)
+    completo = sintetico.escribir_excel(os.path.join(tmp, "completo.xlsx"), j, p, e)
+    previo = sintetico.escribir_excel(os.path.join(tmp, "previo.xlsx"), j, p[p["id_partido"].isin(pids[:corte])],
+                                      e[e["id_partido"].isin(pids[:corte])])
+    directorio = os.path.join(tmp, f"eventos_{nombre.replace(' ', '_')}")
+    os.makedirs(directorio)
+
+    completa = reg.medir("ingesta", REF, lambda: planificador.ejecutar(planificador.grafo_2026(completo)))
+    t = ingesta.Temporada(previo, directorio, grafo=planificador.grafo_2026)
+    for k, pid in enumerate(pids[corte:], start=corte + 1):
+        p[p["id_partido"].isin(pids[corte:k])].to_csv(os.path.join(directorio, "partidos.csv"), index=False)
+        e[e["id_partido"] == pid].to_csv(os.path.join(directorio, f"partido_{pid}.csv"), index=False)
+        # Se mide lo que reemplaza a la reconstrucción: agregar el último partido
+        if k == len(pids):
+            reg.medir("ingesta", OPT, t.sincronizar)
+        else:
+            t.sincronizar()
+    if t.errores:
+        reg.comparar("ingesta", nombre, f"archivos rechazados: {t.errores}")
+        return
+    viva = t.resultados
+
+    for clave in ["2026/agg"] + [f"2026/anual/{pos}" for pos in motor.POS_LIST]:
+        a, b = completa[clave], viva[clave]
+        if "posicion_ranking" not in a.columns:
+            a, b = a.sort_values("id_jugador"), b.sort_values("id_jugador")
+        reg.comparar("ingesta", nombre, _con_contexto(diferencia(a, b, list(a.columns)), clave))
+
+    ra, rb = completa["2026/rating"]["rating"], viva["2026/rating"]["rating"]
+    iguales = ra.keys() == rb.keys() and np.allclose([ra[k] for k in ra], [rb[k] for k in ra], rtol=TOLERANCIA, atol=TOLERANCIA)
+    reg.comparar("ingesta", nombre, None if iguales else "2026/rating: ratings distintos")
+    iguales = completa["2026/rachas"]["jugadores"] == viva["2026/rachas"]["jugadores"]
+    reg.comparar("ingesta", nombre, None if iguales else "2026/rachas: récords distintos")
+
+    sa, sb = completa["2026/snapshots"], viva["2026/snapshots"]
+    if set(sa["tablas"]) != set(sb["tablas"]):
+        reg.comparar("ingesta", nombre, "2026/snapshots: distintas tablas")
+    for k in sa["tablas"]:
+        reg.comparar("ingesta", nombre, _con_contexto(
+            diferencia(snapshots.expandir(sa["tablas"][k]), snapshots.expandir(sb["tablas"].get(k))), f"snapshot {k}"))
+
+def comparar_2025(nombre: str, df: pd.DataFrame, reg: Registro):
+    esperado = reg.medir("2025 por fecha", REF, puntos_por_fecha_referencia, df)
+    obtenido = reg.medir("2025 por fecha", OPT, temporada_2025.puntos_por_fecha, df)
+    for k in esperado:
+        reg.comparar("2025 por fecha", nombre, _con_contexto(diferencia(esperado[k], obtenido[k]), k))
+
+# =========================
+# Informe / CLI
+# =========================
+def imprimir(reg: Registro, detalle: bool = False):
+    print(f"{'comprobación':<18}{'casos':>8}{'fallas':>8}{'referencia':>12}{'optimizado':>12}{'speedup':>9}")
+    fallas = defaultdict(int)
+    for comprobacion, _, _ in reg.fallas:
+        fallas[comprobacion] += 1
+    for comprobacion, n in reg.casos.items():
+        t_ref, t_opt = reg.tiempos[comprobacion]
+        speedup = t_ref / t_opt if t_opt > 0 else float("nan")
+        print(f"{comprobacion:<18}{n:>8}{fallas[comprobacion]:>8}{t_ref:>12.3f}{t_opt:>12.3f}{speedup:>9.2f}")
+
+    if reg.fallas:
+        print(f"\n{len(reg.fallas)} diferencia(s):")
+        for comprobacion, temporada, texto in reg.fallas if detalle else reg.fallas[:10]:
+            print(f"- [{comprobacion}] {temporada}: {texto}")
+        if not detalle and len(reg.fallas) > 10:
+            print(f"  ... (--detalle para ver las {len(reg.fallas)})")
+    else:
+        print("\nSin diferencias: los caminos optimizados dan lo mismo que la referencia.")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara los caminos optimizados con la referencia fila a fila.")
+    parser.add_argument("--aleatorias", type=int, default=10, help="Temporadas aleatorias (además de los casos borde).")
+    parser.add_argument("--partidos", type=int, default=10)
+    parser.add_argument("--jugadores", type=int, default=30)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--sin-ingesta", action="store_true", help="No comparar la ingesta incremental (escribe Excel, es lo más lento).")
+    parser.add_argument("--detalle", action="store_true", help="Mostrar todas las diferencias.")
+    args = parser.parse_args(argv)
+
+    reg = Registro()
+    temporadas = dict(casos_borde())
+    for s in range(args.semilla, args.semilla + args.aleatorias):
+        temporadas[f"aleatoria {s}"] = temporada_aleatoria(s, args.partidos, args.jugadores)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for nombre, hojas in temporadas.items():
+            comparar_temporada(nombre, hojas, reg)
+            if nombre.startswith("aleatoria") and not args.sin_ingesta:
+                comparar_ingesta(nombre, hojas, tmp, reg)
+    for s in range(args.semilla, args.semilla + args.aleatorias):
+        comparar_2025(f"aleatoria {s}", temporada_2025_aleatoria(s), reg)
+
+    print(f"{len(temporadas)} temporadas ({len(temporadas) - args.aleatorias} casos borde, {args.aleatorias} aleatorias)\n")
+    imprimir(reg, args.detalle)
+    return 1 if reg.fallas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+Planificador de construcción: modela las tablas de cada temporada como un
+grafo de dependencias y ejecuta los nodos independientes (temporadas,
+posiciones, snapshots por partido) en un pool de procesos (o de hilos,
+cuando los resultados se van mostrando a medida que terminan).
+
+Uso por línea de comandos (desde la raíz del repo):
+
+    python -m legendarios.planificador --workers 4 --salida precomputado.pkl
+"""
+import argparse
+import os
+import pickle
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from legendarios import asistencia, historial, motor, rachas, rating, snapshots, temporada_2025
+
+# =========================
+# Grafo
+# =========================
+@dataclass(frozen=True)
+class Nodo:
+    """
+    Un paso de construcción. `funcion` recibe primero los resultados de
+    `deps` (en orden) y luego `args`. Debe ser una función de módulo
+    para poder enviarse a otro proceso.
+    """
+    nombre: str
+    funcion: Callable[..., Any]
+    deps: tuple = ()
+    args: tuple = field(default=())
+
+def orden_topologico(nodos) -> list:
+    nodos = {n.nombre: n for n in nodos}
+    faltan = {d for n in nodos.values() for d in n.deps if d not in nodos}
+    if faltan:
+        raise ValueError(f"Dependencias inexistentes en el grafo: {sorted(faltan)}")
+
+    grado = {nombre: len(n.deps) for nombre, n in nodos.items()}
+    dependientes = defaultdict(list)
+    for n in nodos.values():
+        for d in n.deps:
+            dependientes[d].append(n.nombre)
+
+    listos = [nombre for nombre, g in grado.items() if g == 0]
+    orden = []
+    while listos:
+        nombre = listos.pop(0)
+        orden.append(nombre)
+        for dep in dependientes[nombre]:
+            grado[dep] -= 1
+            if grado[dep] == 0:
+                listos.append(dep)
+
+    if len(orden) != len(nodos):
+        ciclo = sorted(set(nodos) - set(orden))
+        raise ValueError(f"El grafo tiene ciclos entre: {ciclo}")
+    return orden
+
+def ejecutar(nodos, workers: int | None = None, previos: dict | None = None,
+             hilos: bool = False, avisar: Callable[[str, Any], None] | None = None) -> dict:
+    """
+    Ejecuta el grafo y devuelve {nombre_nodo: resultado}.
+    - workers None/0/1: secuencial en este proceso.
+    - workers > 1: cada nodo cuyas dependencias ya terminaron se envía al pool
+      (de procesos, o de hilos con `hilos=True`).
+    - previos: resultados ya conocidos (esos nodos no se recalculan).
+    - avisar(nombre, resultado): se llama con cada resultado apenas está
+      (primero los previos), para ir mostrando lo que ya terminó.
+    """
+    nodos = list(nodos)
+    orden = orden_topologico(nodos)
+    por_nombre = {n.nombre: n for n in nodos}
+    resultados = dict(previos or {})
+    if avisar is not None:
+        for nombre in orden:
+            if nombre in resultados:
+                avisar(nombre, resultados[nombre])
+
+    if not workers or workers <= 1:
+        for nombre in orden:
+            if nombre in resultados:
+                continue
+            n = por_nombre[nombre]
+            resultados[nombre] = n.funcion(*[resultados[d] for d in n.deps], *n.args)
+            if avisar is not None:
+                avisar(nombre, resultados[nombre])
+        return resultados
+
+    pendientes = {
+        nombre: {d for d in por_nombre[nombre].deps if d not in resultados}
+        for nombre in orden if nombre not in resultados
+    }
+    dependientes = defaultdict(list)
+    for n in nodos:
+        for d in n.deps:
+            dependientes[d].append(n.nombre)
+
+    en_curso = {}
+    pool_cls = ThreadPoolExecutor if hilos else ProcessPoolExecutor
+    with pool_cls(max_workers=workers) as pool:
+        def lanzar(nombre):
+            n = por_nombre[nombre]
+            fut = pool.submit(n.funcion, *[resultados[d] for d in n.deps], *n.args)
+            en_curso[fut] = nombre
+            del pendientes[nombre]
+
+        for nombre in [nombre for nombre, faltan in pendientes.items() if not faltan]:
+            lanzar(nombre)
+
+        while en_curso:
+            hechos, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for fut in hechos:
+                nombre = en_curso.pop(fut)
+                resultados[nombre] = fut.result()
+                if avisar is not None:
+                    avisar(nombre, resultados[nombre])
+                for dep in dependientes[nombre]:
+                    if dep in pendientes:
+                        pendientes[dep].discard(nombre)
+                        if not pendientes[dep]:
+                            lanzar(dep)
+
+    return resultados
+
+# =========================
+# Grafos por temporada
+# =========================
+def grafo_2026(path: str = motor.DATA_FILE, prefijo: str = "2026", ids: list | None = None) -> list:
+    """
+    Nodos de la temporada vigente:
+    datos -> base -> agg -> (rankings anuales, generales, valla, regularidad)
+    base -> ranking de la última fecha por posición
+    base -> snapshot de cada partido (día + acumulado) -> almacén de snapshots
+    base -> rating Elo y récords / rachas (partido a partido)
+    datos -> matriz de asistencia jugador x partido
+    `ids`: id_partido de los snapshots (por defecto se leen de la hoja Partidos).
+    """
+    p = lambda s: f"{prefijo}/{s}"
+    nodos = [
+        Nodo(p("datos"), motor.cargar_temporada, args=(path,)),
+        Nodo(p("base"), motor.construir_base, deps=(p("datos"),)),
+        Nodo(p("agg"), motor.acumulados, deps=(p("base"),)),
+        Nodo(p("activos"), motor.activos, deps=(p("agg"),)),
+        Nodo(p("valla"), motor.ranking_valla, deps=(p("activos"),)),
+        Nodo(p("regularidad"), motor.indice_regularidad, deps=(p("activos"),)),
+        Nodo(p("rating"), rating.calcular, deps=(p("base"),)),
+        Nodo(p("rachas"), rachas.calcular, deps=(p("base"),)),
+        Nodo(p("asistencia"), asistencia.construir, deps=(p("datos"),)),
+    ]
+    for pos in motor.POS_LIST:
+        nodos.append(Nodo(p(f"dia/{pos}"), motor.ranking_ultima_fecha, deps=(p("datos"), p("base")), args=(pos,)))
+        nodos.append(Nodo(p(f"anual/{pos}"), motor.ranking_acumulado_pos, deps=(p("activos"),), args=(pos,)))
+    for col in motor.STATS_GENERALES:
+        nodos.append(Nodo(p(f"general/{col}"), motor.ranking_estadistica, deps=(p("activos"),), args=(col,)))
+    ids = motor.ids_partidos(path) if ids is None else ids
+    for pid in ids:
+        nodos.append(Nodo(p(f"partido/{pid}"), motor.snapshot_partido, deps=(p("datos"), p("base")), args=(pid,)))
+    nodos.append(Nodo(p("snapshots"), snapshots.construir_store, deps=(p("datos"),) + tuple(p(f"partido/{pid}") for pid in ids)))
+    return nodos
+
+def grafo_2025(path: str = temporada_2025.DATA_FILE, prefijo: str = "2025") -> list:
+    p = lambda s: f"{prefijo}/{s}"
+    nodos = [
+        Nodo(p("datos"), temporada_2025.cargar_temporada, args=(path,)),
+        Nodo(p("penales"), temporada_2025.ranking_penales, deps=(p("datos"),)),
+        Nodo(p("valla"), temporada_2025.ranking_valla, deps=(p("datos"),)),
+        Nodo(p("puntos"), temporada_2025.puntos_por_fecha, deps=(p("datos"),)),
+        Nodo(p("top3"), temporada_2025.top3_ultima_fecha, deps=(p("datos"),)),
+        Nodo(p("resumen_goles"), temporada_2025.resumen_goles_por_fecha, deps=(p("datos"),)),
+        Nodo(p("total_goles"), temporada_2025.total_goles_equipo, deps=(p("datos"),)),
+    ]
+    for col, _ in temporada_2025.ESTADISTICAS:
+        nodos.append(Nodo(p(f"stat/{col}"), temporada_2025.ranking_estadistica, deps=(p("datos"),), args=(col,)))
+    for col in ["tarjetas_amarillas", "tarjetas_rojas", "puntos"]:
+        nodos.append(Nodo(p(f"equipo/{col}"), temporada_2025.suma_por_equipo, deps=(p("datos"),), args=(col,)))
+
+    menciones_deps = tuple(p(f"stat/{col}") for col, _ in temporada_2025.ESTADISTICAS) + (p("valla"), p("penales"))
+    nodos.append(Nodo(p("menciones"), temporada_2025.conteo_menciones, deps=menciones_deps))
+    nodos.append(Nodo(p("acumulado"), _acumulado_2025, deps=(p("puntos"),)))
+    nodos.append(Nodo(p("mvp"), temporada_2025.ranking_mvp, deps=(p("acumulado"), p("menciones"))))
+    return nodos
+
+def _acumulado_2025(puntos: dict):
+    return puntos["acumulado"]
+
+def grafo_historial(con_2025: bool = True) -> list:
+    """
+    Historial por jugador entre temporadas (depende de los nodos de 2025 y 2026);
+    sin `con_2025`, solo con la temporada 2026.
+    """
+    if not con_2025:
+        return [
+            Nodo("historial/2026", historial.filas_2026, deps=("2026/base",)),
+            Nodo("historial", historial.construir_timeline, deps=("historial/2026",)),
+        ]
+    return [
+        Nodo("historial/2026", historial.filas_2026, deps=("2026/base",)),
+        Nodo("historial/2025", historial.filas_2025, deps=("2025/datos", "2026/datos")),
+        Nodo("historial", historial.construir_timeline, deps=("historial/2025", "historial/2026")),
+    ]
+
+def grafo_historial_2025(path: str = motor.DATA_FILE) -> list:
+    """
+    Historial para la página 2025: solo las filas de 2025, con los ids resueltos
+    contra la hoja Jugadores de 2026 (sin construir ni puntuar la temporada 2026).
+    """
+    return [
+        Nodo("2026/jugadores", historial.jugadores_2026, args=(path,)),
+        Nodo("historial/2025", historial.filas_2025, deps=("2025/datos", "2026/jugadores")),
+        Nodo("historial", historial.construir_timeline, deps=("historial/2025",)),
+    ]
+
+def grafo_completo() -> list:
+    return grafo_2026() + grafo_2025() + grafo_historial()
+
+def grafo_app_2026(path: str = motor.DATA_FILE, ids: list | None = None,
+                   historial_2025: str | None = temporada_2025.DATA_FILE) -> list:
+    """
+    Lo que necesita 2026/app.py: toda la temporada 2026 más el historial
+    entre temporadas (de 2025, leído de `historial_2025`, solo se carga lo
+    necesario). Sin `historial_2025` el historial es solo de 2026.
+    """
+    nodos_2026 = grafo_2026(path, ids=ids)
+    if historial_2025 is None:
+        nodos = nodos_2026 + grafo_historial(con_2025=False)
+    else:
+        nodos = nodos_2026 + grafo_2025(historial_2025) + grafo_historial()
+    return subgrafo(nodos, [n.nombre for n in nodos_2026] + ["historial"])
+
+def subgrafo(nodos, objetivos) -> list:
+    """
+    Solo los nodos necesarios para construir `objetivos` (ellos y sus ancestros).
+    """
+    por_nombre = {n.nombre: n for n in nodos}
+    necesarios, pila = set(), list(objetivos)
+    while pila:
+        nombre = pila.pop()
+        if nombre in necesarios:
+            continue
+        necesarios.add(nombre)
+        pila.extend(por_nombre[nombre].deps)
+    return [n for n in nodos if n.nombre in necesarios]
+
+def descendientes(nodos, raices) -> set:
+    """
+    Nodos que dependen (directa o indirectamente) de `raices`, sin incluirlas.
+    """
+    dependientes = defaultdict(list)
+    for n in nodos:
+        for d in n.deps:
+            dependientes[d].append(n.nombre)
+    vistos, pila = set(), [d for r in raices for d in dependientes[r]]
+    while pila:
+        nombre = pila.pop()
+        if nombre in vistos:
+            continue
+        vistos.add(nombre)
+        pila.extend(dependientes[nombre])
+    return vistos
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Construye todas las tablas y snapshots de las temporadas.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Procesos del pool (1 = secuencial).")
+    parser.add_argument("--salida", help="Ruta del artefacto precomputado (pickle).")
+    parser.add_argument("--snapshots", help="Ruta donde guardar solo el almacén de snapshots de 2026.")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    nodos = grafo_completo()
+    resultados = ejecutar(nodos, workers=args.workers)
+    dt = time.perf_counter() - t0
+    print(f"{len(nodos)} nodos construidos en {dt:.2f}s con {args.workers} worker(s)")
+
+    if args.salida:
+        with open(args.salida, "wb") as f:
+            pickle.dump(resultados, f)
+        print(f"Artefacto guardado en {args.salida}")
+
+    if args.snapshots:
+        snapshots.guardar(resultados["2026/snapshots"], args.snapshots)
+        print(f"Snapshots guardados en {args.snapshots}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Récords y rachas por jugador, calculados partido a partido.
+
+En una sola pasada por los partidos en orden (fecha, id_partido) se lleva,
+por jugador, la racha vigente y la mejor de cada tipo (RACHAS), más su
+mejor puntos_partido en un solo partido. Un partido solo cuenta para las
+rachas que le corresponden: la valla invicta solo si atajó (posición
+jugada arquero) y el invicto con amarillo / azul solo si jugó para ese
+equipo y el partido tiene resultado; los demás partidos no la cortan.
+
+Igual que legendarios/rating.py (mismo recorrido, legendarios/recorrido.py),
+el estado guarda por partido cómo estaba cada participante antes de jugarlo,
+así que:
+- agregar un partido posterior cuesta O(participantes);
+- si llega un partido anterior (o se corrige uno), se deshacen solo los
+  partidos desde ese punto y se vuelven a aplicar.
+"""
+import numpy as np
+import pandas as pd
+
+from legendarios import recorrido
+
+# racha -> título en la página
+RACHAS = {
+    "gol": "Partidos seguidos con gol",
+    "valla": "Vallas invictas seguidas (arquero)",
+    "invicto_amarillo": "Partidos sin perder con amarillo",
+    "invicto_azul": "Partidos sin perder con azul",
+}
+
+SIN_PERDER = {"g", "e"}
+
+# =========================
+# Estado
+# =========================
+def nuevo_estado() -> dict:
+    """
+    {"jugadores": {id_jugador: registro}, "partidos": [dict por partido en orden]}.
+    Cada partido: id_partido, fecha, ids y antes (registro de cada participante
+    antes del partido; None si era su primer partido).
+    """
+    return {"jugadores": {}, "partidos": []}
+
+def _registro_vacio() -> dict:
+    r = {"mejor_puntos": None, "mejor_puntos_partido": None}
+    for racha in RACHAS:
+        r.update({f"{racha}_actual": 0, f"{racha}_desde": None,
+                  f"{racha}_mejor": 0, f"{racha}_mejor_desde": None, f"{racha}_mejor_hasta": None})
+    return r
+
+def _avanzar(r: dict, racha: str, sigue, pid: int):
+    # sigue: True alarga la racha, False la corta, None (el partido no cuenta) la deja igual
+    if sigue is None:
+        return
+    if not sigue:
+        r[f"{racha}_actual"], r[f"{racha}_desde"] = 0, None
+        return
+    if r[f"{racha}_actual"] == 0:
+        r[f"{racha}_desde"] = pid
+    r[f"{racha}_actual"] += 1
+    # Con empate queda la primera vez que se llegó
+    if r[f"{racha}_actual"] > r[f"{racha}_mejor"]:
+        r[f"{racha}_mejor"] = r[f"{racha}_actual"]
+        r[f"{racha}_mejor_desde"], r[f"{racha}_mejor_hasta"] = r[f"{racha}_desde"], pid
+
+def procesar_partido(estado: dict, filas: pd.DataFrame) -> dict | None:
+    """
+    Aplica un partido (filas de la base de ese id_partido) sobre el estado.
+    Devuelve el registro agregado, o None si el partido no tiene fecha.
+    """
+    if pd.isna(filas["fecha"].iloc[0]):
+        return None
+    pid = int(filas["id_partido"].iloc[0])
+
+    ids = filas["id_jugador"].to_numpy(dtype=int)
+    equipo = filas["equipo"].to_numpy()
+    resultado = np.where(equipo == "amarillo", filas["resultado_amarillo"].astype(str).str.strip().str.lower(),
+                         filas["resultado_azul"].astype(str).str.strip().str.lower())
+    con_resultado = np.isin(resultado, ["g", "e", "p"])
+    sin_perder = np.isin(resultado, list(SIN_PERDER))
+    con_gol = filas["gol_total"].to_numpy(dtype=int) > 0
+    arquero = (filas["posicion_jugada"] == "arquero").to_numpy()
+    valla = filas["valla_invicta_equipo"].to_numpy(dtype=int) == 1
+    puntos = pd.to_numeric(filas["puntos_partido"], errors="coerce").fillna(0.0).to_numpy(dtype=float)
+
+    antes = []
+    for k, i in enumerate(ids.tolist()):
+        # El registro previo no se toca (lo guarda `antes` y puede seguir en un estado anterior)
+        previo = estado["jugadores"].get(i)
+        antes.append(previo)
+        r = _registro_vacio() if previo is None else dict(previo)
+        estado["jugadores"][i] = r
+
+        _avanzar(r, "gol", bool(con_gol[k]), pid)
+        _avanzar(r, "valla", bool(valla[k]) if arquero[k] else None, pid)
+        for eq in ("amarillo", "azul"):
+            cuenta = equipo[k] == eq and con_resultado[k]
+            _avanzar(r, f"invicto_{eq}", bool(sin_perder[k]) if cuenta else None, pid)
+
+        if r["mejor_puntos"] is None or puntos[k] > r["mejor_puntos"]:
+            r["mejor_puntos"], r["mejor_puntos_partido"] = float(puntos[k]), pid
+
+    registro = {"id_partido": pid, "fecha": pd.Timestamp(filas["fecha"].iloc[0]), "ids": ids, "antes": antes}
+    estado["partidos"].append(registro)
+    return registro
+
+def _deshacer(estado: dict, desde: int):
+    """
+    Quita los partidos desde la posición `desde` (en orden inverso restaura los registros previos).
+    """
+    for p in reversed(estado["partidos"][desde:]):
+        for i, previo in zip(reversed(p["ids"].tolist()), reversed(p["antes"])):
+            if previo is None:
+                estado["jugadores"].pop(i, None)
+            else:
+                estado["jugadores"][i] = previo
+    del estado["partidos"][desde:]
+
+# =========================
+# Construcción (ver legendarios/recorrido.py)
+# =========================
+COLUMNAS = ["id_partido", "id_jugador", "fecha", "equipo", "resultado_amarillo", "resultado_azul",
+            "gol_total", "posicion_jugada", "valla_invicta_equipo", "puntos_partido"]
+
+def calcular(base: pd.DataFrame) -> dict:
+    """
+    Recorre toda la temporada en orden y devuelve el estado.
+    """
+    return recorrido.calcular(base, nuevo_estado(), procesar_partido, COLUMNAS)
+
+def actualizar(estado: dict, base: pd.DataFrame, afectados) -> dict:
+    """
+    Nuevo estado tras agregar / reemplazar los partidos `afectados` de la base.
+    """
+    return recorrido.actualizar(estado, base, afectados, procesar_partido, _deshacer, COLUMNAS)
+
+# =========================
+# Consulta
+# =========================
+def _fechas(estado: dict) -> dict:
+    return {p["id_partido"]: p["fecha"] for p in estado["partidos"]}
+
+def tabla(estado: dict, jugadores: pd.DataFrame, racha: str) -> pd.DataFrame:
+    """
+    Mejor racha `racha` de cada jugador que la tuvo, de mayor a menor, con
+    las fechas en que empezó y terminó y la racha vigente.
+    """
+    columnas = ["posicion_ranking", "id_jugador", "nombre", "mejor", "desde", "hasta", "actual"]
+    filas = [
+        (i, r[f"{racha}_mejor"], r[f"{racha}_mejor_desde"], r[f"{racha}_mejor_hasta"], r[f"{racha}_actual"])
+        for i, r in estado["jugadores"].items() if r[f"{racha}_mejor"] > 0
+    ]
+    if not filas:
+        return pd.DataFrame(columns=columnas)
+
+    fechas = _fechas(estado)
+    t = pd.DataFrame(filas, columns=["id_jugador", "mejor", "desde", "hasta", "actual"])
+    t["desde"] = t["desde"].map(fechas).dt.date
+    t["hasta"] = t["hasta"].map(fechas).dt.date
+    t = t.merge(jugadores[["id_jugador", "nombre"]].drop_duplicates("id_jugador"), on="id_jugador", how="left")
+    t = t.sort_values(["mejor", "hasta", "actual"], ascending=[False, True, False], kind="stable").reset_index(drop=True)
+    t.insert(0, "posicion_ranking", range(1, len(t) + 1))
+    return t[columnas]
+
+def mejores_partidos(estado: dict, jugadores: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mejor puntos_partido de cada jugador en un solo partido, de mayor a menor.
+    """
+    columnas = ["posicion_ranking", "id_jugador", "nombre", "puntos_partido", "fecha", "id_partido"]
+    filas = [(i, r["mejor_puntos"], r["mejor_puntos_partido"]) for i, r in estado["jugadores"].items()]
+    if not filas:
+        return pd.DataFrame(columns=columnas)
+
+    t = pd.DataFrame(filas, columns=["id_jugador", "puntos_partido", "id_partido"])
+    t["fecha"] = t["id_partido"].map(_fechas(estado)).dt.date
+    t = t.merge(jugadores[["id_jugador", "nombre"]].drop_duplicates("id_jugador"), on="id_jugador", how="left")
+    t = t.sort_values(["puntos_partido", "fecha"], ascending=[False, True], kind="stable").reset_index(drop=True)
+    t.insert(0, "posicion_ranking", range(1, len(t) + 1))
+    return t[columnas]
@@ -0,0 +1,153 @@
+"""
+Rating por jugador estilo Elo, calculado partido a partido.
+
+A diferencia de los puntos (aditivos), el rating tiene en cuenta la fuerza
+del rival: en cada partido se compara el rating promedio de cada equipo
+(ponderado por partido_completado), se calcula el resultado esperado y
+cada participante se mueve K * partido_completado * (resultado - esperado).
+
+Los partidos se procesan en orden (fecha, id_partido). El estado guarda,
+por partido, el rating antes y después de cada participante, así que:
+- agregar un partido posterior cuesta O(participantes);
+- si llega un partido anterior (o se corrige uno), se deshacen solo los
+  partidos desde ese punto y se vuelven a aplicar.
+"""
+import numpy as np
+import pandas as pd
+
+from legendarios import recorrido
+
+RATING_INICIAL = 1500.0
+K = 24.0
+
+RESULTADO = {"g": 1.0, "e": 0.5, "p": 0.0}
+
+# =========================
+# Estado
+# =========================
+def nuevo_estado() -> dict:
+    """
+    {"rating": {id_jugador: rating}, "partidos": [dict por partido en orden]}.
+    Cada partido: id_partido, fecha, ids, equipo, antes, despues (arrays alineados).
+    """
+    return {"rating": {}, "partidos": []}
+
+def procesar_partido(estado: dict, filas: pd.DataFrame) -> dict | None:
+    """
+    Aplica un partido (filas de la base de ese id_partido) sobre el estado.
+    Devuelve el registro agregado, o None si el partido no tiene resultado.
+    """
+    r_am = RESULTADO.get(str(filas["resultado_amarillo"].iloc[0]).strip().lower())
+    if r_am is None or pd.isna(filas["fecha"].iloc[0]):
+        return None
+
+    ids = filas["id_jugador"].to_numpy(dtype=int)
+    equipo = filas["equipo"].to_numpy()
+    w = filas["partido_completado"].to_numpy(dtype=float)
+    antes = np.array([estado["rating"].get(i, RATING_INICIAL) for i in ids])
+
+    am = equipo == "amarillo"
+    az = equipo == "azul"
+    if not am.any() or not az.any():
+        return None
+
+    def promedio(m):
+        return np.average(antes[m], weights=w[m]) if w[m].sum() > 0 else antes[m].mean()
+
+    esperado_am = 1.0 / (1.0 + 10 ** ((promedio(az) - promedio(am)) / 400.0))
+    real = np.where(am, r_am, 1.0 - r_am)
+    esperado = np.where(am, esperado_am, 1.0 - esperado_am)
+    despues = antes + K * w * (real - esperado)
+
+    for i, r in zip(ids, despues):
+        estado["rating"][int(i)] = float(r)
+
+    registro = {
+        "id_partido": int(filas["id_partido"].iloc[0]),
+        "fecha": pd.Timestamp(filas["fecha"].iloc[0]),
+        "ids": ids, "equipo": equipo, "antes": antes, "despues": despues,
+    }
+    estado["partidos"].append(registro)
+    return registro
+
+def _deshacer(estado: dict, desde: int):
+    """
+    Quita los partidos desde la posición `desde` (en orden inverso restaura los ratings previos).
+    """
+    for p in reversed(estado["partidos"][desde:]):
+        for i, r in zip(p["ids"], p["antes"]):
+            estado["rating"][int(i)] = float(r)
+    del estado["partidos"][desde:]
+
+# =========================
+# Construcción (ver legendarios/recorrido.py)
+# =========================
+COLUMNAS = ["id_partido", "id_jugador", "fecha", "equipo", "partido_completado", "resultado_amarillo"]
+
+def calcular(base: pd.DataFrame) -> dict:
+    """
+    Recorre toda la temporada en orden y devuelve el estado.
+    """
+    return recorrido.calcular(base, nuevo_estado(), procesar_partido, COLUMNAS)
+
+def actualizar(estado: dict, base: pd.DataFrame, afectados) -> dict:
+    """
+    Nuevo estado tras agregar / reemplazar los partidos `afectados` de la base.
+    """
+    return recorrido.actualizar(estado, base, afectados, procesar_partido, _deshacer, COLUMNAS)
+
+# =========================
+# Consulta
+# =========================
+def tabla(estado: dict, jugadores: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rating actual de cada jugador con partidos, ordenado de mayor a menor.
+    """
+    if not estado["partidos"]:
+        return pd.DataFrame(columns=["posicion_ranking", "id_jugador", "nombre", "rating", "partidos", "ultimo_cambio"])
+
+    ids = np.concatenate([p["ids"] for p in estado["partidos"]])
+    cambios = np.concatenate([p["despues"] - p["antes"] for p in estado["partidos"]])
+    h = pd.DataFrame({"id_jugador": ids, "cambio": cambios})
+    g = h.groupby("id_jugador").agg(partidos=("cambio", "size"), ultimo_cambio=("cambio", "last")).reset_index()
+    g["rating"] = g["id_jugador"].map(estado["rating"])
+
+    t = g.merge(jugadores[["id_jugador", "nombre"]], on="id_jugador", how="left")
+    t = t.sort_values(["rating", "partidos"], ascending=[False, False]).reset_index(drop=True)
+    t.insert(0, "posicion_ranking", range(1, len(t) + 1))
+    return t[["posicion_ranking", "id_jugador", "nombre", "rating", "partidos", "ultimo_cambio"]]
+
+def historia(estado: dict, id_jugador: int) -> pd.DataFrame:
+    """
+    Rating de un jugador después de cada partido que jugó.
+    """
+    filas = []
+    for p in estado["partidos"]:
+        k = np.flatnonzero(p["ids"] == id_jugador)
+        if len(k):
+            filas.append((p["fecha"], p["id_partido"], float(p["antes"][k[0]]), float(p["despues"][k[0]])))
+    return pd.DataFrame(filas, columns=["fecha", "id_partido", "rating_antes", "rating"])
+
+def ratings_hasta(estado: dict, id_partido: int) -> dict:
+    """
+    {id_jugador: rating} justo después de `id_partido` (snapshot de ese partido).
+    """
+    ratings = {}
+    for p in estado["partidos"]:
+        ratings.update(zip(p["ids"].tolist(), p["despues"].tolist()))
+        if p["id_partido"] == id_partido:
+            break
+    return ratings
+
+def partido(estado: dict, id_partido: int, jugadores: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cambio de rating de cada participante de un partido.
+    """
+    p = next((p for p in estado["partidos"] if p["id_partido"] == id_partido), None)
+    if p is None:
+        return pd.DataFrame(columns=["nombre", "equipo", "rating_antes", "rating", "cambio"])
+
+    t = pd.DataFrame({"id_jugador": p["ids"], "equipo": p["equipo"], "rating_antes": p["antes"], "rating": p["despues"]})
+    t["cambio"] = t["rating"] - t["rating_antes"]
+    t = t.merge(jugadores[["id_jugador", "nombre"]], on="id_jugador", how="left")
+    return t.sort_values("cambio", ascending=False).reset_index(drop=True)[["nombre", "equipo", "rating_antes", "rating", "cambio"]]
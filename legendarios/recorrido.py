@@ -0,0 +1,55 @@
+"""
+Recorrido partido a partido con estado incremental (lo usan rating y rachas).
+
+Cada motor define su estado ({"partidos": [registro por partido en orden],
+más sus propios dicts}), `procesar_partido(estado, filas)` que aplica un
+partido y agrega su registro (con id_partido y fecha) y `deshacer(estado,
+desde)` que quita los partidos desde esa posición restaurando lo previo.
+Con eso, acá se resuelve para todos:
+- construir la temporada completa en orden (fecha, id_partido);
+- actualizar tras agregar / reemplazar partidos: se deshacen solo los
+  partidos desde el primero afectado y se vuelven a aplicar; si son
+  posteriores a todo lo procesado, el costo es O(participantes).
+"""
+import pandas as pd
+
+def clave(p: dict) -> tuple:
+    return (p["fecha"], p["id_partido"])
+
+def por_partido(base: pd.DataFrame, columnas: list):
+    b = base[columnas].dropna(subset=["fecha"]).sort_values(["fecha", "id_partido"], kind="stable")
+    return b.groupby(["fecha", "id_partido"], sort=False)
+
+def calcular(base: pd.DataFrame, estado: dict, procesar_partido, columnas: list) -> dict:
+    """
+    Aplica toda la temporada en orden sobre `estado` (uno nuevo) y lo devuelve.
+    """
+    if base.empty:
+        return estado
+    for _, filas in por_partido(base, columnas):
+        procesar_partido(estado, filas)
+    return estado
+
+def actualizar(estado: dict, base: pd.DataFrame, afectados, procesar_partido, deshacer, columnas: list) -> dict:
+    """
+    Nuevo estado tras agregar / reemplazar los partidos `afectados` de la base.
+    El anterior no se modifica (puede seguir en uso): se copian sus
+    contenedores y procesar_partido / deshacer reemplazan entradas, no las mutan.
+    """
+    afectados = set(afectados)
+    nuevo = {k: v.copy() for k, v in estado.items()}
+
+    b = base[base["id_partido"].isin(afectados)]
+    claves = [(pd.Timestamp(f), int(p)) for f, p in b[["fecha", "id_partido"]].dropna().drop_duplicates().itertuples(index=False)]
+    claves += [clave(p) for p in nuevo["partidos"] if p["id_partido"] in afectados]
+    if not claves:
+        return nuevo
+
+    desde_clave = min(claves)
+    desde = next((k for k, p in enumerate(nuevo["partidos"]) if clave(p) >= desde_clave), len(nuevo["partidos"]))
+    rehacer = {p["id_partido"] for p in nuevo["partidos"][desde:]} | afectados
+    deshacer(nuevo, desde)
+
+    for _, filas in por_partido(base[base["id_partido"].isin(rehacer)], columnas):
+        procesar_partido(nuevo, filas)
+    return nuevo
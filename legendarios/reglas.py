@@ -0,0 +1,285 @@
+"""
+Reglas de puntaje declarativas y simulador "qué pasaría si".
+
+REGLAS_OFICIALES es el reglamento con el que puntúa motor, como un dict
+plano de pesos: puntos_por_fila da los puntos por partido de
+motor.construir_base y penal_umbrales los umbrales de tarjetas de
+motor.acumulados. Un reglamento alternativo es el mismo dict con algunos
+valores cambiados.
+
+Para simular se arma una sola vez una matriz de rasgos por fila de la
+base (victoria, gol jugando de defensa, valla invicta de arquero, ...):
+los puntos de R reglamentos salen de un producto matricial
+(filas x rasgos) @ (rasgos x R), se suman por jugador y se rankean por
+posición igual que la tabla oficial, todo sin recorrer filas.
+"""
+import itertools
+import json
+
+import numpy as np
+import pandas as pd
+
+from legendarios import motor
+
+# =========================
+# Reglamento
+# =========================
+REGLAS_OFICIALES = {
+    # Resultado del equipo (se prorratea por partido_completado)
+    "resultado_g": 3, "resultado_e": 1, "resultado_p": 0,
+
+    # Por POSICIÓN JUGADA (se prorratea); "_cambio" = jugó fuera de su posición base
+    "valla_arquero": 3, "valla_defensa": 3, "valla_mediocampista": 0, "valla_delantero": 0,
+    "penal_atajado_arquero": 3, "penal_atajado_defensa": 0, "penal_atajado_mediocampista": 0, "penal_atajado_delantero": 0,
+    "gol_arquero": 3, "gol_arquero_cambio": 0,
+    "gol_defensa": 3, "gol_defensa_cambio": 0,
+    "gol_mediocampista": 0, "gol_mediocampista_cambio": 0,
+    "gol_delantero": 0, "gol_delantero_cambio": 0,
+    "asistencia_arquero": 1, "asistencia_defensa": 1, "asistencia_mediocampista": 1, "asistencia_delantero": 1,
+    "bonus_3_goles_arquero": 0, "bonus_3_goles_arquero_cambio": 1,
+    "bonus_3_goles_defensa": 1, "bonus_3_goles_defensa_cambio": 1,
+    "bonus_3_goles_mediocampista": 1, "bonus_3_goles_mediocampista_cambio": 1,
+    "bonus_3_goles_delantero": 1, "bonus_3_goles_delantero_cambio": 1,
+
+    # Por partido, sin prorrateo
+    "amarilla": -1, "roja": -3, "autogol": -1,
+
+    # Umbrales sobre el acumulado de la temporada (cada N tarjetas)
+    "umbral_amarillas_cada": 5, "umbral_amarillas_puntos": -3,
+    "umbral_rojas_cada": 3, "umbral_rojas_puntos": -5,
+}
+
+# Reglamentos propuestos por el comité (opcional), ver cargar()
+CANDIDATOS_FILE = "2026/reglas_candidatas.json"
+
+PRORRATEADOS = [k for k in REGLAS_OFICIALES if k.startswith(("resultado_", "valla_", "penal_atajado_", "gol_", "asistencia_", "bonus_"))]
+POR_PARTIDO = ["amarilla", "roja", "autogol"]
+
+# Perillas del simulador: nombre -> claves que toman el mismo valor
+PERILLAS = {
+    "victoria": ["resultado_g"],
+    "empate": ["resultado_e"],
+    "gol (arquero/defensa)": ["gol_arquero", "gol_defensa"],
+    "gol (medio/delantero)": ["gol_mediocampista", "gol_delantero", "gol_mediocampista_cambio", "gol_delantero_cambio"],
+    "valla invicta (arquero/defensa)": ["valla_arquero", "valla_defensa"],
+    "penal atajado": ["penal_atajado_arquero"],
+    "asistencia": [f"asistencia_{p}" for p in motor.POS_LIST],
+    "amarilla": ["amarilla"],
+    "roja": ["roja"],
+    "autogol": ["autogol"],
+}
+
+def con_cambios(cambios: dict, reglas: dict | None = None) -> dict:
+    """
+    Copia de `reglas` (por defecto las oficiales) con `cambios` aplicados.
+    Acepta claves del reglamento o nombres de PERILLAS.
+    """
+    nuevas = dict(reglas or REGLAS_OFICIALES)
+    for k, v in cambios.items():
+        claves = PERILLAS.get(k, [k])
+        for c in claves:
+            if c not in nuevas:
+                raise KeyError(f"Regla desconocida: {c}")
+            nuevas[c] = v
+    return nuevas
+
+def variantes(rejilla: dict, maximo: int = 500) -> dict:
+    """
+    Producto cartesiano de perillas: {"victoria": [3, 4], "amarilla": [-1, -2]}
+    -> {"victoria=4, amarilla=-2": reglas, ...}. La combinación oficial se omite.
+    """
+    nombres = list(rejilla)
+    combos = list(itertools.product(*[rejilla[n] for n in nombres]))
+    if len(combos) > maximo:
+        raise ValueError(f"Son {len(combos)} reglamentos; el máximo es {maximo}.")
+
+    res = {}
+    for valores in combos:
+        reglas = con_cambios(dict(zip(nombres, valores)))
+        if reglas == REGLAS_OFICIALES:
+            continue
+        etiqueta = ", ".join(f"{n}={v}" for n, v in zip(nombres, valores) if REGLAS_OFICIALES[PERILLAS.get(n, [n])[0]] != v)
+        res[etiqueta] = reglas
+    return res
+
+def cargar(path: str) -> dict:
+    """
+    Reglamentos candidatos desde JSON: {"nombre": {"clave o perilla": valor, ...}, ...}.
+    """
+    with open(path, encoding="utf-8") as f:
+        return {nombre: con_cambios(cambios) for nombre, cambios in json.load(f).items()}
+
+# =========================
+# Formulación matricial
+# =========================
+def rasgos(base: pd.DataFrame) -> dict:
+    """
+    Matrices de rasgos por fila de la base:
+    {"prorrateados": (n x len(PRORRATEADOS)), "por_partido": (n x 3), "pc": (n,)}.
+    """
+    eq = base["equipo"].to_numpy()
+    res = np.where(eq == "amarillo", base["resultado_amarillo"].astype(str), base["resultado_azul"].astype(str))
+    res = pd.Series(res).str.strip().str.lower().to_numpy()
+
+    pj = base["posicion_jugada"].astype(str).str.strip().str.lower().to_numpy()
+    cambio = pj != base["posicion_base"].astype(str).str.strip().str.lower().to_numpy()
+    goles = base["gol_total"].to_numpy(dtype=float)
+    tres = (goles >= 3).astype(float)
+    valla = base["valla_invicta_equipo"].to_numpy(dtype=float)
+    penal = base["penal_atajado"].to_numpy(dtype=float)
+    asis = base["asistencia_gol"].to_numpy(dtype=float)
+
+    col = {f"resultado_{r}": (res == r).astype(float) for r in ["g", "e", "p"]}
+    for pos in motor.POS_LIST:
+        en = (pj == pos).astype(float)
+        col[f"valla_{pos}"] = valla * en
+        col[f"penal_atajado_{pos}"] = penal * en
+        col[f"gol_{pos}"] = goles * en * ~cambio
+        col[f"gol_{pos}_cambio"] = goles * en * cambio
+        col[f"asistencia_{pos}"] = asis * en
+        col[f"bonus_3_goles_{pos}"] = tres * en * ~cambio
+        col[f"bonus_3_goles_{pos}_cambio"] = tres * en * cambio
+
+    por_partido = np.column_stack([base[c].to_numpy(dtype=float) for c in ["amarillas", "rojas", "autogoles"]])
+    return {
+        "prorrateados": np.column_stack([col[k] for k in PRORRATEADOS]),
+        "por_partido": por_partido,
+        "pc": base["partido_completado"].to_numpy(dtype=float),
+    }
+
+def _pesos(reglamentos: list, claves: list) -> np.ndarray:
+    return np.array([[r[k] for r in reglamentos] for k in claves], dtype=float)
+
+def _entero(x: np.ndarray, reglamentos: list, claves: list) -> np.ndarray:
+    # Con pesos enteros los puntos quedan enteros, como los guarda la base
+    if all(float(r[k]).is_integer() for r in reglamentos for k in claves):
+        return x.astype(int)
+    return x
+
+def puntos_por_fila(base: pd.DataFrame, reglas: dict | None = None) -> dict:
+    """
+    Puntos de cada fila de la base bajo `reglas` (por defecto las oficiales):
+    {"puntos_resultado", "puntos_posicion", "penal_partido"}, sin prorratear.
+    """
+    reglas = reglas or REGLAS_OFICIALES
+    X = rasgos(base)
+    w = _pesos([reglas], PRORRATEADOS)[:, 0]
+    resultado = [k for k in PRORRATEADOS if k.startswith("resultado_")]
+    posicion = [k for k in PRORRATEADOS if k not in resultado]
+    de_resultado = np.isin(PRORRATEADOS, resultado)
+    return {
+        "puntos_resultado": _entero(X["prorrateados"] @ (w * de_resultado), [reglas], resultado),
+        "puntos_posicion": _entero(X["prorrateados"] @ (w * ~de_resultado), [reglas], posicion),
+        "penal_partido": _entero(X["por_partido"] @ _pesos([reglas], POR_PARTIDO)[:, 0], [reglas], POR_PARTIDO),
+    }
+
+def penal_umbrales(agg: pd.DataFrame, reglamentos: list) -> dict:
+    """
+    Penalización por umbrales de tarjetas de cada fila de `agg` bajo cada
+    reglamento: {"amarillas": (jugadores x R), "rojas": (jugadores x R)}.
+    Cada `umbral_{tarjeta}_cada` tarjetas acumuladas suman `umbral_{tarjeta}_puntos`.
+    """
+    res = {}
+    for tarjeta in ["amarillas", "rojas"]:
+        cada = _pesos(reglamentos, [f"umbral_{tarjeta}_cada"])[0]
+        pts = _pesos(reglamentos, [f"umbral_{tarjeta}_puntos"])[0]
+        n = agg[tarjeta].to_numpy(dtype=float)[:, None]
+        veces = np.floor_divide(n, np.where(cada > 0, cada, np.inf)[None, :])
+        res[tarjeta] = _entero(veces * pts[None, :], reglamentos, [f"umbral_{tarjeta}_puntos"])
+    return res
+
+def puntuar(base: pd.DataFrame, agg: pd.DataFrame, reglamentos: list) -> np.ndarray:
+    """
+    puntos_total de cada fila de `agg` bajo cada reglamento: matriz (jugadores x R).
+    Mismo cálculo que motor.acumulados (umbrales y sanción grave incluidos).
+    """
+    X = rasgos(base)
+    W = _pesos(reglamentos, PRORRATEADOS)
+    V = _pesos(reglamentos, POR_PARTIDO)
+    puntos_fila = (X["prorrateados"] @ W) * X["pc"][:, None] + X["por_partido"] @ V
+
+    # Suma por jugador (mismo orden que agg)
+    fila_agg = pd.Index(agg["id_jugador"]).get_indexer(base["id_jugador"])
+    total = np.zeros((len(agg), len(reglamentos)))
+    ok = fila_agg >= 0
+    np.add.at(total, fila_agg[ok], puntos_fila[ok])
+
+    for umbral in penal_umbrales(agg, reglamentos).values():
+        total += umbral
+
+    total[agg["sancion_grave"].to_numpy() == 1, :] = 0
+    return total
+
+def rankings(agg_activos: pd.DataFrame, puntos: np.ndarray) -> np.ndarray:
+    """
+    posicion_ranking de cada jugador dentro de su posición base, por reglamento
+    (mismo criterio que motor.ranking_acumulado_pos: arqueros con puntos ajustados).
+    """
+    pts = puntos.astype(float).copy()
+    arq = (agg_activos["posicion"] == "arquero").to_numpy()
+    valla = pd.to_numeric(agg_activos["valla_promedio"], errors="coerce").to_numpy(dtype=float)
+    ajuste = arq & ~np.isnan(valla)
+    pts[ajuste] -= valla[ajuste][:, None]
+
+    rank = np.zeros(pts.shape, dtype=int)
+    pos = agg_activos["posicion"].to_numpy()
+    desempate = [agg_activos[c].to_numpy(dtype=float) for c in ["asistencia_gol", "goles", "partidos_jugados"]]
+    for p in motor.POS_LIST:
+        idx = np.flatnonzero(pos == p)
+        if len(idx) == 0:
+            continue
+        m = pts[idx]
+        claves = [np.broadcast_to(-d[idx][:, None], m.shape) for d in desempate] + [-m]
+        orden = np.lexsort(claves, axis=0)
+        r = np.empty_like(orden)
+        np.put_along_axis(r, orden, np.arange(1, len(idx) + 1)[:, None].repeat(m.shape[1], axis=1), axis=0)
+        rank[idx] = r
+    return rank
+
+# =========================
+# Simulador
+# =========================
+def simular(base: pd.DataFrame, agg_activos: pd.DataFrame, candidatos: dict) -> dict:
+    """
+    Re-puntúa la temporada con todos los `candidatos` ({nombre: reglas}) de una vez.
+    La columna 0 de "puntos" / "puestos" es el reglamento oficial.
+    """
+    agg_activos = agg_activos.reset_index(drop=True)
+    nombres = list(candidatos)
+    puntos = puntuar(base, agg_activos, [REGLAS_OFICIALES] + [candidatos[n] for n in nombres])
+    puestos = rankings(agg_activos, puntos)
+
+    oficial = puestos[:, [0]]
+    movimiento = puestos[:, 1:] - oficial
+    resumen = pd.DataFrame({
+        "reglamento": nombres,
+        "jugadores_que_cambian": (movimiento != 0).sum(axis=0),
+        "movimiento_maximo": np.abs(movimiento).max(axis=0, initial=0),
+        "cambios_en_top3": ((movimiento != 0) & (oficial <= 3)).sum(axis=0),
+        "lideres_nuevos": ((puestos[:, 1:] == 1) & (oficial != 1)).sum(axis=0),
+    }).sort_values(["jugadores_que_cambian", "movimiento_maximo"], ascending=False).reset_index(drop=True)
+
+    return {
+        "resumen": resumen,
+        "nombres": nombres,
+        "jugadores": agg_activos[["id_jugador", "nombre", "posicion"]],
+        "puntos": puntos,
+        "puestos": puestos,
+    }
+
+def cambios(sim: dict, nombre: str) -> pd.DataFrame:
+    """
+    Tabla por posición con el puesto oficial y el puesto bajo el reglamento `nombre`.
+    cambio > 0: sube posiciones.
+    """
+    k = sim["nombres"].index(nombre) + 1
+    t = sim["jugadores"].copy()
+    t["puesto_oficial"] = sim["puestos"][:, 0]
+    t["puesto_nuevo"] = sim["puestos"][:, k]
+    t["cambio"] = t["puesto_oficial"] - t["puesto_nuevo"]
+    t["puntos_oficial"] = sim["puntos"][:, 0]
+    t["puntos_nuevo"] = sim["puntos"][:, k]
+
+    orden_pos = {p: i for i, p in enumerate(motor.POS_LIST)}
+    t["_o"] = t["posicion"].map(orden_pos)
+    return t.sort_values(["_o", "puesto_nuevo"]).drop(columns=["_o"]).reset_index(drop=True)
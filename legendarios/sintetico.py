@@ -0,0 +1,85 @@
+"""
+Generador de temporadas sintéticas con el mismo formato del Excel 2026
+(hojas Jugadores / Partidos / Eventos). Se usa en el benchmark para
+medir con temporadas más grandes que la real.
+"""
+import numpy as np
+import pandas as pd
+
+from legendarios import motor
+
+CANCHAS = ["El Triunfo", "El Seminario", "La Sultana"]
+
+def generar_temporada(n_partidos: int = 40, n_jugadores: int = 60, seed: int = 0):
+    """
+    Devuelve (jugadores, partidos, eventos) coherentes entre sí:
+    marcadores = goles propios + autogoles del rival, arquero con gol_recibido.
+    """
+    rng = np.random.default_rng(seed)
+
+    ids = np.arange(1, n_jugadores + 1)
+    posiciones = np.array(motor.POS_LIST)[np.r_[[0] * max(2, n_jugadores // 10), rng.integers(1, 4, n_jugadores)][:n_jugadores]]
+    jugadores = pd.DataFrame({
+        "id_jugador": ids,
+        "nombre": [f"JUGADOR {i}" for i in ids],
+        "posicion": posiciones,
+        "activo": (rng.random(n_jugadores) < 0.9).astype(int),
+        "sancion_grave": (rng.random(n_jugadores) < 0.02).astype(int),
+    })
+
+    arqueros = ids[posiciones == "arquero"]
+    campo = ids[posiciones != "arquero"]
+    por_equipo = min(11, max(2, n_jugadores // 2))
+
+    filas_p, filas_e = [], []
+    fecha0 = pd.Timestamp("2026-01-03")
+    for pid in range(1, n_partidos + 1):
+        arq = rng.choice(arqueros, size=2, replace=len(arqueros) < 2)
+        resto = rng.choice(campo, size=min(len(campo), 2 * (por_equipo - 1)), replace=False)
+        equipos = {"amarillo": [arq[0], *resto[0::2]], "azul": [arq[1], *resto[1::2]]}
+
+        goles = {}
+        autogoles = {}
+        filas_partido = []
+        for equipo, plantel in equipos.items():
+            for j, jid in enumerate(plantel):
+                es_arq = j == 0
+                g1, g2 = (0, 0) if es_arq else rng.poisson(0.35, 2)
+                ag = int(rng.random() < 0.02)
+                filas_partido.append({
+                    "id_partido": pid, "id_jugador": int(jid), "equipo": equipo,
+                    "fue_arquero": int(es_arq), "fue_defensa": 0, "fue_mediocampista": 0, "fue_delantero": 0,
+                    "gol_primer": int(g1), "gol_segundo": int(g2), "gol_total": int(g1 + g2),
+                    "autogoles": ag, "asistencia_gol": int(rng.poisson(0.25)),
+                    "amarillas": int(rng.random() < 0.08), "rojas": int(rng.random() < 0.01),
+                    "penal_atajado": int(es_arq and rng.random() < 0.1),
+                    "partido_completado": 0.5 if rng.random() < 0.1 else 1.0,
+                })
+                goles[equipo] = goles.get(equipo, 0) + int(g1 + g2)
+                autogoles[equipo] = autogoles.get(equipo, 0) + ag
+
+        ma = goles["amarillo"] + autogoles["azul"]
+        mz = goles["azul"] + autogoles["amarillo"]
+        for fila in filas_partido:
+            fila["gol_recibido"] = (mz if fila["equipo"] == "amarillo" else ma) if fila["fue_arquero"] else 0
+        filas_e.extend(filas_partido)
+
+        res_am = "g" if ma > mz else ("e" if ma == mz else "p")
+        res_az = {"g": "p", "p": "g", "e": "e"}[res_am]
+        filas_p.append({
+            "id_partido": pid, "fecha": fecha0 + pd.Timedelta(weeks=pid - 1),
+            "resultado_amarillo": res_am, "resultado_azul": res_az,
+            "marcador_amarillo": ma, "marcador_azul": mz,
+            "cancha": CANCHAS[int(rng.integers(len(CANCHAS)))],
+        })
+
+    partidos = pd.DataFrame(filas_p)
+    eventos = pd.DataFrame(filas_e)
+    return jugadores, partidos, eventos
+
+def escribir_excel(path: str, jugadores: pd.DataFrame, partidos: pd.DataFrame, eventos: pd.DataFrame) -> str:
+    with pd.ExcelWriter(path) as w:
+        jugadores.to_excel(w, sheet_name=motor.HOJA_J, index=False)
+        partidos.to_excel(w, sheet_name=motor.HOJA_P, index=False)
+        eventos.to_excel(w, sheet_name=motor.HOJA_E, index=False)
+    return path
@@ -0,0 +1,160 @@
+"""
+Almacén de snapshots por partido.
+
+Al construir la temporada se materializan, para cada id_partido, los
+rankings del día y los acumulados a esa fecha por posición. Cada tabla
+se guarda como un dict de arrays de numpy (solo las columnas que se
+muestran), de modo que abrir cualquier partido es una búsqueda por clave
+y nunca vuelve a tocar la tabla completa de eventos.
+"""
+import pickle
+
+import numpy as np
+import pandas as pd
+
+# Columnas que se conservan por tipo de tabla (las que falten se omiten)
+COLS_DIA = ["posicion_ranking","id_jugador","nombre","puntos","partido_completado","goles","asistencia_gol","amarillas","rojas"]
+COLS_HASTA = [
+    "posicion_ranking","id_jugador","nombre","puntos_arquero_ajustados","puntos_total","valla_2d",
+    "partidos_jugados","partidos_equivalentes","goles","asistencia_gol","amarillas","rojas",
+]
+COLS_REGULARIDAD = [
+    "posicion_ranking","id_jugador","nombre","indice_regularidad","posicion","partidos_jugados","partidos_equivalentes",
+    "puntos_total","goles","asistencia_gol","amarillas","rojas",
+    "score_asistencia","score_rol","score_ofensivo","score_disciplina",
+]
+COLUMNAS = {"dia": COLS_DIA, "hasta": COLS_HASTA}
+
+def _columnas(tipo: str, clave: str) -> list:
+    # Dentro de "hasta" viaja también el Índice de Regularidad a esa fecha
+    return COLS_REGULARIDAD if clave == "regularidad" else COLUMNAS[tipo]
+
+# =========================
+# Compactación de tablas
+# =========================
+def compactar(df: pd.DataFrame, columnas: list) -> dict:
+    return {c: df[c].to_numpy() for c in columnas if c in df.columns}
+
+def expandir(tabla: dict | None) -> pd.DataFrame:
+    if not tabla:
+        return pd.DataFrame()
+    return pd.DataFrame(tabla)
+
+# =========================
+# Construcción
+# =========================
+def info_partidos(partidos_df: pd.DataFrame) -> dict:
+    """
+    Metadatos de cada partido con fecha (para el selector y el cuadro KPI),
+    en el orden del selector: fecha e id_partido descendentes.
+    """
+    part_sel = partidos_df.dropna(subset=["id_partido", "fecha"]).copy()
+    part_sel = part_sel.sort_values(["fecha", "id_partido"], ascending=[False, False])
+
+    info = {}
+    for r in part_sel.to_dict("records"):
+        pid = int(r["id_partido"])
+        cancha = r.get("cancha", None)
+        info[pid] = {
+            "label": f"Partido {pid} | {r['fecha'].date()} | {str(r.get('cancha',''))}",
+            "fecha": pd.to_datetime(r["fecha"]).date(),
+            "cancha": str(cancha) if pd.notna(cancha) else "—",
+            "marcador_amarillo": int(r["marcador_amarillo"]) if pd.notna(r["marcador_amarillo"]) else 0,
+            "marcador_azul": int(r["marcador_azul"]) if pd.notna(r["marcador_azul"]) else 0,
+        }
+    return info
+
+def construir_store(datos: dict, *snapshots: dict) -> dict:
+    """
+    Arma el almacén a partir de los resultados de motor.snapshot_partido.
+    Estructura: {"partidos": {pid: info}, "por_label": {label: pid},
+    "tablas": {(pid, tipo, pos): {col: array}}}.
+    """
+    tablas = {}
+    for snap in snapshots:
+        pid = snap["id_partido"]
+        for tipo in COLUMNAS:
+            for clave, df in snap[tipo].items():
+                if not df.empty:
+                    tablas[(pid, tipo, clave)] = compactar(df, _columnas(tipo, clave))
+    info = info_partidos(datos["partidos"])
+    return {
+        "partidos": info,
+        "por_label": {i["label"]: pid for pid, i in info.items()},
+        "tablas": tablas,
+    }
+
+# =========================
+# Consulta
+# =========================
+def etiquetas(store: dict) -> list:
+    return [info["label"] for info in store["partidos"].values()]
+
+def partido_por_etiqueta(store: dict, label: str) -> int | None:
+    return store["por_label"].get(label)
+
+def tabla(store: dict, id_partido: int, tipo: str, pos: str) -> pd.DataFrame:
+    """
+    tipo: "dia" (rankings del día) o "hasta" (acumulados a esa fecha).
+    pos: una posición, o "regularidad" con tipo "hasta".
+    """
+    return expandir(store["tablas"].get((id_partido, tipo, pos)))
+
+# =========================
+# Movimientos entre partidos
+# =========================
+def _acumulados(store: dict, id_partido: int) -> pd.DataFrame:
+    # Todas las posiciones del acumulado "hasta" en una sola tabla larga
+    claves = [k for (pid, tipo, k) in store["tablas"] if pid == id_partido and tipo == "hasta" and k != "regularidad"]
+    tablas = [store["tablas"][(id_partido, "hasta", k)] for k in claves]
+    if not tablas:
+        return pd.DataFrame(columns=["posicion", "id_jugador", "nombre", "posicion_ranking", "puntos_total"])
+    return pd.DataFrame({
+        "posicion": np.repeat(claves, [len(t["id_jugador"]) for t in tablas]),
+        **{c: np.concatenate([t[c] for t in tablas]) for c in ["id_jugador", "nombre", "posicion_ranking", "puntos_total"]},
+    })
+
+def movimientos(store: dict, desde: int, hasta: int) -> pd.DataFrame:
+    """
+    Cambios del ranking acumulado entre dos partidos, para todas las posiciones
+    a la vez: una fila por (posicion, id_jugador) del ranking de `hasta`.
+    - cambio: puestos ganados (positivo = subió); nulo si es nuevo
+    - delta_puntos: puntos_total ganados entre ambos partidos
+    - nuevo: no aparecía en esa posición en el ranking de `desde`
+    """
+    a, b = _acumulados(store, desde), _acumulados(store, hasta)
+    m = b.merge(
+        a[["posicion", "id_jugador", "posicion_ranking", "puntos_total"]],
+        on=["posicion", "id_jugador"], how="left", suffixes=("", "_anterior"),
+    ).rename(columns={"posicion_ranking_anterior": "posicion_anterior"})
+    m["nuevo"] = m["posicion_anterior"].isna()
+    m["posicion_anterior"] = m["posicion_anterior"].astype("Int64")
+    m["cambio"] = m["posicion_anterior"] - m["posicion_ranking"]
+    m["delta_puntos"] = m["puntos_total"] - m["puntos_total_anterior"].fillna(0.0)
+    return m[["posicion", "id_jugador", "nombre", "posicion_ranking", "posicion_anterior", "cambio",
+              "puntos_total", "delta_puntos", "nuevo"]]
+
+def flechas(mov: pd.DataFrame) -> pd.Series:
+    """
+    Texto corto por fila de `movimientos`: ▲2, ▼1, = o "nuevo".
+    """
+    cambio = mov["cambio"].fillna(0).astype(int).to_numpy()
+    texto = np.where(cambio > 0, np.char.add("▲", np.abs(cambio).astype(str)),
+                     np.where(cambio < 0, np.char.add("▼", np.abs(cambio).astype(str)), "="))
+    return pd.Series(np.where(mov["nuevo"].to_numpy(), "nuevo", texto), index=mov.index)
+
+# =========================
+# Artefacto en disco
+# =========================
+def guardar(store: dict, path: str):
+    with open(path, "wb") as f:
+        pickle.dump(store, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def cargar(path: str) -> dict:
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+def tamano_bytes(store: dict) -> int:
+    """Bytes ocupados por los arrays (sin contar los objetos Python que referencian)."""
+    return sum(a.nbytes for t in store["tablas"].values() for a in t.values() if isinstance(a, np.ndarray))
+
@@ -0,0 +1,188 @@
+"""
+Cálculos de la temporada 2025 (archivo histórico, sin Streamlit).
+
+Reúne las tablas que muestra 2025/app.py para que el planificador
+pueda construirlas junto con las de la temporada vigente.
+"""
+import os
+
+import pandas as pd
+
+from legendarios import historico
+from legendarios.cache import leer_hoja
+
+# El Excel de la temporada, o el archivo histórico (legendarios/historico.py)
+# si LEGENDARIOS_DATOS_2025 apunta a un .zip
+DATA_FILE = os.environ.get("LEGENDARIOS_DATOS_2025", "2025/datos.xlsx")
+TEMPORADA = 2025
+
+# Columnas que usan las tablas de 2025 y el historial (del archivo histórico
+# se leen solo estas: no hacen falta fecha_nacimiento, los tiempos ni la hoja Asistencia)
+COLUMNAS = {
+    "Jugadores": ["jugador", "posición", "posicion_regular", "# camiseta"],
+    "Partidos": [
+        "fecha", "jugador", "equipo", "posicion", "goles", "autogoles", "arquero", "goles_recibidos",
+        "tarjetas_amarillas", "tarjetas_rojas", "asistencias", "Penales_Atajados",
+    ],
+}
+
+# Rankings individuales: (columna, título) en el orden de la página
+ESTADISTICAS = [
+    ("goles", "Ranking de Goleadores"),
+    ("asistencias", "Ranking de Asistencias"),
+    ("tarjetas_amarillas", "Ranking de Tarjetas Amarillas"),
+    ("tarjetas_rojas", "Ranking de Tarjetas Rojas"),
+    ("autogoles", "Ranking de Autogoles"),
+]
+
+# =========================
+# Carga
+# =========================
+def _leer(path: str, hoja: str) -> pd.DataFrame:
+    if historico.es_historico(path):
+        return historico.leer_hoja(path, TEMPORADA, hoja, COLUMNAS[hoja])
+    return leer_hoja(path, hoja)
+
+def cargar_temporada(path: str = DATA_FILE) -> pd.DataFrame:
+    jugadores_df = _leer(path, "Jugadores")
+    df = _leer(path, "Partidos")
+    df = df[df["equipo"].notna()]
+    df["fecha"] = pd.to_datetime(df["fecha"])
+    df = df.merge(jugadores_df.rename(columns={"posición": "posicion_regular"}), on="jugador", how="left")
+
+    for col in ["Penales_Atajados", "asistencias"]:
+        if col not in df.columns:
+            df[col] = 0
+
+    # Puntajes por fila
+    df["valla_invicta"] = (df["arquero"] == True) & (df["goles_recibidos"] == 0)
+    df["puntos"] = (
+        df["goles"] * 3 +
+        df["asistencias"] * 1 +
+        df["valla_invicta"] * 2 -
+        df["tarjetas_amarillas"] -
+        df["tarjetas_rojas"] * 2 +
+        df["Penales_Atajados"] * 3
+    )
+    return df
+
+# =========================
+# Rankings individuales
+# =========================
+def ranking_estadistica(df: pd.DataFrame, col: str) -> pd.DataFrame:
+    r = df.groupby("jugador")[col].sum().reset_index()
+    r = r[r[col] > 0].sort_values(by=col, ascending=False).reset_index(drop=True)
+    r.insert(0, "Posición", range(1, len(r) + 1))
+    return r
+
+def ranking_penales(df: pd.DataFrame) -> pd.DataFrame:
+    penales = df[df["Penales_Atajados"] > 0].groupby("jugador")["Penales_Atajados"].sum().reset_index()
+    penales = penales.sort_values(by="Penales_Atajados", ascending=False).reset_index(drop=True)
+    penales.insert(0, "Posición", range(1, len(penales) + 1))
+    return penales
+
+def ranking_valla(df: pd.DataFrame) -> pd.DataFrame:
+    arqueros = df[df["arquero"] == True]
+    rendimiento = arqueros.groupby("jugador").agg(partidos=("fecha", "count"), goles_recibidos=("goles_recibidos", "sum")).reset_index()
+    rendimiento["promedio"] = rendimiento["goles_recibidos"] / rendimiento["partidos"]
+    rendimiento = rendimiento.sort_values(by="promedio")
+    rendimiento.insert(0, "Posición", range(1, len(rendimiento) + 1))
+    return rendimiento
+
+# =========================
+# Jugador de la fecha / acumulados
+# =========================
+def puntos_por_fecha(df: pd.DataFrame) -> dict:
+    """
+    Devuelve {"resumen", "evolutivo", "acumulado"}:
+    jugador de cada fecha, puntos por jugador y fecha, y ranking anual.
+    """
+    fechas_ordenadas = sorted(df["fecha"].unique(), reverse=True)
+    resumen_fecha = []
+    puntos_por_jugador_fecha = []
+
+    for fecha in fechas_ordenadas:
+        df_fecha = df[df["fecha"] == fecha].copy()
+        puntajes = df_fecha.groupby("jugador")["puntos"].sum().reset_index().sort_values(by="puntos", ascending=False)
+        resumen_fecha.append({"Fecha": fecha.date(), "Jugador de la Fecha": puntajes.iloc[0]["jugador"], "Puntos": puntajes.iloc[0]["puntos"]})
+        for _, row in puntajes.iterrows():
+            puntos_por_jugador_fecha.append({"Fecha": fecha.date(), "Jugador": row["jugador"], "Puntos": row["puntos"]})
+
+    df_resumen = pd.DataFrame(resumen_fecha)
+    df_evolutivo = pd.DataFrame(puntos_por_jugador_fecha)
+    df_acumulado = df_evolutivo.groupby("Jugador")["Puntos"].sum().reset_index().sort_values(by="Puntos", ascending=False).reset_index(drop=True)
+    df_acumulado.insert(0, "Posición", range(1, len(df_acumulado) + 1))
+    return {"resumen": df_resumen, "evolutivo": df_evolutivo, "acumulado": df_acumulado}
+
+def top3_ultima_fecha(df: pd.DataFrame) -> pd.DataFrame | None:
+    if df.empty:
+        return None
+    ultima_fecha = df["fecha"].max()
+    df_ultima_fecha = df[df["fecha"] == ultima_fecha]
+    puntajes_ultima = df_ultima_fecha.groupby("jugador")["puntos"].sum().reset_index().sort_values(by="puntos", ascending=False)
+    df_top3 = puntajes_ultima.head(3).copy()
+    df_top3.insert(0, "Posición", range(1, len(df_top3) + 1))
+    df_top3.insert(0, "Fecha", ultima_fecha.date())
+    return df_top3
+
+def conteo_menciones(*tablas: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cuántos rankings individuales menciona a cada jugador (regularidad).
+    """
+    menciones = pd.concat([t[["jugador"]] for t in tablas])
+    conteo = menciones["jugador"].value_counts().reset_index()
+    conteo.columns = ["Jugador", "Menciones"]
+    conteo.insert(0, "Posición", range(1, len(conteo) + 1))
+    return conteo
+
+def ranking_mvp(df_acumulado: pd.DataFrame, conteo: pd.DataFrame) -> pd.DataFrame:
+    mvp = df_acumulado.merge(conteo, on="Jugador", how="left")
+    mvp["Menciones"] = mvp["Menciones"].fillna(0)
+    mvp["MVP_Score"] = mvp["Puntos"] + mvp["Menciones"] * 2
+    mvp = mvp.sort_values(by="MVP_Score", ascending=False).reset_index(drop=True)
+    if "Posición" in mvp.columns:
+        mvp.drop(columns=["Posición"], inplace=True)
+    mvp.insert(0, "Posición", range(1, len(mvp) + 1))
+    return mvp
+
+# =========================
+# Resúmenes por equipo
+# =========================
+def resumen_goles_por_fecha(df: pd.DataFrame) -> pd.DataFrame:
+    resumen_base = df.groupby(["fecha", "equipo"])["goles"].sum().reset_index()
+    resumen_goles = resumen_base.pivot(index="fecha", columns="equipo", values="goles")
+
+    for equipo in ["Azul", "Amarillo"]:
+        if equipo not in resumen_goles.columns:
+            resumen_goles[equipo] = 0
+
+    resumen_goles = resumen_goles[["Amarillo", "Azul"]].fillna(0)
+
+    for _, row in df[df["autogoles"] > 0].iterrows():
+        fecha = row["fecha"]
+        equipo_contrario = "Amarillo" if row["equipo"] == "Azul" else "Azul"
+        if fecha in resumen_goles.index:
+            resumen_goles.at[fecha, equipo_contrario] += row["autogoles"]
+        else:
+            resumen_goles.loc[fecha] = {"Azul": 0, "Amarillo": 0}
+            resumen_goles.at[fecha, equipo_contrario] = row["autogoles"]
+
+    resumen_goles = resumen_goles.astype(int).reset_index()
+    resumen_goles["Resultado"] = resumen_goles.apply(
+        lambda row: "Empate" if row["Azul"] == row["Amarillo"] else ("Azul" if row["Azul"] > row["Amarillo"] else "Amarillo"), axis=1
+    )
+    return resumen_goles.sort_values(by="fecha", ascending=False)
+
+def total_goles_equipo(df: pd.DataFrame) -> pd.DataFrame:
+    total_partidos = df["fecha"].nunique()
+    goles_equipo = df.groupby("equipo")["goles"].sum()
+    autogoles_equipo = df[df["autogoles"] > 0].copy()
+    autogoles_equipo["equipo_beneficiado"] = autogoles_equipo["equipo"].apply(lambda x: "Amarillo" if x == "Azul" else "Azul")
+    autogoles_por_equipo = autogoles_equipo.groupby("equipo_beneficiado")["autogoles"].sum()
+    total_goles = goles_equipo.add(autogoles_por_equipo, fill_value=0).reset_index()
+    total_goles.columns = ["equipo", "goles"]
+    total_goles["Promedio Goles por Fecha"] = total_goles["goles"] / total_partidos
+    return total_goles
+
+def suma_por_equipo(df: pd.DataFrame, col: str) -> pd.DataFrame:
+    return df.groupby("equipo")[col].sum().reset_index()
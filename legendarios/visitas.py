@@ -0,0 +1,73 @@
+"""
+Registro de visitas de la página 2026 (tabla visits de la base de analítica).
+
+Cada recarga de la página es un INSERT en SQLite y el archivo admite una
+sola escritura a la vez: con muchas sesiones simultáneas las visitas se
+esperan entre sí (hasta ESPERA_BLOQUEO segundos; después, "database is
+locked"). `estadisticas()` resume lo que midió este proceso (escrituras,
+bloqueos y tiempo de cada escritura) para ver esa contención en las
+pruebas de carga (legendarios/carga.py): con LEGENDARIOS_VISITAS_INFORME
+el proceso lo deja en ese JSON al terminar.
+"""
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+ZONA = ZoneInfo("America/Bogota")
+
+# Lo mismo que sqlite3.connect por defecto
+ESPERA_BLOQUEO = 5.0
+
+_LOCK = threading.Lock()
+_CONTADORES = {"escrituras": 0, "bloqueos": 0}
+_TIEMPOS = deque(maxlen=10_000)  # segundos de las últimas escrituras (conexión + INSERT + COMMIT)
+
+def registrar(db_path, session_id: str):
+    """
+    Agrega una visita (hora de Bogotá) a la tabla visits, creándola si falta.
+    """
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    ts = datetime.now(ZONA).strftime("%Y-%m-%d %H:%M:%S")
+    t0 = time.perf_counter()
+    try:
+        with closing(sqlite3.connect(db_path, timeout=ESPERA_BLOQUEO)) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS visits (ts TEXT, session_id TEXT)")
+            conn.execute("INSERT INTO visits (ts, session_id) VALUES (?, ?)", (ts, session_id))
+            conn.commit()
+    except sqlite3.OperationalError as e:
+        if "locked" in str(e):
+            with _LOCK:
+                _CONTADORES["bloqueos"] += 1
+        raise
+    with _LOCK:
+        _CONTADORES["escrituras"] += 1
+        _TIEMPOS.append(time.perf_counter() - t0)
+
+def estadisticas() -> dict:
+    """
+    Escrituras, bloqueos ("database is locked") y tiempos de escritura en segundos.
+    """
+    with _LOCK:
+        tiempos = np.array(_TIEMPOS)
+        res = dict(_CONTADORES)
+    for nombre, q in [("p50", 50), ("p95", 95), ("p99", 99)]:
+        res[f"escritura_{nombre}"] = float(np.percentile(tiempos, q)) if len(tiempos) else 0.0
+    res["escritura_max"] = float(tiempos.max()) if len(tiempos) else 0.0
+    return res
+
+def _escribir_informe(path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(estadisticas(), f)
+
+if os.environ.get("LEGENDARIOS_VISITAS_INFORME"):
+    atexit.register(_escribir_informe, os.environ["LEGENDARIOS_VISITAS_INFORME"])